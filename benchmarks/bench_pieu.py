@@ -0,0 +1,362 @@
+"""
+Banc de mesure des performances des chemins critiques du module (calcul axial, calcul transversal, intégration des essais).
+
+    python -m benchmarks.bench_pieu --output resultats.json [--baseline precedent.json] [--quick]
+
+Chaque mesure est réalisée pour plusieurs longueurs de pieu et épaisseurs de maille (de 200 mm à 5 mm).
+Pour chaque mesure, le résultat calculé est contrôlé :
+    - par rapport aux valeurs de référence de benchmarks/reference.json (implémentation actuelle, --update-reference);
+    - lorsqu'il existe, par rapport à un calcul indépendant (PyNite, méthode 'force', intégration directe des courbes).
+Les temps sont comparés à ceux d'un précédent fichier de résultats (--baseline) : un ralentissement supérieur
+à --max-ratio est signalé comme une régression. Le code de retour est non nul en cas d'écart ou de régression.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+import geotech_module.utils as utils
+from geotech_module.pieu import Pile
+from geotech_module.soil import Soil, LogPressio
+
+
+REFERENCE = Path(__file__).with_name('reference.json')
+LENGTHS = [5., 14., 30.]
+THICKNESSES = [0.200, 0.100, 0.050, 0.020, 0.010, 0.005]
+
+
+def lithologie() -> list[Soil]:
+    """
+    Lithologie de référence, suffisamment profonde pour toutes les longueurs de pieu mesurées.
+    """
+    return [
+        Soil("Remblai", 0.0, -2.0, 'Q1', 0.3, 0.6, 4., 1/2),
+        Soil("Argile", -2.0, -12.0, 'Q2', 0.6, 1.1, 7., 2/3, 'fin'),
+        Soil("Sable", -12.0, -25.0, 'Q3', 1.0, 1.8, 14., 1/3),
+        Soil("Marne", -25.0, -60.0, 'Q4', 1.6, 2.8, 25., 1/2, 'fin'),
+    ]
+
+
+@dataclass
+class Case:
+    """
+    Pieu mesuré : longueur et épaisseur des mailles.
+    """
+    length: float
+    thickness: float
+
+    def pile(self) -> Pile:
+        return Pile(19, 0., -self.length, 20_000, 0.15, 0.25, lithologie(), self.thickness)
+
+    def prepared_pile(self) -> Pile:
+        """
+        Pieu dont le maillage et les résistances sont déjà calculés.
+        """
+        pile = self.pile()
+        pile.resistance_totale
+        return pile
+
+    @property
+    def key(self) -> str:
+        return f"L={self.length:g}|t={self.thickness:g}"
+
+
+@dataclass
+class Benchmark:
+    """
+    Mesure : setup (non chronométré) prépare l'état, run (chronométré) calcule le résultat,
+    value en extrait les grandeurs contrôlées et check (facultatif) renvoie l'écart relatif à un calcul indépendant,
+    à comparer à check_tol (None si le contrôle n'est pas réalisé pour ce cas).
+    Avec fresh, l'état est recréé avant chaque exécution (mesure des grandeurs mémorisées par Pile).
+    """
+    name: str
+    setup: Callable[[Case], object]
+    run: Callable[[object], object]
+    value: Callable[[object], list[float]]
+    check: Callable[[Case, object, object], float|None]|None=None
+    check_tol: float=1e-6
+    applicable: Callable[[Case], bool]=lambda case: True
+    fresh: bool=True
+
+
+def relative_error(value, reference) -> float:
+    value = np.asarray(value, dtype=float)
+    reference = np.asarray(reference, dtype=float)
+    if value.shape != reference.shape:
+        return np.inf
+    return float(np.max(np.abs(value - reference) / np.maximum(np.abs(reference), 1e-12), initial=0.))
+
+
+def _fe_model(pile: Pile):
+    model = pile.get_fe_model(0.01, 0.02, 'elu')
+    model.analyze_linear()
+    return model
+
+
+def _check_curves(case: Case, state, curves) -> float:
+    # Contrôle par les fonctions de PyNite sur la barre, en quelques points
+    model = state
+    member = model.Members['pile']
+    z, moment, shear, deflection = curves
+    idx = np.linspace(0, len(z) - 1, 7).astype(int)
+    x = z[0] - z[idx]
+    reference = [member.moment('Mz', xi, 'Combo 1') for xi in x]
+    return float(np.max(np.abs(moment[idx] - reference)) / np.max(np.abs(moment)))
+
+
+def _check_lateral(case: Case, state, resultats) -> float|None:
+    if not pynite_applicable(case):
+        return None
+    pynite = state.lateral_analysis(0.01, 0.02, 'elu', backend='pynite')
+    return float(np.max(np.abs(resultats.deflection - pynite.deflection)) / np.max(np.abs(pynite.deflection)))
+
+
+def _check_settlement(case: Case, state, courbe) -> float:
+    # Contrôle de la méthode en déplacement imposé par la recherche d'équilibre à chaque pas ('force'),
+    # à la précision de l'interpolation du parcours en déplacement près. Le dernier pas (Qmax = résistance totale)
+    # est exclu : la courbe y est quasiment verticale et l'interpolation n'a pas de sens.
+    force = state.settlement_curve(nb_pas=10, methode='force')
+    n = min(len(force[0]), len(courbe[0])) - 1
+    return relative_error(courbe[0][:n], force[0][:n])
+
+
+def _log_pressio() -> tuple[LogPressio, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    levels = -np.linspace(0.5, 40., 80)
+    log = LogPressio(levels.tolist(), (0.5 + 0.02 * -levels).tolist(), (1. + 0.05 * -levels).tolist(), (5. + 0.5 * -levels).tolist())
+    level_1 = -rng.uniform(0.5, 35., 2000)
+    level_2 = level_1 - rng.uniform(0.1, 5., 2000)
+    return log, level_1, level_2
+
+
+def _check_log_pressio(case: Case, state, moyennes) -> float:
+    # Intégration directe de la courbe pl entre les bornes de quelques intervalles
+    log, level_1, level_2 = state
+    erreurs = []
+    for l1, l2, moyenne in zip(level_1[:20], level_2[:20], moyennes[:20]):
+        x = np.linspace(l2, l1, 2001)
+        y = np.interp(-x, -np.asarray(log.levels_ngf), log.cb_pl)
+        erreurs.append(abs(np.trapz(y, x) / (l1 - l2) - moyenne) / abs(moyenne))
+    return float(max(erreurs))
+
+
+# Nombre de noeuds maximal des modèles PyNite mesurés ou utilisés pour les contrôles (--max-fe-nodes)
+MAX_FE_NODES = 1000
+
+
+def pynite_applicable(case: Case) -> bool:
+    return utils.FEModel3D is not None and case.length / case.thickness <= MAX_FE_NODES
+
+
+def benchmarks() -> list[Benchmark]:
+    return [
+        Benchmark(
+            'maillage',
+            setup=lambda case: case,
+            run=lambda case: case.pile().mesh,
+            value=lambda mesh: [mesh.n_slices],
+        ),
+        Benchmark(
+            'resistance_totale',
+            setup=lambda case: case.pile(),
+            run=lambda pile: pile.resistance_totale,
+            value=lambda resistance: [resistance],
+        ),
+        Benchmark(
+            'equilibre_dz_pointe',
+            setup=lambda case: case.prepared_pile(),
+            run=lambda pile: pile.equilibre_dz_pointe(0.002),
+            value=lambda equilibre: [equilibre[0], equilibre[2]],
+            fresh=False,
+        ),
+        Benchmark(
+            'equilibre_Q_top',
+            setup=lambda case: case.prepared_pile(),
+            run=lambda pile: pile.equilibre_Q_top(0.5 * pile.resistance_totale),
+            value=lambda equilibre: [equilibre[1], equilibre[2]],
+            fresh=False,
+        ),
+        Benchmark(
+            'settlement_curve',
+            setup=lambda case: case.prepared_pile(),
+            run=lambda pile: pile.settlement_curve(nb_pas=10, methode='deplacement', nb_points=101),
+            value=lambda courbe: list(courbe[0]),
+            check=_check_settlement,
+            check_tol=2e-2,
+            fresh=False,
+        ),
+        Benchmark(
+            'lateral_analysis',
+            setup=lambda case: case.prepared_pile(),
+            run=lambda pile: pile.lateral_analysis(0.01, 0.02, 'elu'),
+            value=lambda resultats: [resultats.deflection[0], float(np.abs(resultats.moment).max())],
+            check=_check_lateral,
+            check_tol=1e-8,
+        ),
+        Benchmark(
+            'build_pile+analyze_linear',
+            setup=lambda case: case.prepared_pile(),
+            run=_fe_model,
+            value=lambda model: [model.Nodes['N0'].DY['Combo 1']],
+            applicable=pynite_applicable,
+        ),
+        Benchmark(
+            'get_model_curves',
+            setup=lambda case: _fe_model(case.prepared_pile()),
+            run=lambda model: utils.get_model_curves(model, 0., 0.01),
+            value=lambda curves: [float(np.abs(curves[1]).max()), float(np.abs(curves[3]).max())],
+            check=_check_curves,
+            check_tol=1e-9,
+            applicable=pynite_applicable,
+            fresh=False,
+        ),
+        Benchmark(
+            'LogPressio.moyenne_ngf',
+            setup=lambda case: _log_pressio(),
+            run=lambda state: state[0].moyenne_ngf('pl', state[1], state[2]),
+            value=lambda moyennes: [float(np.sum(moyennes))],
+            check=_check_log_pressio,
+            check_tol=1e-6,
+            applicable=lambda case: case.thickness == THICKNESSES[0],
+            fresh=False,
+        ),
+    ]
+
+
+def measure(benchmark: Benchmark, case: Case, repeat: int, min_time: float) -> tuple[list[float], object, object]:
+    """
+    Temps d'exécution de run (au moins repeat mesures, et jusqu'à min_time secondes cumulées dans la limite
+    de 20 * repeat mesures), hors setup.
+    """
+    times = []
+    state = None
+    while len(times) < repeat or (sum(times) < min_time and len(times) < 20 * repeat):
+        if benchmark.fresh or state is None:
+            state = benchmark.setup(case)
+        start = time.perf_counter()
+        result = benchmark.run(state)
+        times.append(time.perf_counter() - start)
+    return times, state, result
+
+
+def run_suite(
+        cases: list[Case],
+        reference: dict,
+        repeat: int=3,
+        min_time: float=0.2,
+        rtol: float=1e-6,
+        only: list[str]|None=None,
+        verbose: bool=True,
+) -> list[dict]:
+    results = []
+    for benchmark in benchmarks():
+        if only and benchmark.name not in only:
+            continue
+        for case in cases:
+            if not benchmark.applicable(case):
+                continue
+            times, state, result = measure(benchmark, case, repeat, min_time)
+            value = [float(v) for v in benchmark.value(result)]
+            reference_value = reference.get(benchmark.name, {}).get(case.key)
+            reference_error = None if reference_value is None else relative_error(value, reference_value)
+            check_error = None if benchmark.check is None else benchmark.check(case, state, result)
+            ok = (reference_error is None or reference_error <= rtol) and (check_error is None or check_error <= benchmark.check_tol)
+            entry = {
+                'benchmark': benchmark.name,
+                'case': case.key,
+                'length': case.length,
+                'thickness': case.thickness,
+                'runs': len(times),
+                'min': min(times),
+                'median': statistics.median(times),
+                'value': value,
+                'reference_error': reference_error,
+                'check_error': check_error,
+                'ok': ok,
+            }
+            results.append(entry)
+            if verbose:
+                statut = 'ok' if ok else 'ECART'
+                print(f"{benchmark.name:<28}{case.key:<16}{1000 * entry['min']:>10.3f} ms  {statut}", file=sys.stderr)
+    return results
+
+
+def compare_baseline(results: list[dict], baseline: list[dict], max_ratio: float) -> list[str]:
+    """
+    Régressions de temps par rapport à un précédent fichier de résultats (comparaison des temps minimaux).
+    """
+    previous = {(entry['benchmark'], entry['case']): entry['min'] for entry in baseline}
+    regressions = []
+    for entry in results:
+        before = previous.get((entry['benchmark'], entry['case']))
+        if before is not None and entry['min'] > max_ratio * before:
+            regressions.append(f"{entry['benchmark']} {entry['case']}: {1000 * before:.3f} ms -> {1000 * entry['min']:.3f} ms")
+    return regressions
+
+
+def main(argv: list[str]|None=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bench_pieu', description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--output', '-o', help="Fichier JSON des résultats (sortie standard par défaut)")
+    parser.add_argument('--baseline', help="Précédent fichier de résultats pour la détection des régressions")
+    parser.add_argument('--max-ratio', type=float, default=1.5, help="Ralentissement maximal toléré par rapport à --baseline")
+    parser.add_argument('--lengths', type=float, nargs='+', default=LENGTHS)
+    parser.add_argument('--thicknesses', type=float, nargs='+', default=THICKNESSES)
+    parser.add_argument('--quick', action='store_true', help="Mesures réduites (pieu de 14 m, mailles de 200, 50 et 10 mm)")
+    parser.add_argument('--only', nargs='+', help="Noms des mesures à réaliser")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--min-time', type=float, default=0.2, help="Durée cumulée minimale de chaque mesure [s]")
+    parser.add_argument('--max-fe-nodes', type=int, default=1000, help="Nombre de noeuds maximal des modèles PyNite mesurés")
+    parser.add_argument('--update-reference', action='store_true', help="Enregistre les valeurs calculées comme nouvelles références")
+    args = parser.parse_args(argv)
+
+    lengths, thicknesses = args.lengths, args.thicknesses
+    if args.quick:
+        lengths, thicknesses = [14.], [0.200, 0.050, 0.010]
+    cases = [Case(length, thickness) for length in lengths for thickness in thicknesses]
+    reference = json.loads(REFERENCE.read_text()) if REFERENCE.exists() else {}
+
+    global MAX_FE_NODES
+    MAX_FE_NODES = args.max_fe_nodes
+    results = run_suite(cases, reference, args.repeat, args.min_time, only=args.only)
+    report = {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+        },
+        'results': results,
+    }
+    text = json.dumps(report, indent=1)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+
+    if args.update_reference:
+        for entry in results:
+            reference.setdefault(entry['benchmark'], {})[entry['case']] = entry['value']
+        REFERENCE.write_text(json.dumps(reference, indent=1, sort_keys=True))
+
+    failures = [f"{entry['benchmark']} {entry['case']}" for entry in results if not entry['ok']]
+    regressions = []
+    if args.baseline:
+        regressions = compare_baseline(results, json.loads(Path(args.baseline).read_text())['results'], args.max_ratio)
+    for message in failures:
+        print(f"Ecart de résultat : {message}", file=sys.stderr)
+    for message in regressions:
+        print(f"Régression de temps : {message}", file=sys.stderr)
+    return 1 if failures or regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
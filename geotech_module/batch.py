@@ -0,0 +1,323 @@
+"""
+Calcul en série d'un ensemble de pieux (tableau de pieux d'un projet), sans interface graphique.
+
+Les pieux sont répartis sur un ensemble de processus et les résultats sont écrits au fur et à mesure de leur obtention :
+
+    python -m geotech_module.batch pieux.csv --lithologies lithologies.json --output resultats.csv --workers 8
+
+Tableau des pieux (CSV, JSON ou JSONL), une ligne par pieu, unités du module (m, MPa, MN) :
+    - name, category, level_top, level_bott, Dp, Ds, Eb, thickness (facultatif) et lithology (clé de la lithologie);
+    - mesh_tolerance (facultatif) :         tolérance du maillage adaptatif (Pile.maillage_adaptatif), maillage uniforme sinon;
+    - Q_ELS_QP, Q_ELS_CAR (facultatifs) :   charges de service pour le calcul du tassement en tête (colonnes de résultats
+                                            dz_*, convergence_* et message_*, cause de l'absence de tassement);
+    - H, M, situation (facultatifs) :       effort horizontal et moment en tête pour le calcul transversal.
+Lithologies (JSON {clé: [couches]} ou CSV d'une couche par ligne avec la colonne lithology) : champs de Soil
+(name, level_sup, level_inf, courbe_frottement, pf, pl, Em, alpha, soil_type). Une couche peut faire référence
+à un essai pressiométrique (colonne log) : pf, pl et Em sont alors les moyennes de l'essai sur la couche (SoilPressio).
+Essais pressiométriques (--logs, JSON {log: {levels_ngf, cb_pf, cb_pl, cb_Em}} ou CSV log, level_ngf, pf, pl, Em).
+Avec --stats, les mesures de l'instrumentation (geotech_module.stats) de tous les processus sont cumulées et écrites en JSON.
+"""
+import argparse
+import csv
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+
+import geotech_module.stats as stats
+from geotech_module.pieu import Pile
+from geotech_module.soil import Soil, LogPressio, SoilPressio
+
+
+CAPACITES = [
+    'resistance_totale',
+    'portance_ELS_QP', 'portance_ELS_Car', 'portance_ELU_Str', 'portance_ELU_Acc',
+    'traction_ELS_QP', 'traction_ELS_Car', 'traction_ELU_Str', 'traction_ELU_Acc',
+]
+# Charges de service : colonne de la charge et suffixe des colonnes de résultats (tassement, convergence, message)
+CHARGES_SERVICE = {'Q_ELS_QP': 'ELS_QP', 'Q_ELS_CAR': 'ELS_CAR'}
+RESULTATS_SERVICE = [f'{colonne}_{suffixe}' for suffixe in CHARGES_SERVICE.values() for colonne in ['dz', 'convergence', 'message']]
+RESULTATS = ['name', *CAPACITES, *RESULTATS_SERVICE, 'deflection_max', 'moment_max', 'shear_max', 'erreur']
+# Fraction de la résistance totale au-delà de laquelle l'équilibre sous une charge de service est recherché par encadrement
+# (Pile.equilibre_Q_top) plutôt que par Newton-Raphson vectorisé (Pile.equilibre_Q_top_batch), peu fiable près du palier
+FRACTION_CHARGE_LIMITE = 0.9
+
+# Lithologies des processus de calcul, transmises une seule fois à la création de chaque processus
+_LITHOLOGIES = {}
+
+
+def read_records(path: str|Path) -> list[dict]:
+    """
+    Lecture d'un tableau d'enregistrements : CSV (une ligne par enregistrement), JSON (liste) ou JSONL (un objet par ligne).
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    with open(path, newline='', encoding='utf-8') as file:
+        if suffix == '.csv':
+            return list(csv.DictReader(file))
+        elif suffix == '.json':
+            return json.load(file)
+        elif suffix == '.jsonl':
+            return [json.loads(line) for line in file if line.strip()]
+    raise ValueError(f"Format de fichier non pris en charge : {path.name}, doit être parmi ['.csv', '.json', '.jsonl']")
+
+
+def optional_float(value) -> float|None:
+    """
+    Valeur numérique facultative : None pour une valeur absente ou une cellule vide.
+    """
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    return float(value)
+
+
+def read_logs(path: str|Path|None) -> dict[str, LogPressio]:
+    """
+    Essais pressiométriques {log: LogPressio}, à partir d'un JSON {log: {levels_ngf, cb_pf, cb_pl, cb_Em}}
+    ou d'un CSV d'un point de mesure par ligne (log, level_ngf, pf, pl, Em).
+    """
+    if path is None:
+        return {}
+    if Path(path).suffix.lower() == '.json':
+        with open(path, encoding='utf-8') as file:
+            return {name: LogPressio(**log) for name, log in json.load(file).items()}
+    points = {}
+    for record in read_records(path):
+        points.setdefault(record['log'], []).append(
+            [float(record[name]) for name in ('level_ngf', 'pf', 'pl', 'Em')]
+        )
+    return {name: LogPressio(*np.array(log).T.tolist()) for name, log in points.items()}
+
+
+def soil_from_record(record: dict, logs: dict[str, LogPressio]) -> Soil:
+    """
+    Couche de sol à partir d'un enregistrement ; pf, pl et Em sont moyennés sur l'essai pressiométrique log s'il est renseigné.
+    """
+    level_sup = float(record['level_sup'])
+    level_inf = float(record['level_inf'])
+    log = record.get('log')
+    if log:
+        if log not in logs:
+            raise KeyError(f"Essai pressiométrique inconnu : {log}")
+        pressio = SoilPressio(record['name'], level_sup, level_inf, record['courbe_frottement'], logs[log])
+        pf, pl, Em = pressio.pf_mean, pressio.pl_mean, pressio.Em_mean
+    else:
+        pf, pl, Em = float(record['pf']), float(record['pl']), float(record['Em'])
+    return Soil(
+        name=record['name'],
+        level_sup=level_sup,
+        level_inf=level_inf,
+        courbe_frottement=record['courbe_frottement'],
+        pf=pf,
+        pl=pl,
+        Em=Em,
+        alpha=float(record['alpha']),
+        soil_type=record.get('soil_type') or 'granulaire',
+    )
+
+
+def read_lithologies(path: str|Path, logs: dict[str, LogPressio]|None=None) -> dict[str, list[Soil]]:
+    """
+    Lithologies {clé: [Soil]}, à partir d'un JSON {clé: [couches]} ou d'un CSV d'une couche par ligne (colonne lithology).
+    """
+    logs = logs or {}
+    if Path(path).suffix.lower() == '.json':
+        with open(path, encoding='utf-8') as file:
+            groups = json.load(file)
+    else:
+        groups = {}
+        for record in read_records(path):
+            groups.setdefault(record['lithology'], []).append(record)
+    return {key: [soil_from_record(layer, logs) for layer in layers] for key, layers in groups.items()}
+
+
+def pile_from_record(record: dict, lithologies: dict[str, list[Soil]]) -> Pile:
+    """
+    Pieu défini par une ligne du tableau des pieux.
+    """
+    if record['lithology'] not in lithologies:
+        raise KeyError(f"Lithologie inconnue : {record['lithology']}")
+    thickness = optional_float(record.get('thickness'))
+    return Pile(
+        category=int(record['category']),
+        level_top=float(record['level_top']),
+        level_bott=float(record['level_bott']),
+        Eb=float(record['Eb']),
+        Dp=float(record['Dp']),
+        Ds=float(record['Ds']),
+        lithology=lithologies[record['lithology']],
+        thickness=0.20 if thickness is None else thickness,
+        mesh_tolerance=optional_float(record.get('mesh_tolerance')),
+    )
+
+
+def compute_pile(record: dict, lithologies: dict[str, list[Soil]]) -> dict:
+    """
+    Résultats d'un pieu : capacités, tassement en tête sous les charges de service et maxima du calcul transversal.
+    Les tassements sont calculés ensemble (equilibre_Q_top_batch) ; les charges proches de la résistance totale
+    et celles dont l'équilibre n'a pas convergé sont reprises par recherche encadrée (equilibre_Q_top).
+    Un équilibre non trouvé est signalé par les colonnes convergence_* et message_*.
+    Une erreur de calcul est renvoyée dans le champ erreur, sans interrompre le traitement des autres pieux.
+    """
+    resultat = dict.fromkeys(RESULTATS)
+    resultat['name'] = record.get('name')
+    try:
+        pile = pile_from_record(record, lithologies)
+        for name in CAPACITES:
+            resultat[name] = float(getattr(pile, name))
+
+        charges = {key: optional_float(record.get(key)) for key in CHARGES_SERVICE}
+        charges = {key: q for key, q in charges.items() if q is not None}
+        if charges:
+            q_top = np.array(list(charges.values()))
+            encadrees = q_top >= FRACTION_CHARGE_LIMITE * pile.resistance_totale
+            dz_top = np.full(q_top.shape, np.nan)
+            convergence = np.zeros(q_top.shape, dtype=bool)
+            if not encadrees.all():
+                dz_pointe, dz_top[~encadrees], convergence[~encadrees] = pile.equilibre_Q_top_batch(q_top[~encadrees])
+            for i, key in enumerate(charges):
+                suffixe = CHARGES_SERVICE[key]
+                message = None
+                if not convergence[i]:
+                    equilibre = pile.equilibre_Q_top(q_top[i])
+                    if equilibre is None:
+                        message = pile.message_equilibre
+                    else:
+                        dz_top[i], convergence[i] = equilibre[2], True
+                resultat[f'dz_{suffixe}'] = float(dz_top[i]) if convergence[i] else None
+                resultat[f'convergence_{suffixe}'] = bool(convergence[i])
+                resultat[f'message_{suffixe}'] = message
+
+        H = optional_float(record.get('H'))
+        M = optional_float(record.get('M'))
+        if H is not None or M is not None:
+            lateral = pile.lateral_analysis(H or 0., M or 0., record.get('situation') or 'court terme')
+            resultat['deflection_max'] = float(np.abs(lateral.deflection).max())
+            resultat['moment_max'] = float(np.abs(lateral.moment).max())
+            resultat['shear_max'] = float(np.abs(lateral.shear).max())
+    except Exception as erreur:
+        resultat['erreur'] = f"{type(erreur).__name__}: {erreur}"
+    return resultat
+
+
+def _init_worker(lithologies: dict[str, list[Soil]]):
+    global _LITHOLOGIES
+    _LITHOLOGIES = lithologies
+
+
+def _compute_chunk(
+        records: list[dict],
+        lithologies: dict[str, list[Soil]]|None=None,
+        collect: bool=False,
+) -> tuple[list[dict], stats.Stats|None]:
+    lithologies = _LITHOLOGIES if lithologies is None else lithologies
+    if not collect:
+        return [compute_pile(record, lithologies) for record in records], None
+    with stats.collect() as statistiques:
+        resultats = [compute_pile(record, lithologies) for record in records]
+    return resultats, statistiques
+
+
+class ResultWriter:
+    """
+    Ecriture des résultats au fur et à mesure, en CSV (colonnes RESULTATS) ou en JSONL (un objet par ligne).
+    """
+
+    def __init__(self, file, format: str):
+        if format not in ['csv', 'jsonl']:
+            raise ValueError("format doit être parmi ['csv', 'jsonl']")
+        self.file = file
+        self.format = format
+        if format == 'csv':
+            self.writer = csv.DictWriter(file, fieldnames=RESULTATS, lineterminator='\n')
+            self.writer.writeheader()
+
+    def write(self, resultat: dict):
+        if self.format == 'csv':
+            self.writer.writerow({key: '' if value is None else value for key, value in resultat.items()})
+        else:
+            self.file.write(json.dumps(resultat) + '\n')
+        self.file.flush()
+
+
+def run_batch(
+        records: list[dict],
+        lithologies: dict[str, list[Soil]],
+        writer: ResultWriter,
+        workers: int|None=None,
+        chunksize: int=8,
+        statistiques: stats.Stats|None=None,
+) -> int:
+    """
+    Calcule tous les pieux et écrit chaque résultat dès qu'il est disponible (ordre d'achèvement, pas ordre du tableau).
+    Les pieux sont regroupés par paquets de chunksize pour limiter les échanges entre processus ;
+    les lithologies sont transmises une seule fois à chaque processus. Avec workers=1, le calcul est réalisé dans le processus courant.
+    Si statistiques est renseigné, les mesures de l'instrumentation de chaque paquet y sont cumulées.
+    Renvoie le nombre de pieux en erreur.
+    """
+    chunks = [records[start:start + chunksize] for start in range(0, len(records), chunksize)]
+    collect = statistiques is not None
+    erreurs = 0
+    if workers == 1:
+        for chunk in chunks:
+            erreurs += _write_results(writer, *_compute_chunk(chunk, lithologies, collect), statistiques)
+        return erreurs
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(lithologies,)) as executor:
+        futures = [executor.submit(_compute_chunk, chunk, None, collect) for chunk in chunks]
+        for future in as_completed(futures):
+            erreurs += _write_results(writer, *future.result(), statistiques)
+    return erreurs
+
+
+def _write_results(
+        writer: ResultWriter,
+        resultats: list[dict],
+        statistiques_paquet: stats.Stats|None,
+        statistiques: stats.Stats|None,
+) -> int:
+    for resultat in resultats:
+        writer.write(resultat)
+    if statistiques_paquet is not None:
+        statistiques.merge(statistiques_paquet)
+    return sum(resultat['erreur'] is not None for resultat in resultats)
+
+
+def main(argv: list[str]|None=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m geotech_module.batch',
+        description="Calcul en série d'un tableau de pieux suivant la NF P94-262 (capacités, tassement, calcul transversal).",
+    )
+    parser.add_argument('piles', help="Tableau des pieux (.csv, .json ou .jsonl)")
+    parser.add_argument('--lithologies', required=True, help="Lithologies (.json ou .csv)")
+    parser.add_argument('--logs', help="Essais pressiométriques (.json ou .csv)")
+    parser.add_argument('--output', '-o', help="Fichier de résultats (.csv ou .jsonl) ; sortie standard par défaut")
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help="Format des résultats (déduit de l'extension de --output par défaut)")
+    parser.add_argument('--workers', type=int, default=None, help="Nombre de processus (nombre de coeurs par défaut)")
+    parser.add_argument('--chunksize', type=int, default=8, help="Nombre de pieux par tâche")
+    parser.add_argument('--stats', help="Fichier JSON des mesures de l'instrumentation (solveurs, durées des étapes)")
+    args = parser.parse_args(argv)
+
+    lithologies = read_lithologies(args.lithologies, read_logs(args.logs))
+    records = read_records(args.piles)
+    format = args.format
+    if format is None:
+        format = 'jsonl' if args.output and Path(args.output).suffix.lower() == '.jsonl' else 'csv'
+
+    statistiques = stats.Stats() if args.stats else None
+    if args.output is None:
+        erreurs = run_batch(records, lithologies, ResultWriter(sys.stdout, format), args.workers, args.chunksize, statistiques)
+    else:
+        with open(args.output, 'w', newline='', encoding='utf-8') as file:
+            erreurs = run_batch(records, lithologies, ResultWriter(file, format), args.workers, args.chunksize, statistiques)
+    if statistiques is not None:
+        with open(args.stats, 'w', encoding='utf-8') as file:
+            json.dump(statistiques.summary(), file, indent=2)
+    if erreurs:
+        print(f"{erreurs} pieu(x) en erreur sur {len(records)}", file=sys.stderr)
+    return 1 if erreurs else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,331 @@
+from dataclasses import dataclass
+import numpy as np
+from scipy.linalg import cho_solve_banded, cholesky_banded, solveh_banded
+
+import geotech_module.stats as stats
+import geotech_module.utils as utils
+
+
+@dataclass
+class LateralResults:
+    """
+    Résultats du calcul du pieu sous sollicitations horizontales, aux noeuds du modèle (de la tête vers la pointe) :
+        - levels:           Niveau de chaque noeud
+        - deflection:       Déplacement horizontal
+        - rotation:         Rotation (dérivée du déplacement par rapport au niveau)
+        - moment:           Moment fléchissant
+        - shear:            Effort tranchant (dans l'élément situé sous le noeud; valeur de l'élément supérieur à la pointe)
+        - soil_reaction:    Réaction des ressorts de sol (k * déplacement, ou loi de mobilisation en calcul non linéaire)
+        - convergence:      Convergence du calcul non linéaire
+        - iterations:       Nombre total d'itérations du calcul non linéaire
+    Pour un calcul de plusieurs cas de charges (LateralModel.solve), les résultats sont empilés : une ligne par cas de charge.
+    Les conventions de signes sont celles du modèle PyNite (utils.build_pile, effort 'Fy' et moment 'Mz' appliqués en tête).
+    """
+    levels: np.ndarray
+    deflection: np.ndarray
+    rotation: np.ndarray
+    moment: np.ndarray
+    shear: np.ndarray
+    soil_reaction: np.ndarray
+    convergence: bool=True
+    iterations: int=0
+
+    def curves(self, EI: float, step: float|None=None) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Courbes du moment fléchissant, de l'effort tranchant et du déplacement le long du pieu (utils.hermite_curves),
+        aux noeuds si step vaut None, sinon au pas step. Renvoie (niveaux, moment, effort tranchant, déplacement).
+        """
+        return utils.hermite_curves(self.levels, self.deflection, self.rotation, EI, step)
+
+
+def element_stiffness(EI: float, L: np.ndarray) -> np.ndarray:
+    """
+    Matrices de rigidité des éléments de poutre d'Euler-Bernoulli (ddl [v1, theta1, v2, theta2]) pour un tableau de longueurs L.
+    Renvoie un tableau de dimension (n_elements, 4, 4).
+    """
+    L = np.asarray(L, dtype=float)[:, np.newaxis, np.newaxis]
+    k = np.array([
+        [12., 6., -12., 6.],
+        [6., 4., -6., 2.],
+        [-12., -6., 12., -6.],
+        [6., 2., -6., 4.],
+    ])
+    # Puissances de L associées à chaque terme : 12/L³, 6/L², 4/L, 2/L
+    powers = np.array([
+        [3, 2, 3, 2],
+        [2, 1, 2, 1],
+        [3, 2, 3, 2],
+        [2, 1, 2, 1],
+    ])
+    return EI * k / L**powers
+
+
+def assemble_banded(levels: np.ndarray, EI: float, springs: np.ndarray) -> np.ndarray:
+    """
+    Assemble la matrice de rigidité de la poutre sur appuis élastiques sous forme de bande supérieure (format de solveh_banded).
+    Les ddl sont ordonnés [v0, theta0, v1, theta1, ...] : la demi-largeur de bande est de 3.
+        - levels:   Niveaux des noeuds, de la tête vers la pointe
+        - EI:       Rigidité en flexion du pieu
+        - springs:  Raideur du ressort de sol de chaque noeud
+    """
+    levels = np.asarray(levels, dtype=float)
+    n_dof = 2 * len(levels)
+    k_el = element_stiffness(EI, levels[:-1] - levels[1:])
+    ab = np.zeros((4, n_dof))
+    for row in range(4):
+        for col in range(row, 4):
+            # Terme K[2e + row, 2e + col] stocké dans ab[3 + row - col, 2e + col]
+            dofs = 2 * np.arange(len(k_el)) + col
+            np.add.at(ab[3 + row - col], dofs, k_el[:, row, col])
+    ab[3, 0::2] += springs
+    return ab
+
+
+def load_vector(n_nodes: int, horizontal_force: float, bending_moment: float) -> np.ndarray:
+    """
+    Vecteur des efforts nodaux : effort horizontal et moment fléchissant appliqués en tête.
+    """
+    load = np.zeros(2 * n_nodes)
+    load[0] = horizontal_force
+    load[1] = bending_moment
+    return load
+
+
+def internal_forces(levels: np.ndarray, EI: float, springs: np.ndarray, dofs: np.ndarray) -> LateralResults:
+    """
+    Efforts internes aux noeuds à partir du vecteur des déplacements [v0, theta0, v1, theta1, ...].
+    dofs peut contenir plusieurs cas de charges (une ligne par cas) : les résultats sont alors empilés de la même façon.
+    """
+    levels = np.asarray(levels, dtype=float)
+    k_el = element_stiffness(EI, levels[:-1] - levels[1:])
+    n_el = len(levels) - 1
+    element_dofs = dofs[..., 2 * np.arange(n_el)[:, np.newaxis] + np.arange(4)]
+    end_forces = np.einsum('eij,...ej->...ei', k_el, element_dofs)
+
+    # Les ddl de rotation sont définis par rapport à la profondeur : rotation et moment changent de signe
+    # pour suivre la convention PyNite (axe de la barre orienté de la tête vers la pointe, niveaux croissants vers le haut)
+    deflection = dofs[..., 0::2]
+    moment = np.empty(deflection.shape)
+    moment[..., :-1] = end_forces[..., 1]
+    moment[..., -1] = - end_forces[..., -1, 3]
+    shear = np.empty(deflection.shape)
+    shear[..., :-1] = end_forces[..., 0]
+    shear[..., -1] = end_forces[..., -1, 0]
+    return LateralResults(
+        levels=levels,
+        deflection=deflection,
+        rotation=- dofs[..., 1::2],
+        moment=moment,
+        shear=shear,
+        soil_reaction=springs * deflection,
+    )
+
+
+@dataclass
+class LateralModel:
+    """
+    Modèle latéral linéaire d'un pieu (poutre sur ressorts de sol) assemblé et factorisé une seule fois :
+        - levels:   Niveaux des noeuds, de la tête vers la pointe
+        - EI:       Rigidité en flexion du pieu
+        - springs:  Raideur du ressort de sol de chaque noeud
+    La factorisation de Cholesky de la matrice bande est conservée ; chaque appel à solve ne réalise que
+    les descentes-remontées, pour un nombre quelconque de cas de charges en tête résolus simultanément.
+    """
+
+    levels: np.ndarray
+    EI: float
+    springs: np.ndarray
+
+    def __post_init__(self):
+        self.levels = np.asarray(self.levels, dtype=float)
+        self.springs = np.asarray(self.springs, dtype=float)
+        self.factor = cholesky_banded(assemble_banded(self.levels, self.EI, self.springs))
+
+    @stats.timed('lateral_resolution')
+    def solve(
+            self,
+            horizontal_force: float|np.ndarray=0.,
+            bending_moment: float|np.ndarray=0.,
+    ) -> LateralResults:
+        """
+        Résolution pour un ou plusieurs cas de charges (efforts horizontaux et moments fléchissants en tête, diffusés entre eux).
+        Pour des valeurs scalaires, les résultats sont des vecteurs aux noeuds ; pour des tableaux,
+        les résultats sont empilés avec une ligne par cas de charge (dimension (nombre de cas, nombre de noeuds)).
+        """
+        H, M = np.broadcast_arrays(np.asarray(horizontal_force, dtype=float), np.asarray(bending_moment, dtype=float))
+        load = np.zeros((2 * len(self.levels), H.size))
+        load[0] = H.ravel()
+        load[1] = M.ravel()
+        dofs = cho_solve_banded((self.factor, False), load).T
+        if H.ndim == 0:
+            dofs = dofs[0]
+        return internal_forces(self.levels, self.EI, self.springs, dofs)
+
+
+def solve_lateral(
+        levels: np.ndarray,
+        EI: float,
+        springs: np.ndarray,
+        horizontal_force: float=0.,
+        bending_moment: float=0.,
+) -> LateralResults:
+    """
+    Calcul linéaire du pieu sous un effort horizontal et un moment fléchissant en tête :
+    poutre d'Euler-Bernoulli sur ressorts de sol (un ressort par noeud), résolue par factorisation de Cholesky de la matrice bande.
+    """
+    return LateralModel(levels, EI, springs).solve(horizontal_force, bending_moment)
+
+
+@stats.timed('fe_extraction')
+def results_from_fe_model(fe_model, levels: np.ndarray, springs: np.ndarray, combo: str='Combo 1') -> LateralResults:
+    """
+    Résultats aux noeuds d'un modèle PyNite analysé (utils.build_pile), dans le même format que solve_lateral.
+    Permet de contrôler le calcul par matrice bande avec PyNite.
+    """
+    levels = np.asarray(levels, dtype=float)
+    member = fe_model.Members['pile']
+    x = levels[0] - levels
+    # Effort tranchant lu juste sous chaque noeud (juste au-dessus pour la pointe)
+    x_shear = np.append(x[:-1] + 1e-9, x[-1])
+    deflection = np.array([fe_model.Nodes[f"N{i}"].DY[combo] for i in range(len(levels))])
+    return LateralResults(
+        levels=levels,
+        deflection=deflection,
+        rotation=np.array([fe_model.Nodes[f"N{i}"].RZ[combo] for i in range(len(levels))]),
+        moment=np.array([member.moment('Mz', xi, combo) for xi in x.tolist()]),
+        shear=np.array([member.shear('Fy', xi, combo) for xi in x_shear.tolist()]),
+        soil_reaction=np.asarray(springs, dtype=float) * deflection,
+    )
+
+
+def soil_reaction(deflection: np.ndarray, q1: np.ndarray, k1: np.ndarray, q2: np.ndarray, k2: np.ndarray) -> np.ndarray:
+    """
+    Réaction des ressorts de sol non linéaires (loi tri-linéaire symétrique, plafonnée au second palier q2).
+    """
+    return np.sign(deflection) * utils.tri_linear_law_array(np.abs(deflection), q1, k1, q2, k2)
+
+
+def soil_stiffness(
+        deflection: np.ndarray,
+        q1: np.ndarray,
+        k1: np.ndarray,
+        q2: np.ndarray,
+        k2: np.ndarray,
+        methode: str='tangent',
+        k_min: float=1e-3,
+) -> np.ndarray:
+    """
+    Raideur des ressorts de sol non linéaires pour le déplacement donné :
+        - 'secant':     p(y) / y (raideur initiale k1 pour un déplacement nul);
+        - 'tangent':    pente de la loi, limitée à k_min * k1 sur les paliers pour conserver une matrice définie positive.
+    """
+    y = np.abs(deflection)
+    if methode == 'secant':
+        p = utils.tri_linear_law_array(y, q1, k1, q2, k2)
+        return np.where(y > 0, p / np.where(y > 0, y, 1.), k1)
+    elif methode == 'tangent':
+        return np.maximum(utils.tri_linear_slope_array(y, q1, k1, q2, k2), k_min * k1)
+    raise ValueError("methode doit être parmi ['secant', 'tangent']")
+
+
+@stats.timed('lateral_non_lineaire')
+def solve_lateral_nonlinear(
+        levels: np.ndarray,
+        EI: float,
+        q1: np.ndarray,
+        k1: np.ndarray,
+        q2: np.ndarray,
+        k2: np.ndarray,
+        horizontal_force: float=0.,
+        bending_moment: float=0.,
+        nb_pas: int=1,
+        methode: str='tangent',
+        max_iterations: int=50,
+        tolerance: float=1e-6,
+) -> LateralResults:
+    """
+    Calcul non linéaire du pieu sur ressorts de sol de lois tri-linéaires (q1, k1, q2, k2 pour chaque noeud, k1 = 0 sans ressort).
+    Le chargement en tête est appliqué en nb_pas pas égaux. A chaque pas, la raideur des ressorts est réactualisée
+    et le système bande est réassemblé et résolu jusqu'à ce que le résidu des efforts nodaux soit inférieur
+    à tolerance * |chargement|. Chaque pas part de l'état du pas précédent.
+        - 'tangent':    méthode de Newton-Raphson (raideur tangente limitée sur les paliers), convergence en quelques itérations;
+        - 'secant':     substitutions successives sur la raideur sécante, plus robuste mais lente à l'approche des paliers.
+    En l'absence de convergence (chargement supérieur à la réaction maximale du sol), le calcul s'arrête au pas non convergé
+    et convergence vaut False.
+    """
+    levels = np.asarray(levels, dtype=float)
+    q1, k1, q2, k2 = (np.asarray(law, dtype=float) for law in (q1, k1, q2, k2))
+    has_spring = k1 > 0
+    # Les noeuds sans ressort reçoivent une loi fictive (raideur nulle) pour éviter les divisions par zéro
+    k1_safe = np.where(has_spring, k1, 1.)
+    k2_safe = np.where(has_spring, k2, 1.)
+    load_max = load_vector(len(levels), horizontal_force, bending_moment)
+    beam = assemble_banded(levels, EI, np.zeros(len(levels)))
+
+    deflection = np.zeros(len(levels))
+    dofs = np.zeros(2 * len(levels))
+    iterations = 0
+    convergence = True
+    for pas in range(1, nb_pas + 1):
+        load = load_max * pas / nb_pas
+        tolerance_pas = tolerance * max(np.abs(load).max(), 1e-12)
+        converged = False
+        for _ in range(max_iterations):
+            iterations += 1
+            springs = np.where(has_spring, soil_stiffness(deflection, q1, k1_safe, q2, k2_safe, methode), 0.)
+            ab = beam.copy()
+            ab[3, 0::2] += springs
+            if methode == 'secant':
+                dofs = solveh_banded(ab, load)
+            else:
+                dofs = dofs + solveh_banded(ab, residual(beam, dofs, load, deflection, q1, k1_safe, q2, k2_safe, has_spring))
+            deflection = dofs[0::2]
+            if np.abs(residual(beam, dofs, load, deflection, q1, k1_safe, q2, k2_safe, has_spring)).max() <= tolerance_pas:
+                converged = True
+                break
+        if not converged:
+            convergence = False
+            break
+
+    reaction = np.where(has_spring, soil_reaction(deflection, q1, k1_safe, q2, k2_safe), 0.)
+    secant = np.where(deflection != 0, reaction / np.where(deflection != 0, deflection, 1.), 0.)
+    results = internal_forces(levels, EI, secant, dofs)
+    results.soil_reaction = reaction
+    results.convergence = bool(convergence)
+    results.iterations = iterations
+    stats.record_solver(
+        'solve_lateral_nonlinear', iterations, iterations, {iterations: 1}, int(not convergence),
+        {'methode': methode, 'nb_pas': nb_pas},
+    )
+    return results
+
+
+def banded_product(ab: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """
+    Produit matrice-vecteur pour une matrice symétrique stockée en bande supérieure (format de solveh_banded).
+    """
+    u = ab.shape[0] - 1
+    y = ab[u] * x
+    for d in range(1, u + 1):
+        y[:-d] += ab[u - d, d:] * x[d:]
+        y[d:] += ab[u - d, d:] * x[:-d]
+    return y
+
+
+def residual(
+        beam: np.ndarray,
+        dofs: np.ndarray,
+        load: np.ndarray,
+        deflection: np.ndarray,
+        q1: np.ndarray,
+        k1: np.ndarray,
+        q2: np.ndarray,
+        k2: np.ndarray,
+        has_spring: np.ndarray,
+) -> np.ndarray:
+    """
+    Résidu des efforts nodaux : chargement - (efforts de la poutre + réactions non linéaires du sol).
+    """
+    forces = banded_product(beam, dofs)
+    forces[0::2] += np.where(has_spring, soil_reaction(deflection, q1, k1, q2, k2), 0.)
+    return load - forces
@@ -1,11 +1,16 @@
+import functools
 import math
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, replace
+from typing import Callable
 import matplotlib.pyplot as plt
+import numpy as np
 
 
+import geotech_module.lateral as lateral
+import geotech_module.stats as stats
 import geotech_module.utils as utils
-from geotech_module.solver import NewtonRaphson11
-from geotech_module.soil import Soil
+from geotech_module.solver import NewtonRaphson11, BatchNewton, BracketedSolver11
+from geotech_module.soil import Soil, LithologyIndex
 
 
 TAB_A1 = {
@@ -56,6 +61,33 @@ TAB_F21 = {
 }
 
 
+# Coefficient appliqué au module kf pour le ressort linéaire, suivant la situation de calcul
+COEFF_KF = {
+    'court terme': 1.,
+    'long terme': 0.5,
+    'elu': 1.,
+    'sismique': 3.,
+}
+
+# Loi de mobilisation de la pression latérale suivant la situation de calcul :
+# (pression du premier palier, coefficient de kf, pression du second palier, coefficient de kf de la seconde branche)
+# Le second palier vaut None pour une loi bi-linéaire.
+LOIS_PRESSION_LATERALE = {
+    'court terme': ('pf', 1., None, None),
+    'long terme': ('pf', 0.5, None, None),
+    'elu': ('pf', 1., 'pl', 0.5),
+    'sismique': ('pl', 3., None, None),
+}
+
+# Maillage adaptatif (Pile.maillage_adaptatif) : épaisseur minimale des tranches et nombre de déplacements de la pointe
+# (du domaine élastique au palier) pour lesquels l'erreur de discrétisation du transfert de charge axial est contrôlée
+EPAISSEUR_MIN = 0.001
+NB_ETATS_MAILLAGE = 7
+
+# Parcours en déplacement imposé (Pile.courbe_deplacement_impose) : nombre maximal de divisions par 10 du premier déplacement
+NB_DIVISIONS_DZ_MIN = 10
+
+
 @dataclass
 class SlicePile:
     """
@@ -148,11 +180,7 @@ class SlicePile:
         """
         Valeur du frottement axial unitaire admissible - suivant l'article F.5.2 de la NF P94-262.
         """
-        alpha_pieu_sol = self.soil.alpha_pieu_sol(self.pile_category)
-        f_sol = self.soil.fonction_fsol
-        qs = alpha_pieu_sol * f_sol
-        
-        return min(qs, self.qs_max)
+        return self.soil.frottement_limite(self.pile_category)
 
     @property
     def module_kt(self) -> float:
@@ -198,11 +226,18 @@ class SlicePile:
         """
         return self.Ds * self.delta_h**2 / (2 * self.Dp**2 * self.Eb)
 
+    @property
+    def skin_friction_law(self):
+        """
+        Loi de mobilisation du frottement axial (par défaut celle de Frank et Zhao : utils.skin_friction_law).
+        """
+        return self.data_pieu.get('skin_friction_law', utils.skin_friction_law)
+
     def tau_z(self, z: float) -> float:
         """
         Frottement latéral autour du pieu calculé pour un déplacement donné z.
         """
-        return utils.skin_friction_law(z, self.qs_lim, self.module_kt)
+        return self.skin_friction_law(z, self.qs_lim, self.module_kt)
 
     def q_z(self, qb: float, z: float) -> float:
         """
@@ -245,60 +280,478 @@ class SlicePile:
 
     def equilibre(self, dz_bott: float) -> float:
         """
-        Calcul l'équilibre d'un tronçon pour un tassement donné
-        """
-        dz_middle = NewtonRaphson11(self.fonction_F, [0.], [dz_bott]).final_roots
+        Calcul l'équilibre d'un tronçon pour un tassement donné.
+        La solution est exacte si la loi de mobilisation est linéaire par morceaux, obtenue par Newton-Raphson sinon
+        (ou si la solution exacte n'est pas unique) ; ValueError si Newton-Raphson ne converge pas.
+        """
+        dz_middle = None
+        exact_solver = utils.FIXED_POINT_SOLVERS.get(self.skin_friction_law)
+        if exact_solver is not None:
+            dz_middle = exact_solver(self.dz_bott + self.ksi_a, self.ksi_b, self.qs_lim, self.module_kt)
+        if dz_middle is None:
+            solver = NewtonRaphson11(self.fonction_F, [0.], [dz_bott])
+            if not solver.convergence:
+                raise ValueError(f"Pas de convergence de l'équilibre du tronçon z_top = {self.z_top} après {solver.number_of_iterations} itérations")
+            dz_middle = solver.final_roots
         self.set_dz_middle(dz_middle)
 
         return self.Q_top, self.dz_top
 
     def horizontal_soil_pressure_spring(self, dy: float, B: float, situation: str='court terme') -> float:
         """
-        Loi de mobilisation de la pression latérale sur le sol.
+        Loi de mobilisation de la pression latérale sur le sol (LOIS_PRESSION_LATERALE), symétrique en dy.
         La loi renvoyée tient compte de la hauteur de l'élément de pieu.
         """
-        situations = ['court terme', 'long terme', 'elu', 'sismique']
-        if situation.lower() == situations[0]:
-            q1 = self.delta_h * B * self.soil.pf
-            k1 = self.delta_h * self.soil.module_kf(B)
-        elif situation.lower() == situations[1]:
-            q1 = self.delta_h * B * self.soil.pf
-            k1 = self.delta_h * self.soil.module_kf(B) / 2
-        elif situation.lower() == situations[2]:
-            q1 = self.delta_h * B * self.soil.pf
-            k1 = self.soil.module_kf(B)
-            q2 = self.delta_h * B * self.soil.pl
-            k2 = self.delta_h * self.soil.module_kf(B) / 2
-        elif situation.lower() == situations[3]:
-            q1 = self.delta_h * B * self.soil.pl
-            k1 = self.delta_h * self.soil.module_kf(B) * 3
-        else:
-            return print("Erreur dans la définition de la situation : ['court terme', 'long terme', 'ELU', 'sismique']")
-
-        if q2 == None or k2 == None:
-            return utils.tri_linear_law(dy, q1, k1)
-        else:
-            return utils.tri_linear_law(dy, q1, k1, q2, k2)
+        loi = LOIS_PRESSION_LATERALE.get(situation.lower())
+        if loi is None:
+            raise ValueError("Erreur dans la définition de la situation : ['court terme', 'long terme', 'ELU', 'sismique']")
+        pression_1, coeff_1, pression_2, coeff_2 = loi
+        q1 = self.delta_h * B * getattr(self.soil, pression_1)
+        k1 = self.delta_h * self.soil.module_kf(B) * coeff_1
+        if pression_2 is None:
+            return math.copysign(utils.tri_linear_law(abs(dy), q1, k1), dy)
+        q2 = self.delta_h * B * getattr(self.soil, pression_2)
+        k2 = self.delta_h * self.soil.module_kf(B) * coeff_2
+        return math.copysign(utils.tri_linear_law(abs(dy), q1, k1, q2, k2), dy)
 
     def linear_spring(self, B: float, situation: str='court terme') -> float:
         """
         Returns the stifness of the soil spring assuming a linear spring.
         """
-        situations = ['court terme', 'long terme', 'elu', 'sismique']
-        if situation.lower() == situations[0]:
-            return self.delta_h * self.soil.module_kf(B)
-        elif situation.lower() == situations[1]:
-            return self.delta_h * self.soil.module_kf(B) / 2
-        elif situation.lower() == situations[2]:
-            return self.delta_h * self.soil.module_kf(B)
-        elif situation.lower() == situations[3]:
-            return self.delta_h * self.soil.module_kf(B) * 3
-        else:
-            return print("Erreur dans la définition de la situation : ['court terme', 'long terme', 'ELU', 'sismique']")
+        coeff_kf = COEFF_KF.get(situation.lower())
+        if coeff_kf is None:
+            raise ValueError("Erreur dans la définition de la situation : ['court terme', 'long terme', 'ELU', 'sismique']")
+        return self.delta_h * self.soil.module_kf(B) * coeff_kf
+
+
+@dataclass
+class PileMesh:
+    """
+    Maillage du pieu stocké sous forme de tableaux NumPy (une valeur par tranche, de la tête vers la pointe) :
+        - z_top:        Niveau supérieur de chaque tranche
+        - delta_h:      Hauteur de chaque tranche
+        - soil_index:   Indice de la couche de sol de chaque tranche dans la lithologie
+        - qs_lim:       Frottement axial unitaire admissible
+        - kt:           Module kt (mobilisation du frottement axial)
+        - kq:           Module kq (mobilisation de l'effort de pointe)
+    Les tableaux Q_bott, dz_bott et dz_middle conservent l'état du dernier équilibre calculé.
+    """
+    z_top: np.ndarray
+    delta_h: np.ndarray
+    soil_index: np.ndarray
+    qs_lim: np.ndarray
+    kt: np.ndarray
+    kq: np.ndarray
+
+    def __post_init__(self):
+        self.Q_bott = np.zeros(self.n_slices)
+        self.dz_bott = np.zeros(self.n_slices)
+        self.dz_middle = np.zeros(self.n_slices)
+
+    @classmethod
+    def from_lithology(
+            cls,
+            lithology: list[Soil],
+            level_top: float,
+            level_bott: float,
+            thickness: float,
+            categorie: int,
+            Ds: float,
+    ) -> 'PileMesh':
+        """
+        Discrétisation du pieu entre level_top et level_bott, couche par couche, en tranches d'épaisseur au plus égale à thickness.
+        Les propriétés de chaque couche sont évaluées une seule fois puis réparties sur ses tranches.
+        """
+        z_acc = []
+        dh_acc = []
+        idx_acc = []
+        for idx, soil in enumerate(lithology):
+            level_max = min(level_top, soil.level_sup)
+            level_min = max(level_bott, soil.level_inf)
+            if (level_max - level_min) <= 0.:
+                continue
+            n_slices = math.ceil((level_max - level_min) / thickness)
+            delta_h = (level_max - level_min) / n_slices
+            z_acc.append(level_max - delta_h * np.arange(n_slices))
+            dh_acc.append(np.full(n_slices, delta_h))
+            idx_acc.append(np.full(n_slices, idx))
+
+        if not z_acc:
+            z_acc, dh_acc, idx_acc = [np.zeros(0)], [np.zeros(0)], [np.zeros(0, dtype=int)]
+        return cls.from_slices(lithology, np.concatenate(z_acc), np.concatenate(dh_acc), np.concatenate(idx_acc), categorie, Ds)
+
+    @classmethod
+    def from_slices(
+            cls,
+            lithology: list[Soil],
+            z_top: np.ndarray,
+            delta_h: np.ndarray,
+            soil_index: np.ndarray,
+            categorie: int,
+            Ds: float,
+    ) -> 'PileMesh':
+        """
+        Maillage défini par le niveau supérieur, la hauteur et l'indice de la couche de sol de chaque tranche (de la tête vers la pointe).
+        """
+        soil_index = np.asarray(soil_index, dtype=int)
+        qs_lim = np.array([soil.frottement_limite(categorie) for soil in lithology] or [0.], dtype=float)
+        kt = np.array([soil.module_kt(Ds) for soil in lithology] or [0.], dtype=float)
+        kq = np.array([soil.module_kq(Ds) for soil in lithology] or [0.], dtype=float)
+
+        return cls(
+            z_top=np.asarray(z_top, dtype=float),
+            delta_h=np.asarray(delta_h, dtype=float),
+            soil_index=soil_index,
+            qs_lim=qs_lim[soil_index],
+            kt=kt[soil_index],
+            kq=kq[soil_index],
+        )
+
+    @property
+    def n_slices(self) -> int:
+        return len(self.z_top)
+
+    @property
+    def z_middle(self) -> np.ndarray:
+        return self.z_top - self.delta_h / 2
+
+    @property
+    def z_bottom(self) -> np.ndarray:
+        return self.z_top - self.delta_h
+
+    def linear_springs(self, lithology: list[Soil], B: float, situation: str='court terme') -> np.ndarray:
+        """
+        Raideurs des ressorts linéaires horizontaux de chaque tranche (voir SlicePile.linear_spring).
+        """
+        coeff_kf = COEFF_KF.get(situation.lower())
+        if coeff_kf is None:
+            raise ValueError("Erreur dans la définition de la situation : ['court terme', 'long terme', 'ELU', 'sismique']")
+        kf = np.array([soil.module_kf(B) for soil in lithology])
+        return self.delta_h * kf[self.soil_index] * coeff_kf
+
+    def lateral_laws(self, lithology: list[Soil], B: float, situation: str='court terme') -> tuple[np.ndarray, ...]:
+        """
+        Paramètres (q1, k1, q2, k2) de la loi de mobilisation de la pression latérale de chaque tranche
+        (voir SlicePile.horizontal_soil_pressure_spring) ; pour une loi bi-linéaire, q2 = q1.
+        """
+        loi = LOIS_PRESSION_LATERALE.get(situation.lower())
+        if loi is None:
+            raise ValueError("Erreur dans la définition de la situation : ['court terme', 'long terme', 'ELU', 'sismique']")
+        pression_1, coeff_1, pression_2, coeff_2 = loi
+        kf = np.array([soil.module_kf(B) for soil in lithology])[self.soil_index]
+        q1 = self.delta_h * B * np.array([getattr(soil, pression_1) for soil in lithology], dtype=float)[self.soil_index]
+        k1 = self.delta_h * kf * coeff_1
+        if pression_2 is None:
+            return q1, k1, q1, k1
+        q2 = self.delta_h * B * np.array([getattr(soil, pression_2) for soil in lithology], dtype=float)[self.soil_index]
+        return q1, k1, q2, self.delta_h * kf * coeff_2
+
+    def equilibre(
+            self,
+            Q_pointe: float,
+            dz_pointe: float,
+            Dp: float,
+            Ds: float,
+            Eb: float,
+            law=utils.skin_friction_law,
+            slice_solver: str='auto',
+            dQ_pointe: float=0.,
+            warm_start: bool=False,
+    ) -> tuple[float, float, float]:
+        """
+        Propage l'équilibre de la pointe vers la tête du pieu, tranche par tranche (annexe L de la NF P94-262).
+        Renvoie l'effort et le déplacement en tête, ainsi que la dérivée dQ_top / ddz_pointe propagée au cours
+        du même parcours (dQ_pointe étant la dérivée de l'effort de pointe) ; l'état de chaque tranche est conservé dans le maillage.
+        L'équilibre de chaque tranche est résolu :
+            - 'auto':   exactement si la loi de mobilisation est linéaire par morceaux (utils.FIXED_POINT_SOLVERS), par Newton-Raphson sinon;
+            - 'newton': par Newton-Raphson quelle que soit la loi.
+        Newton-Raphson est également utilisé pour les tranches dont la solution exacte n'est pas unique (utils.fixed_point_monotone) ;
+        ValueError s'il ne converge pas.
+        Avec warm_start, la résolution par Newton-Raphson de chaque tranche part du déplacement à mi-hauteur
+        du dernier équilibre calculé (continuation entre pas de chargement) plutôt que de dz_bott.
+        """
+        exact_solver = utils.FIXED_POINT_SOLVERS.get(law) if slice_solver == 'auto' else None
+        stats.count('parcours_pieu')
+        stats.count('equilibres_tranches', self.n_slices)
+
+        c_ksi_a = 2 / (math.pi * Dp**2 * Eb)
+        c_ksi_b = Ds / (2 * Dp**2 * Eb)
+        c_Q = math.pi * Ds / 2
+        c_dz = 4 / (math.pi * Dp**2 * Eb)
+
+        Q_bott = self.Q_bott
+        dz_bott = self.dz_bott
+        dz_middle = self.dz_middle
+        delta_h = self.delta_h.tolist()
+        qs_lim = self.qs_lim.tolist()
+        kt = self.kt.tolist()
+
+        q1 = Q_pointe
+        dz1 = dz_pointe
+        dq1 = dQ_pointe
+        ddz1 = 1.
+        for i in range(self.n_slices - 1, -1, -1):
+            dh = delta_h[i]
+            qs = qs_lim[i]
+            k = kt[i]
+            ksi_a = c_ksi_a * q1 * dh
+            ksi_b = c_ksi_b * dh**2
+
+            z = None
+            if exact_solver is not None:
+                z = exact_solver(dz1 + ksi_a, ksi_b, qs, k)
+            if z is None:
+                def fonction_F(z, dz1=dz1, ksi_a=ksi_a, ksi_b=ksi_b, qs=qs, k=k):
+                    return dz1 + ksi_a + ksi_b * law(z, qs, k) - z
+
+                z_0 = dz_middle[i] if warm_start else dz1
+                solver = NewtonRaphson11(fonction_F, [0.], [z_0])
+                if not solver.convergence:
+                    raise ValueError(
+                        f"Pas de convergence de l'équilibre de la tranche {i} (z_top = {self.z_top[i]}) "
+                        f"après {solver.number_of_iterations} itérations"
+                    )
+                z = solver.final_roots
+            Q_bott[i] = q1
+            dz_bott[i] = dz1
+            dz_middle[i] = z
+            Q_middle = q1 + c_Q * dh * law(z, qs, k)
+
+            # Dérivées par rapport au déplacement de la pointe
+            slope = utils.law_slope(law, z, qs, k)
+            dz = (ddz1 + c_ksi_a * dh * dq1) / (1 - ksi_b * slope)
+            dQ_middle = dq1 + c_Q * dh * slope * dz
+
+            q1 = 2 * Q_middle - q1
+            dz1 = dz1 + c_dz * Q_middle * dh
+            dq1 = 2 * dQ_middle - dq1
+            ddz1 = ddz1 + c_dz * dQ_middle * dh
+        return q1, dz1, dq1
+
+    def equilibre_batch(
+            self,
+            Q_pointe: np.ndarray,
+            dz_pointe: np.ndarray,
+            Dp: float,
+            Ds: float,
+            Eb: float,
+            law=utils.skin_friction_law,
+            slice_solver: str='auto',
+            dQ_pointe: np.ndarray|float=0.,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Version vectorisée de equilibre pour un lot de déplacements de la pointe : chaque tranche est résolue
+        simultanément pour tous les éléments du lot (solution exacte vectorisée ou BatchNewton).
+        Renvoie les tableaux (Q_top, dz_top, dQ_top/ddz_pointe) ; l'état des tranches n'est pas conservé.
+        Les éléments dont l'équilibre d'une tranche ne converge pas valent NaN.
+        """
+        exact_solver = utils.FIXED_POINT_SOLVERS_ARRAY.get(law) if slice_solver == 'auto' else None
+        law_vect = utils.law_array(law)
+        stats.count('parcours_pieu')
+        stats.count('equilibres_tranches', self.n_slices * np.size(Q_pointe))
+        c_ksi_a = 2 / (math.pi * Dp**2 * Eb)
+        c_ksi_b = Ds / (2 * Dp**2 * Eb)
+        c_Q = math.pi * Ds / 2
+        c_dz = 4 / (math.pi * Dp**2 * Eb)
+
+        q1 = np.asarray(Q_pointe, dtype=float)
+        dz1 = np.array(dz_pointe, dtype=float)
+        dq1 = np.broadcast_to(np.asarray(dQ_pointe, dtype=float), q1.shape)
+        ddz1 = np.ones(q1.shape)
+        zeros = np.zeros(q1.shape)
+        for dh, qs, k in zip(self.delta_h[::-1].tolist(), self.qs_lim[::-1].tolist(), self.kt[::-1].tolist()):
+            c = dz1 + c_ksi_a * q1 * dh
+            ksi_b = c_ksi_b * dh**2
+            z = None
+            if exact_solver is not None:
+                z = exact_solver(c, ksi_b, qs, k)
+            if z is None:
+                z = BatchNewton(
+                    lambda z: c + ksi_b * law_vect(z, qs, k) - z,
+                    zeros,
+                    c,
+                    derivative=lambda z: ksi_b * utils.law_slope_array(law, z, qs, k) - 1,
+                ).final_roots
+            Q_middle = q1 + c_Q * dh * law_vect(z, qs, k)
+
+            slope = utils.law_slope_array(law, z, qs, k)
+            dz = (ddz1 + c_ksi_a * dh * dq1) / (1 - ksi_b * slope)
+            dQ_middle = dq1 + c_Q * dh * slope * dz
+
+            q1 = 2 * Q_middle - q1
+            dz1 = dz1 + c_dz * Q_middle * dh
+            dq1 = 2 * dQ_middle - dq1
+            ddz1 = ddz1 + c_dz * dQ_middle * dh
+        return q1, dz1, dq1
+
+    def slices(self, lithology: list[Soil], data_pieu: dict) -> list[SlicePile]:
+        """
+        Vues SlicePile sur les tranches du maillage (compatibilité avec l'interface par objets).
+        """
+        return [
+            SlicePile(z_top=z_top, delta_h=delta_h, soil=lithology[idx], data_pieu=data_pieu)
+            for z_top, delta_h, idx in zip(self.z_top.tolist(), self.delta_h.tolist(), self.soil_index.tolist())
+        ]
+
+    def update_slices(self, slices: list[SlicePile]) -> list[SlicePile]:
+        """
+        Reporte l'état du dernier équilibre calculé sur les vues SlicePile.
+        """
+        for slice, Q_bott, dz_bott, dz_middle in zip(slices, self.Q_bott.tolist(), self.dz_bott.tolist(), self.dz_middle.tolist()):
+            slice.set_Q_bott(Q_bott)
+            slice.set_dz_bott(dz_bott)
+            slice.set_dz_middle(dz_middle)
+        return slices
+
+
+# Capacités vérifiées pour chaque combinaison de charges : (compression, traction)
+CAPACITES_COMB = {
+    'ELS_QP': ('portance_ELS_QP', 'traction_ELS_QP'),
+    'ELS_CAR': ('portance_ELS_Car', 'traction_ELS_Car'),
+    'ELU': ('portance_ELU_Str', 'traction_ELU_Str'),
+    'ELA': ('portance_ELU_Acc', 'traction_ELU_Acc'),
+}
+
+
+class CapacitesPortance:
+    """
+    Capacités portantes en compression et en traction (ELS et ELU) d'une fondation profonde, suivant l'annexe F de la NF P94-262,
+    à partir des résistances de pointe (resistance_pointe) et de frottement (resistance_skin_friction)
+    et des coefficients de modèle gamma_rd1_comp, gamma_rd1_trac et gamma_rd2.
+    Les résistances peuvent être des scalaires ou des tableaux (profil de capacités).
+    """
+
+    @property
+    def Rsk_comp(self) -> float:
+        """
+        Rs;k, valeur caractéristique de résistance de frottement axial de la fondation profonde, suivant l'article F.5 de la NF P94-262.
+        """
+        return self.resistance_skin_friction / (self.gamma_rd1_comp * self.gamma_rd2)
+
+    @property
+    def Rsk_trac(self) -> float:
+        """
+        Rs;k, valeur caractéristique de résistance de frottement axial de la fondation profonde, suivant l'article F.5 de la NF P94-262.
+        """
+        return - self.resistance_skin_friction / (self.gamma_rd1_trac * self.gamma_rd2)
+
+    @property
+    def Rbk(self) -> float:
+        """
+        Rb;k, valeur caractéristique de résistance de pointe de la fondation profonde, suivant l'article F.4 de la NF P94-262.
+        """
+        return self.resistance_pointe / (self.gamma_rd1_comp * self.gamma_rd2)
+
+    @property
+    def portance_fluage_car(self, coeff_Rb: float=0.5, coeff_Rs: float=0.7) -> float:
+        """
+        Returns the partial coefficient gamma_rd1_comp.
+        """
+        return coeff_Rb * self.Rbk + coeff_Rs * self.Rsk_comp
+
+    @property
+    def portance_ELS_QP(self, gamma_cr: float=1.1) -> float:
+        return self.portance_fluage_car / gamma_cr
+
+    @property
+    def portance_ELS_Car(self, gamma_cr: float=0.9) -> float:
+        return self.portance_fluage_car / gamma_cr
+    
+    @property
+    def portance_ELU_Str(self, gamma_b: float=1.1, gamma_s: float=1.1) -> float:
+        return self.Rbk / gamma_b + self.Rsk_comp / gamma_s
+
+    @property
+    def portance_ELU_Acc(self, gamma_b: float=1.0, gamma_s: float=1.0) -> float:
+        return self.Rbk / gamma_b + self.Rsk_comp / gamma_s
+
+    @property
+    def traction_fluage_car(self, coeff_Rs: float=0.7) -> float:
+        return coeff_Rs * self.Rsk_trac
+
+    @property
+    def traction_ELS_QP(self, gamma_cr: float=1.5) -> float:
+        return self.traction_fluage_car / gamma_cr
+
+    @property
+    def traction_ELS_Car(self, gamma_cr: float=1.1) -> float:
+        return self.traction_fluage_car / gamma_cr
+    
+    @property
+    def traction_ELU_Str(self, gamma_s: float=1.15) -> float:
+        return self.Rsk_trac / gamma_s
+
+    @property
+    def traction_ELU_Acc(self, gamma_s: float=1.05) -> float:
+        return self.Rsk_trac / gamma_s
+
+    def verification_charges(self, charges: list[tuple[str, float]]) -> bool|np.ndarray:
+        """
+        Vérifie les efforts axiaux [(combinaison, nz)] vis-à-vis des capacités de CAPACITES_COMB :
+        nz <= capacité en compression pour nz >= 0, nz >= capacité de traction (négative) pour nz < 0.
+        """
+        verification = True
+        for comb, nz in charges:
+            compression, traction = CAPACITES_COMB[comb.upper()]
+            if nz >= 0:
+                verification = verification & (nz <= getattr(self, compression))
+            else:
+                verification = verification & (nz >= getattr(self, traction))
+        return verification
+
+
+@dataclass
+class CapacityProfile(CapacitesPortance):
+    """
+    Profil des résistances et capacités portantes d'un pieu en fonction du niveau de la pointe (Pile.capacity_profile).
+    Chaque grandeur est un tableau de même dimension que levels :
+        - levels:                           Niveaux de pointe
+        - resistance_pointe:                Rb(L)
+        - resistance_skin_friction:         Rs(L)
+        - ple_etoile:                       ple*(L)
+        - kp_util:                          kp retenu
+        - hauteur_encastrement_effective:   Def(L)
+    Les capacités (portance_ELS_QP, traction_ELU_Str...) sont obtenues par les propriétés de CapacitesPortance.
+    """
+    levels: np.ndarray
+    resistance_pointe: np.ndarray
+    resistance_skin_friction: np.ndarray
+    ple_etoile: np.ndarray
+    kp_util: np.ndarray
+    hauteur_encastrement_effective: np.ndarray
+    gamma_rd1_comp: float
+    gamma_rd1_trac: float
+    gamma_rd2: float
+
+    @property
+    def resistance_totale(self) -> np.ndarray:
+        """
+        Rs + Rb pour chaque niveau de pointe.
+        """
+        return self.resistance_pointe + self.resistance_skin_friction
+
+
+def pile_cached_property(method):
+    """
+    Propriété de Pile mémorisée : la valeur est conservée tant que l'état du pieu (Pile.state_key) n'a pas changé.
+    Le calcul de la valeur est mesuré par l'instrumentation (stats) comme étape de maillage ou de calcul des capacités.
+    """
+    name = method.__name__
+    stage = 'maillage' if name in ['mesh', 'slices'] else 'capacites'
+
+    @functools.wraps(method)
+    def wrapper(self):
+        cache = self.valid_cache()
+        if name not in cache:
+            with stats.stage(stage):
+                cache[name] = method(self)
+        return cache[name]
+
+    return property(wrapper)
 
 
 @dataclass
-class Pile:
+class Pile(CapacitesPortance):
     """
     Classe de pieu (fondation profonde). Le pieu est défini par les paramètres suivants:
         - category:     Catégorie du pieu au sens du tableau A1 de la NF P94-262 - Annexe A
@@ -308,7 +761,12 @@ class Pile:
         - Dp:           Diamètre équivalent du pieu pour l'effort de pointe (surface)
         - Ds:           Diamètre équivalent du pieu pour le frottement (périmètre)
         - lithology:    Couches de sol sur la hauteur du pieu   list[Soil]
-        - thickness:    Epaisseur des mailles pour la discretisation du pieu        
+        - thickness:    Epaisseur des mailles pour la discretisation du pieu (épaisseur maximale en maillage adaptatif)
+        - skin_friction_law:    Loi de mobilisation du frottement axial tau(s, qs, kt)
+        - slice_solver:         Résolution de l'équilibre des tranches : 'auto' (exacte si la loi est linéaire par morceaux) ou 'newton'
+        - mesh_tolerance:       Tolérance relative du maillage adaptatif (maillage_adaptatif) ; maillage uniforme si None
+    Le maillage et les grandeurs dérivées (résistances, ple*, kp...) sont mémorisés ; ils sont recalculés automatiquement
+    lorsqu'un paramètre du pieu ou une couche de la lithologie est modifié.
     """
     category: int
     level_top: float
@@ -318,9 +776,59 @@ class Pile:
     Ds: float
     lithology: list[Soil]
     thickness: float=0.20
+    skin_friction_law: Callable[[float, float, float], float]=utils.skin_friction_law
+    slice_solver: str='auto'
+    mesh_tolerance: float|None=None
 
     def __post_init__(self):
-        self.slices = self.maillage_pieu()
+        self._cache = {}
+        self._cache_key = None
+        self.message_equilibre = None
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in self.__dataclass_fields__:
+            super().__setattr__('_state_version', utils.next_state_version())
+
+    @property
+    def state_key(self) -> tuple:
+        """
+        Etat du pieu dont dépendent les grandeurs mémorisées : numéro d'état du pieu et de chaque couche de sol,
+        renouvelé à chaque affectation d'un de leurs paramètres (utils.next_state_version).
+        La modification en place d'un paramètre mutable (liste lithology exceptée) n'est pas détectée : utiliser clear_cache.
+        """
+        return (self._state_version, *[soil._state_version for soil in self.lithology])
+
+    def valid_cache(self) -> dict:
+        """
+        Renvoie le dictionnaire des grandeurs mémorisées, vidé si l'état du pieu a changé depuis le dernier accès.
+        """
+        key = self.state_key
+        if key != self._cache_key:
+            self._cache = {}
+            self._cache_key = key
+        return self._cache
+
+    def clear_cache(self):
+        """
+        Force le recalcul du maillage et des grandeurs mémorisées.
+        """
+        self._cache = {}
+        self._cache_key = None
+
+    @pile_cached_property
+    def mesh(self) -> PileMesh:
+        """
+        Maillage du pieu (PileMesh), reconstruit lorsque la géométrie ou la lithologie change.
+        """
+        return self.maillage_pieu()
+
+    @pile_cached_property
+    def slices(self) -> list[SlicePile]:
+        """
+        Tranches du pieu sous forme d'objets SlicePile, construites à la demande à partir du maillage.
+        """
+        return self.mesh.slices(self.lithology, self.data_pile)
 
     @property
     def data_pile(self):
@@ -332,6 +840,7 @@ class Pile:
         data_acc.update({'Eb': self.Eb})
         data_acc.update({'Dp': self.Dp})
         data_acc.update({'Ds': self.Ds})
+        data_acc.update({'skin_friction_law': self.skin_friction_law})
         return data_acc
 
     @property
@@ -397,95 +906,28 @@ class Pile:
         """
         return TAB_F21[str(self.category)]['gamma_rd2']
 
-    @property
-    def portance_fluage_car(self, coeff_Rb: float=0.5, coeff_Rs: float=0.7) -> float:
-        """
-        Returns the partial coefficient gamma_rd1_comp.
-        """
-        return coeff_Rb * self.Rbk + coeff_Rs * self.Rsk_comp
-
-    @property
-    def portance_ELS_QP(self, gamma_cr: float=1.1) -> float:
-        return self.portance_fluage_car / gamma_cr
-
-    @property
-    def portance_ELS_Car(self, gamma_cr: float=0.9) -> float:
-        return self.portance_fluage_car / gamma_cr
-    
-    @property
-    def portance_ELU_Str(self, gamma_b: float=1.1, gamma_s: float=1.1) -> float:
-        return self.Rbk / gamma_b + self.Rsk_comp / gamma_s
-
-    @property
-    def portance_ELU_Acc(self, gamma_b: float=1.0, gamma_s: float=1.0) -> float:
-        return self.Rbk / gamma_b + self.Rsk_comp / gamma_s
-
-    @property
-    def traction_fluage_car(self, coeff_Rs: float=0.7) -> float:
-        return coeff_Rs * self.Rsk_trac
-
-    @property
-    def traction_ELS_QP(self, gamma_cr: float=1.5) -> float:
-        return self.traction_fluage_car / gamma_cr
-
-    @property
-    def traction_ELS_Car(self, gamma_cr: float=1.1) -> float:
-        return self.traction_fluage_car / gamma_cr
-    
-    @property
-    def traction_ELU_Str(self, gamma_s: float=1.15) -> float:
-        return self.Rsk_trac / gamma_s
-
-    @property
-    def traction_ELU_Acc(self, gamma_s: float=1.05) -> float:
-        return self.Rsk_trac / gamma_s
-
-    @property
+    @pile_cached_property
     def resistance_totale(self) -> float:
         """
         Rs + Rb, valeur de résistance totale de la fondation profonde, suivant l'article F.5 de la NF P94-262.
         """
         return self.resistance_pointe + self.resistance_skin_friction
 
-    @property
+    @pile_cached_property
     def resistance_skin_friction(self) -> float:
         """
         Rs, valeur de résistance de frottement axial de la fondation profonde, suivant l'article F.5 de la NF P94-262.
         """
-        Rs_acc = 0
-        for slice in self.slices:
-            Rs_acc += slice.perimetre * slice.qs_lim * slice.delta_h
-        return Rs_acc
-
-    @property
-    def Rsk_comp(self) -> float:
-        """
-        Rs;k, valeur caractéristique de résistance de frottement axial de la fondation profonde, suivant l'article F.5 de la NF P94-262.
-        """
-        return self.resistance_skin_friction / (self.gamma_rd1_comp * self.gamma_rd2)
-
-    @property
-    def Rsk_trac(self) -> float:
-        """
-        Rs;k, valeur caractéristique de résistance de frottement axial de la fondation profonde, suivant l'article F.5 de la NF P94-262.
-        """
-        return - self.resistance_skin_friction / (self.gamma_rd1_trac * self.gamma_rd2)
+        return self.perimetre * float(np.sum(self.mesh.qs_lim * self.mesh.delta_h))
 
-    @property
+    @pile_cached_property
     def resistance_pointe(self) -> float:
         """
         Rb, valeur de résistance de pointe de la fondation profonde, suivant l'article F.4 de la NF P94-262.
         """
         return self.section_pointe * self.kp_util * self.ple_etoile
 
-    @property
-    def Rbk(self) -> float:
-        """
-        Rb;k, valeur caractéristique de résistance de pointe de la fondation profonde, suivant l'article F.4 de la NF P94-262.
-        """
-        return self.resistance_pointe / (self.gamma_rd1_comp * self.gamma_rd2)
-
-    @property
+    @pile_cached_property
     def kp_util(self) -> float:
         """
         kp_util, facteur de portance pressiométrique retenu, fonction de la hauteur d'encastrement effective.
@@ -495,25 +937,68 @@ class Pile:
         else:
             return (1 + (self.kp_max - 1) * self.hauteur_encastrement_effective / (5 * self.Ds))
 
-    @property
+    @pile_cached_property
     def kp_max(self) -> float:
         """
         kp_max, facteur de portance pressiométrique du pieu, suivant l'article F.4.2 de la NF P94-262.
         """
         return self.get_soil_from_level(self.level_bott).kp_max(self.pile_classe)
 
-    @property
+    @pile_cached_property
     def ple_etoile(self) -> float:
         """
         Calcul de la pression limite nette équivalente ple* - article F.4.2 (3) de la NF P94-262.
         """
-        niveau_haut = self.level_bott + self.b_length
-        niveau_bas = self.level_bott - 3 * self.a_longueur
-        if niveau_bas < self.courbe_pl[0][-1]:
-            return 0.
-        return utils.mean_value(self.courbe_pl[0], self.courbe_pl[1],niveau_haut, niveau_bas)
-
-    @property
+        return float(self.ple_etoile_profil(self.level_bott))
+
+    def ple_etoile_profil(self, levels_bott: float|np.ndarray) -> np.ndarray:
+        """
+        Pression limite nette équivalente ple* pour un niveau ou un tableau de niveaux de pointe (même niveau de tête), en un seul appel.
+        ple* est nulle si le sol n'est pas défini jusqu'à 3a sous la pointe.
+        """
+        levels_bott = np.asarray(levels_bott, dtype=float)
+        niveau_haut = levels_bott + np.minimum(self.a_longueur, self.level_top - levels_bott)
+        niveau_bas = levels_bott - 3 * self.a_longueur
+        liste_z, liste_pl = self.courbe_pl
+        ple = utils.mean_value(liste_z, liste_pl, niveau_haut, niveau_bas)
+        return np.where(niveau_bas < liste_z[-1], 0., ple)
+
+    @stats.timed('capacites')
+    def capacity_profile(self, levels: np.ndarray) -> CapacityProfile:
+        """
+        Résistances et capacités portantes du pieu (même tête, même catégorie) pour un tableau de niveaux de pointe, en un seul calcul :
+            - Rs(L) par intégration du frottement limite de chaque couche entre la tête et la pointe;
+            - Rb(L) à partir de ple*(L), Def(L) et kp_util(L) évalués pour tous les niveaux (Rb nul si ple* est nul).
+        """
+        levels = np.atleast_1d(np.asarray(levels, dtype=float))
+        levels_sup = np.array([soil.level_sup for soil in self.lithology], dtype=float)
+        levels_inf = np.array([soil.level_inf for soil in self.lithology], dtype=float)
+        qs_lim = np.array([soil.frottement_limite(self.category) for soil in self.lithology], dtype=float)
+        epaisseurs = np.minimum(levels_sup, self.level_top) - np.maximum(levels_inf, levels[:, np.newaxis])
+        resistance_skin_friction = self.perimetre * np.where(epaisseurs > 0, qs_lim * epaisseurs, 0.).sum(axis=1)
+
+        ple_etoile = self.ple_etoile_profil(levels)
+        liste_z, liste_pl = self.courbe_pl
+        with np.errstate(divide='ignore', invalid='ignore'):
+            hauteur = utils.trapezoidal_integration(liste_z, liste_pl, levels + 10 * self.Ds, levels) / ple_etoile
+        kp_max = np.append([soil.kp_max(self.pile_classe) for soil in self.lithology], np.nan)
+        kp_max = kp_max[self.lithology_index.indices_at_levels(levels)]
+        kp_util = np.where(hauteur / self.Ds >= 5, kp_max, 1 + (kp_max - 1) * hauteur / (5 * self.Ds))
+        resistance_pointe = np.where(ple_etoile > 0, self.section_pointe * kp_util * ple_etoile, 0.)
+
+        return CapacityProfile(
+            levels,
+            resistance_pointe,
+            resistance_skin_friction,
+            ple_etoile,
+            kp_util,
+            hauteur,
+            self.gamma_rd1_comp,
+            self.gamma_rd1_trac,
+            self.gamma_rd2,
+        )
+
+    @pile_cached_property
     def hauteur_encastrement_effective(self) -> float:
         """
         Renvoie la hauteur d'encastrement effective suivant l'équation (F.4.2.6)
@@ -524,7 +1009,7 @@ class Pile:
         niveau_bas = self.level_bott
         return utils.trapezoidal_integration(liste_z, liste_pl, niveau_haut, niveau_bas) / self.ple_etoile
 
-    @property
+    @pile_cached_property
     def courbe_pl(self) -> list[list[float]]:
         """
         Retourne la courbe des pression limite sur la hauteur du sol sous la forme suivante :
@@ -555,28 +1040,37 @@ class Pile:
         """
         return min(self.a_longueur, self.height_pile)
 
+    @pile_cached_property
+    def lithology_index(self) -> LithologyIndex:
+        """
+        Index des couches de sol par niveau, reconstruit lorsque la lithologie change.
+        """
+        return LithologyIndex(self.lithology)
+
+    def stratigraphy_errors(self) -> list[str]:
+        """
+        Liste des défauts de la stratigraphie (couches inversées ou non classées, chevauchements, lacunes).
+        """
+        return self.lithology_index.errors()
+
     def check_stratigraphy(self) -> bool:
         """
         Vérifie que la stratigraphie du terrain associé au pieu est continue et croissante.
-        La vérification porte sur les niveaux 'level_sup' et 'level_inf' renseignés.
+        La vérification porte sur les niveaux 'level_sup' et 'level_inf' renseignés ; le détail est donné par stratigraphy_errors.
         """
-        test = 1
-        for idx, soil in enumerate(self.lithology):
-            if idx == 0:
-                level_inf_prec = soil.level_sup
-            else:
-                level_inf_prec = self.lithology[idx-1].level_inf
-            test *= level_inf_prec == soil.level_sup
-        return test == 1           
+        return not self.stratigraphy_errors()
 
     def get_soil_from_level(self, level: float) -> Soil:
         """
         Renvoie le sol dans la lithographie pour un niveau donné.
         """
-        for idx, soil in enumerate(self.lithology):
-            if soil.level_inf <= level <= soil.level_sup:
-                return soil
-        return None
+        return self.lithology_index.soil_at_level(level)
+
+    def soils_at_levels(self, levels: np.ndarray) -> list[Soil]:
+        """
+        Renvoie les sols dans la lithographie pour un tableau de niveaux (None pour les niveaux hors lithologie).
+        """
+        return self.lithology_index.soils_at_levels(levels)
 
     def get_pf_from_level(self, level: float) -> float:
         """
@@ -604,109 +1098,529 @@ class Pile:
         n_slices = math.ceil((level_max - level_min) / thickness)
         delta_h = (level_max - level_min) / n_slices
 
-        level_top = level_max
-        level_bott = level_top - delta_h
-        level_middle = (level_top + level_bott) / 2
+        levels_top = level_max - delta_h * np.arange(n_slices)
+        soils = self.soils_at_levels(levels_top - delta_h / 2)
+        data_pile = self.data_pile
 
         slices_acc = []
-        i = 0
-
-        while i < n_slices:
-            soil = self.get_soil_from_level(level_middle)
-            pf = self.get_pf_from_level(level_middle)
-            pl = self.get_pl_from_level(level_middle)
-            Em = self.get_Em_from_level(level_middle)
+        for level_top, soil in zip(levels_top.tolist(), soils):
             slice = SlicePile(
                 z_top = level_top,
                 delta_h = delta_h,
                 soil = soil,
-                data_pieu=self.data_pile
+                data_pieu=data_pile
             )
             slices_acc.append(slice)
-            level_top -= delta_h
-            level_bott -= delta_h
-            level_middle -= delta_h
-            i += 1
 
         return slices_acc
 
-    def maillage_pieu(self) -> list[SlicePile]:
+    @staticmethod
+    def charges_axiales(charges: dict[str, float]|list['Torseur']) -> list[tuple[str, float]]:
         """
-        Création des éléments "tranche" sur la hauteur du pieu, en fonction de la stratigraphie du sol.
+        Efforts axiaux à vérifier [(combinaison, nz)], à partir d'un dictionnaire {combinaison: nz} ou d'une liste de Torseur.
         """
-        slices_acc = []
-        for soil in self.lithology:
+        if isinstance(charges, dict):
+            charges = list(charges.items())
+        else:
+            charges = [(torseur.comb, torseur.nz) for torseur in charges]
+        for comb, nz in charges:
+            if comb.upper() not in CAPACITES_COMB:
+                raise ValueError(f"Combinaison inconnue : {comb}, doit être parmi {list(CAPACITES_COMB)}")
+        return charges
+
+    def verification_torseurs(self, torseurs: 'list[Torseur]|TableTorseurs') -> 'VerificationTorseurs':
+        """
+        Vérification de portance de toutes les combinaisons d'une liste de Torseur ou d'une TableTorseurs.
+        Les capacités de CAPACITES_COMB sont calculées une seule fois ; chaque torseur valide (check_situation et check_comb)
+        est associé à la capacité en compression (nz >= 0) ou en traction (nz < 0) de sa combinaison,
+        et les taux de travail nz / capacité sont évalués simultanément pour toutes les combinaisons.
+        """
+        table = torseurs if isinstance(torseurs, TableTorseurs) else TableTorseurs.from_torseurs(torseurs)
+        combs = list(CAPACITES_COMB)
+        capacites = np.array([[getattr(self, name) for name in CAPACITES_COMB[comb]] for comb in combs])
+
+        comb = np.char.upper(table.comb)
+        code = np.full(len(table), -1)
+        for idx, name in enumerate(combs):
+            code[comb == name] = idx
+        valide = table.validite() & (code >= 0)
+        capacite = np.where(valide, capacites[np.maximum(code, 0), np.where(table.nz >= 0, 0, 1)], np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            taux = np.where(table.nz == 0, 0., np.where(capacite == 0, np.inf, table.nz / capacite))
+        taux = np.where(valide, taux, np.nan)
+        return VerificationTorseurs(
+            comb=comb,
+            nz=table.nz,
+            capacite=capacite,
+            taux=taux,
+            valide=valide,
+            verification=valide & (taux <= 1),
+        )
+
+    def niveau_pointe_minimal(
+            self,
+            charges: dict[str, float]|list['Torseur'],
+            level_min: float|None=None,
+            pas: float=0.5,
+            tolerance: float=0.01,
+    ) -> float|None:
+        """
+        Niveau de pointe le plus haut (fiche minimale) pour lequel toutes les capacités sont vérifiées pour les charges données.
+        Les niveaux sont parcourus de la tête jusqu'à level_min (par défaut la base de la lithologie) avec le pas donné,
+        à l'aide d'un seul profil de capacités ; le premier intervalle encadrant le passage à un niveau vérifié
+        est ensuite affiné par dichotomie jusqu'à la tolérance. Renvoie None si aucun niveau ne convient.
+        """
+        charges = self.charges_axiales(charges)
+        if level_min is None:
+            level_min = min(soil.level_inf for soil in self.lithology)
+        levels = np.append(np.arange(self.level_top - pas, level_min, -pas), level_min)
+        verification = np.broadcast_to(self.capacity_profile(levels).verification_charges(charges), levels.shape)
+        if not verification.any():
+            return None
+        first = int(np.argmax(verification))
+        level_ok = levels[first]
+        level_ko = levels[first - 1] if first > 0 else self.level_top
+        while level_ko - level_ok > tolerance:
+            level = (level_ok + level_ko) / 2
+            if np.all(self.capacity_profile(level).verification_charges(charges)):
+                level_ok = level
+            else:
+                level_ko = level
+        return float(level_ok)
+
+    def dimensionnement(
+            self,
+            charges: dict[str, float]|list['Torseur'],
+            diametres: list[float]|None=None,
+            level_min: float|None=None,
+            pas: float=0.5,
+            tolerance: float=0.01,
+    ) -> 'Pile|None':
+        """
+        Pieu de fiche minimale vérifiant toutes les capacités pour les charges données ({combinaison: nz} ou liste de Torseur).
+        Si une liste de diamètres est fournie, ils sont essayés par ordre croissant (Dp = Ds = diamètre)
+        et le premier diamètre pour lequel une fiche convient est retenu.
+        Renvoie une copie du pieu avec le niveau de pointe (et le diamètre) retenus, ou None si aucune solution n'est trouvée.
+        """
+        if diametres is None:
+            candidats = [self]
+        else:
+            candidats = [replace(self, Dp=diametre, Ds=diametre) for diametre in sorted(diametres)]
+        for pieu in candidats:
+            level_bott = pieu.niveau_pointe_minimal(charges, level_min, pas, tolerance)
+            if level_bott is not None:
+                return replace(pieu, level_bott=level_bott)
+        return None
+
+    @stats.timed('maillage')
+    def maillage_pieu(self) -> PileMesh:
+        """
+        Création du maillage (tableaux par tranche) sur la hauteur du pieu, en fonction de la stratigraphie du sol :
+        tranches d'épaisseur thickness, ou maillage adaptatif si mesh_tolerance est renseignée.
+        """
+        if self.mesh_tolerance is not None:
+            return self.maillage_adaptatif(self.mesh_tolerance)
+        return PileMesh.from_lithology(
+            self.lithology,
+            self.level_top,
+            self.level_bott,
+            self.thickness,
+            self.category,
+            self.Ds,
+        )
+
+    def maillage_adaptatif(self, tolerance: float) -> PileMesh:
+        """
+        Maillage dont l'erreur de discrétisation relative est de l'ordre de tolerance, pour le transfert de charge axial
+        comme pour le calcul transversal, avec des tranches d'épaisseur comprise entre EPAISSEUR_MIN et thickness :
+            - transfert de charge axial : l'équilibre est propagé de la pointe vers la tête pour NB_ETATS_MAILLAGE déplacements
+              de la pointe, du domaine élastique au palier. La hauteur h de chaque tranche est ajustée en comparant l'équilibre
+              obtenu en une tranche et en deux demi-tranches : l'écart doit rester inférieur à tolerance x h / L fois l'effort
+              et le tassement en tête (estimés sur le maillage uniforme d'épaisseur thickness). Les tranches s'affinent ainsi
+              au voisinage de la pointe, des interfaces et des zones de fort gradient du frottement mobilisé, et s'élargissent ailleurs;
+            - calcul transversal : la hauteur des tranches est limitée à lambda x (2 tolerance)^(1/2) x exp(d / 2),
+              où lambda = (4 EI / kf)^(1/4) est la longueur de transfert de la couche (kf de la situation la plus raide)
+              et d la profondeur réduite (somme des hauteurs / lambda depuis la tête). L'erreur du modèle de poutre sur ressorts
+              est de l'ordre de 0,2 à 0,5 (h / lambda)², et la déformée décroît en exp(-d) avec la profondeur.
+        """
+        uniforme = PileMesh.from_lithology(self.lithology, self.level_top, self.level_bott, self.thickness, self.category, self.Ds)
+        layers = []
+        for idx, soil in enumerate(self.lithology):
             level_max = min(self.level_top, soil.level_sup)
             level_min = max(self.level_bott, soil.level_inf)
-            if (level_max - level_min) <= 0.:
-                continue
-            else:
-                slice = self.create_slices(self.thickness, level_max, level_min)
-                slices_acc = slices_acc + slice
-        return slices_acc
+            if level_max - level_min > 0.:
+                layers.append((idx, level_max, level_min))
+        if not layers:
+            return uniforme
+
+        qs_lim = np.array([soil.frottement_limite(self.category) for soil in self.lithology], dtype=float)
+        kt = np.array([soil.module_kt(self.Ds) for soil in self.lithology], dtype=float)
+        kq = np.array([soil.module_kq(self.Ds) for soil in self.lithology], dtype=float)
+
+        # Hauteur maximale des tranches pour le calcul transversal, fonction de la profondeur réduite
+        data = self.data_for_fe_model
+        coeff_kf = max(COEFF_KF.values())
+        kf = np.array([soil.module_kf(data['B']) * coeff_kf for soil in self.lithology], dtype=float)
+        with np.errstate(divide='ignore'):
+            lambdas = (4 * data['E'] * data['Iz'] / kf)**0.25
+        profondeurs = np.array([0.] + [self.level_top - level_min for idx, level_max, level_min in layers])
+        decroissance = np.concatenate(([0.], np.cumsum([(level_max - level_min) / lambdas[idx] for idx, level_max, level_min in layers])))
+
+        def hauteur_laterale(z: float, idx: int) -> float:
+            d = float(np.interp(self.level_top - z, profondeurs, decroissance))
+            return lambdas[idx] * math.sqrt(2 * tolerance) * math.exp(min(d / 2, 50.))
+
+        # Etats de référence : déplacements de la pointe et effort / tassement en tête sur le maillage uniforme
+        qb = self.kp_util * self.ple_etoile if self.ple_etoile > 0 else 0.
+        kq_pointe = kq[layers[-1][0]]
+        dz_lim = max([3 * qb / kq_pointe] + [3 * qs_lim[idx] / kt[idx] for idx, level_max, level_min in layers])
+        if not dz_lim > 0:
+            return uniforme
+        dz_pointe = dz_lim * np.geomspace(1e-3, 1., NB_ETATS_MAILLAGE)
+        Q_pointe = self.section_pointe * utils.end_bearing_law_array(dz_pointe, qb, kq_pointe)
+        Q_ref, dz_ref, _ = uniforme.equilibre_batch(Q_pointe, dz_pointe, self.Dp, self.Ds, self.Eb, self.skin_friction_law, self.slice_solver)
+        Q_ref = np.where(Q_ref > 0, Q_ref, np.inf)
+        dz_ref = np.where(dz_ref > 0, dz_ref, np.inf)
+        longueur = self.level_top - self.level_bott
+
+        def propagation(q1, dz1, z_bott, hauteurs, idx):
+            n = len(hauteurs)
+            tranches = PileMesh(
+                z_top=z_bott + np.cumsum(hauteurs[::-1])[::-1],
+                delta_h=np.array(hauteurs),
+                soil_index=np.full(n, idx),
+                qs_lim=np.full(n, qs_lim[idx]),
+                kt=np.full(n, kt[idx]),
+                kq=np.full(n, kq[idx]),
+            )
+            return tranches.equilibre_batch(q1, dz1, self.Dp, self.Ds, self.Eb, self.skin_friction_law, self.slice_solver)[:2]
 
+        # Propagation de la pointe vers la tête, avec contrôle de l'erreur de chaque tranche (une tranche / deux demi-tranches)
+        z_acc = []
+        dh_acc = []
+        idx_acc = []
+        q, dz = Q_pointe, dz_pointe
+        h = self.thickness
+        for idx, level_max, level_min in reversed(layers):
+            z = level_min
+            while z < level_max:
+                restant = level_max - z
+                h = min(h, self.thickness, hauteur_laterale(z + h, idx))
+                if h >= restant - EPAISSEUR_MIN:
+                    h = restant
+                q_1, dz_1 = propagation(q, dz, z, [h], idx)
+                q_2, dz_2 = propagation(q, dz, z, [h / 2, h / 2], idx)
+                ecarts = np.concatenate((np.abs(q_1 - q_2) / Q_ref, np.abs(dz_1 - dz_2) / dz_ref))
+                erreur = float(np.max(np.nan_to_num(ecarts), initial=0.)) * longueur / (tolerance * h)
+                if erreur <= 1. or h <= EPAISSEUR_MIN:
+                    z_acc.append(z + h)
+                    dh_acc.append(h)
+                    idx_acc.append(idx)
+                    q, dz = q_2, dz_2
+                    z = level_max if h == restant else z + h
+                    h *= 2. if erreur == 0. else min(2., 0.9 / math.sqrt(erreur))
+                else:
+                    h = max(EPAISSEUR_MIN, h * max(0.2, 0.9 / math.sqrt(erreur)))
+
+        return PileMesh.from_slices(self.lithology, z_acc[::-1], dh_acc[::-1], idx_acc[::-1], self.category, self.Ds)
+
+    def effort_pointe(self, dz_pointe: float|np.ndarray, mesh: PileMesh|None=None) -> float|np.ndarray:
+        """
+        Effort mobilisé en pointe pour un déplacement vertical donné de la pointe (ou un tableau de déplacements).
+        """
+        kq = (self.mesh if mesh is None else mesh).kq[-1]
+        law = utils.end_bearing_law_array if isinstance(dz_pointe, np.ndarray) else utils.end_bearing_law
+        return self.section_pointe * law(dz_pointe, self.kp_util * self.ple_etoile, kq)
+
+    def raideur_pointe(self, dz_pointe: float|np.ndarray, mesh: PileMesh|None=None) -> float|np.ndarray:
+        """
+        Pente de la loi de mobilisation de l'effort en pointe, pour un déplacement vertical donné de la pointe (ou un tableau de déplacements).
+        """
+        kq = (self.mesh if mesh is None else mesh).kq[-1]
+        slope = utils.end_bearing_slope_array if isinstance(dz_pointe, np.ndarray) else utils.end_bearing_slope
+        return self.section_pointe * slope(dz_pointe, self.kp_util * self.ple_etoile, kq)
+
+    def _equilibre_maillage(self, dz_pointe: float, warm_start: bool=False, mesh: PileMesh|None=None) -> tuple[float, float, float]:
+        """
+        Equilibre du maillage pour un déplacement vertical donné de la pointe : renvoie (Q_top, dz_top, dQ_top/ddz_pointe).
+        Le maillage déjà lu par l'appelant peut être fourni (mesh) : le cache n'est alors pas consulté à nouveau.
+        """
+        if mesh is None:
+            mesh = self.mesh
+        return mesh.equilibre(
+            self.effort_pointe(dz_pointe, mesh), dz_pointe, self.Dp, self.Ds, self.Eb,
+            self.skin_friction_law, self.slice_solver, self.raideur_pointe(dz_pointe, mesh), warm_start,
+        )
+
+    @stats.timed('equilibre')
     def equilibre_dz_pointe(self, dz_pointe: float) -> list[float | SlicePile]:
         """
         Détermine l'équilibre d'un pieu pour un déplacement vertical donné de la pointe.
         """
-        qb = self.kp_util * self.ple_etoile
-        q1 = self.slices[-1].section_pointe * self.slices[-1].q_z(qb, dz_pointe)
-        dz1 = dz_pointe
-        slices = self.slices[::-1]
-        for slice in slices:
-            slice.set_Q_bott(q1)
-            slice.set_dz_bott(dz1)
-            equilibre = slice.equilibre(dz1)
-            q1 = equilibre[0]
-            dz1 = equilibre[1]
-        eq_slices = slices[::-1]
+        mesh = self.mesh
+        q1, dz1, dq1 = self._equilibre_maillage(dz_pointe, mesh=mesh)
+        eq_slices = mesh.update_slices(self.slices)
         return q1, dz_pointe, dz1, eq_slices
     
     def fonction_effort_en_tete(self, dz_pointe: float) -> float:
         """
         Renvoie l'effort en tête de pieu pour un déplacement donné de la pointe du pieu.
         """
-        f_qtop = self.equilibre_dz_pointe(dz_pointe)
-        return f_qtop[0]
+        return self._equilibre_maillage(dz_pointe)[0]
+
+    def effort_en_tete_batch(self, dz_pointe: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Renvoie les tableaux (Q_top, dz_top, dQ_top/ddz_pointe) pour un tableau de déplacements de la pointe, en un seul parcours vectorisé du pieu.
+        """
+        dz_pointe = np.asarray(dz_pointe, dtype=float)
+        mesh = self.mesh
+        return mesh.equilibre_batch(
+            self.effort_pointe(dz_pointe, mesh), dz_pointe, self.Dp, self.Ds, self.Eb,
+            self.skin_friction_law, self.slice_solver, self.raideur_pointe(dz_pointe, mesh),
+        )
+
+    def fonction_effort_en_tete_derivee(self, dz_pointe: float, warm_start: bool=False) -> tuple[float, float]:
+        """
+        Renvoie l'effort en tête de pieu et sa dérivée par rapport au déplacement de la pointe, obtenus en un seul parcours du pieu.
+        """
+        q_top, dz_top, dq_top = self._equilibre_maillage(dz_pointe, warm_start)
+        return q_top, dq_top
     
-    def equilibre_Q_top(self, q_top: float) -> float:
+    @stats.timed('equilibre')
+    def equilibre_Q_top(self, q_top: float, dz_pointe_initial: float=0., warm_start: bool=False) -> float:
+        """
+        Détermine l'équilibre du pieu pour un effort donné en tête, par recherche du déplacement de la pointe.
+        L'effort en tête étant une fonction croissante du déplacement de la pointe, nul pour dz_pointe = 0 et égal à la résistance
+        totale pour dz_pointe_limite, la racine est recherchée dans cet intervalle (BracketedSolver11), à partir de dz_pointe_initial.
+        Pour une loi de mobilisation sans palier atteint en s = 3 q / k (loi absente de utils.FIXED_POINT_SOLVERS), l'effort en tête
+        est évalué en dz_pointe_limite et la borne supérieure est doublée tant qu'elle n'encadre pas q_top.
+        Avec warm_start, l'équilibre de chaque tranche part de l'état du dernier équilibre calculé.
+        Renvoie None si l'équilibre n'est pas trouvé (effort supérieur à la résistance totale) ; la cause est conservée dans
+        self.message_equilibre.
+        """
+        def fonction(dz_pointe):
+            return self.fonction_effort_en_tete_derivee(dz_pointe, warm_start)
+
+        dz_max = self.dz_pointe_limite()
+        if self.skin_friction_law in utils.FIXED_POINT_SOLVERS:
+            q_max = self.resistance_totale
+        else:
+            q_max = fonction(dz_max)[0]
+            n_doubling = 0
+            while q_max < q_top and n_doubling < 20:
+                dz_max *= 2
+                q_max = fonction(dz_max)[0]
+                n_doubling += 1
+
+        solver = BracketedSolver11(
+            fonction,
+            [q_top],
+            (0., dz_max),
+            bracket_values=(0., q_max),
+            initial_guess=dz_pointe_initial,
+            value_and_derivative=True,
+        )
+        self.message_equilibre = solver.message
+        if not solver.convergence:
+            return None
+        return self.equilibre_dz_pointe(solver.final_roots)
+
+    @stats.timed('equilibre')
+    def equilibre_Q_top_batch(
+            self,
+            q_top: np.ndarray,
+            dz_pointe_initial: np.ndarray|float=0.,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
+        Recherche simultanée de l'équilibre pour un tableau d'efforts en tête (BatchNewton sur le déplacement de la pointe).
+        Renvoie les tableaux (dz_pointe, dz_top, convergence) ; dz_pointe et dz_top valent NaN pour les efforts non équilibrés.
         """
-        solver = NewtonRaphson11(self.fonction_effort_en_tete, [q_top])
+        def fonction(dz_pointe):
+            Q_top, dz_top, dQ_top = self.effort_en_tete_batch(dz_pointe)
+            return Q_top, dQ_top
+
+        solver = BatchNewton(fonction, q_top, dz_pointe_initial, value_and_derivative=True)
         dz_pointe = solver.final_roots
-        if dz_pointe == [0.]:
-            return None
-        return self.equilibre_dz_pointe(dz_pointe)
+        dz_top = np.full(dz_pointe.shape, np.nan)
+        if solver.convergence.any():
+            dz_top[solver.convergence] = self.effort_en_tete_batch(dz_pointe[solver.convergence])[1]
+        return dz_pointe, dz_top, solver.convergence
+
+    def dz_pointe_limite(self) -> float:
+        """
+        Déplacement de la pointe au-delà duquel l'effort en pointe et le frottement de toutes les tranches ont atteint leur palier
+        (s = 3 q / k pour les lois de Frank et Zhao) : l'effort en tête est alors égal à la résistance totale.
+        """
+        mesh = self.mesh
+        qb = self.kp_util * self.ple_etoile
+        dz_lim = 3 * qb / mesh.kq[-1]
+        if mesh.n_slices > 0:
+            dz_lim = max(dz_lim, float(np.nanmax(3 * mesh.qs_lim / mesh.kt)))
+        return dz_lim
 
-    def settlement_curve(self, Qmax: float|None=None, nb_pas: float|None=None) -> float:
+    @stats.timed('equilibre')
+    def courbe_deplacement_impose(
+            self,
+            Qmax: float|None=None,
+            nb_points: int=21,
+            dz_max: float|None=None,
+            arret: Callable[[], bool]|None=None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Parcours en déplacement imposé de la pointe, de 0 à dz_max : un seul parcours vectorisé du pieu pour tous les points.
+        Les déplacements sont répartis géométriquement entre dz_min (_dz_min_parcours) et dz_max.
+        Si dz_max n'est pas renseigné, il est pris égal à dz_pointe_limite, puis doublé tant que l'effort en tête reste inférieur à Qmax
+        (et que arret, si elle est renseignée, renvoie False).
+        Renvoie les tableaux (dz_pointe, Q_top, dz_top).
+        """
+        if Qmax is None:
+            Qmax = self.resistance_totale - 0.0001
+        if dz_max is None:
+            dz_max = self.dz_pointe_limite()
+            n_doubling = 0
+            while self._equilibre_maillage(dz_max)[0] < Qmax and n_doubling < 20:
+                if arret is not None and arret():
+                    break
+                dz_max *= 2
+                n_doubling += 1
+
+        dz_min = self._dz_min_parcours(dz_max, Qmax / nb_points)
+        dz_pointe = np.concatenate(([0.], np.geomspace(dz_min, dz_max, nb_points - 1)))
+        Q_top, dz_top, dQ_top = self.effort_en_tete_batch(dz_pointe)
+        return dz_pointe, Q_top, dz_top
+
+    def _dz_min_parcours(self, dz_max: float, q_min: float) -> float:
+        """
+        Premier déplacement non nul de la pointe du parcours en déplacement imposé. L'effort en tête croissant très rapidement
+        pour les faibles déplacements de la pointe (pieux longs ou frottants), dz_min vaut dz_max / 10 000, divisé par 10
+        (NB_DIVISIONS_DZ_MIN fois au plus) tant que l'effort en tête correspondant dépasse q_min = Qmax / nb_points :
+        sinon, les premiers pas de chargement seraient interpolés depuis l'origine.
+        Si l'effort reste supérieur à q_min, la cause est conservée dans self.message_equilibre (None sinon).
+        """
+        dz_min = dz_max / 10_000
+        q_dz_min = self._equilibre_maillage(dz_min)[0]
+        n_division = 0
+        while q_dz_min > q_min and n_division < NB_DIVISIONS_DZ_MIN:
+            dz_min /= 10
+            q_dz_min = self._equilibre_maillage(dz_min)[0]
+            n_division += 1
+        self.message_equilibre = None
+        if q_dz_min > q_min:
+            self.message_equilibre = (
+                f"Parcours en déplacement imposé : l'effort en tête pour dz_min = {dz_min:.3e} m ({q_dz_min:.3e} MN) dépasse "
+                f"Qmax / nb_points ({q_min:.3e} MN) après {n_division} divisions ; les premiers pas de chargement sont interpolés "
+                f"depuis l'origine"
+            )
+        return dz_min
+
+    @stats.timed('courbe_tassement')
+    def settlement_curve(
+            self,
+            Qmax: float|None=None,
+            nb_pas: float|None=None,
+            methode: str='force',
+            nb_points: int|None=None,
+            continuation: bool=True,
+            progression: Callable[[float], None]|None=None,
+            arret: Callable[[], bool]|None=None,
+    ) -> float:
         """
         Courbe de chargement du pieu, définie par :
             - en abscisse:  la charge en tête
             - en ordonnée:  le tassement en tête du pieu
+        Deux méthodes sont disponibles :
+            - 'force':          recherche de l'équilibre (equilibre_Q_top) pour chaque pas de chargement;
+            - 'deplacement':    parcours en déplacement imposé de la pointe (courbe_deplacement_impose, nb_points calculs d'équilibre),
+                                puis interpolation du tassement en tête pour chaque pas de chargement.
+        En méthode 'force', avec continuation, chaque pas part de l'équilibre du pas précédent : le déplacement de la pointe
+        est extrapolé (sécante sur les deux derniers pas convergés) et l'équilibre de chaque tranche part de son état précédent.
+        Suivi du calcul (exécution en tâche de fond) :
+            - progression:  appelée avec l'avancement (entre 0 et 1) après chaque pas de chargement;
+            - arret:        consultée avant chaque pas ; si elle renvoie True, le calcul s'arrête et la partie de courbe
+                            déjà calculée est renvoyée.
         """
         if Qmax is None:
             Qmax = self.resistance_totale - 0.0001
         if nb_pas is None:
             nb_pas = 20
+        if methode == 'deplacement':
+            return self._settlement_curve_deplacement(Qmax, nb_pas, nb_points, progression, arret)
+        elif methode != 'force':
+            raise ValueError("methode doit être parmi ['force', 'deplacement']")
         Qi = 1/2 * Qmax / nb_pas
         dz_acc = []
         effort_acc = []
+        converged = []
         i = 0
         while i <= nb_pas:
-            equilibre = self.equilibre_Q_top(Qi)
+            if arret is not None and arret():
+                break
+            dz_pointe_initial = 0.
+            if continuation:
+                dz_pointe_initial = self._extrapolation_dz_pointe(converged, Qi)
+            equilibre = self.equilibre_Q_top(Qi, dz_pointe_initial, warm_start=continuation)
             if equilibre == None:
                 i += 1
                 Qi = i * Qmax / nb_pas
                 continue
             else:
-                effort = equilibre[3][0].Q_top
-                dz_tete = equilibre[3][2].dz_top
+                effort = equilibre[0]
+                dz_tete = equilibre[2]
                 dz_acc.append(dz_tete)
                 effort_acc.append(effort)
+                converged.append((effort, equilibre[1]))
                 i +=1
                 Qi = i * Qmax / nb_pas
+            if progression is not None:
+                progression(min(i / (nb_pas + 1), 1.))
         return dz_acc, effort_acc
 
+    @staticmethod
+    def _extrapolation_dz_pointe(converged: list[tuple[float, float]], q_top: float) -> float:
+        """
+        Estimation du déplacement de la pointe pour l'effort q_top à partir des pas convergés [(Q_top, dz_pointe)] :
+        extrapolation sécante sur les deux derniers pas, ou dernier déplacement convergé s'il n'y en a qu'un.
+        """
+        if not converged:
+            return 0.
+        Q_1, dz_1 = converged[-1]
+        if len(converged) == 1:
+            return dz_1
+        Q_0, dz_0 = converged[-2]
+        if Q_1 == Q_0:
+            return dz_1
+        return max(dz_1 + (dz_1 - dz_0) * (q_top - Q_1) / (Q_1 - Q_0), 0.)
+
+    def _settlement_curve_deplacement(
+            self,
+            Qmax: float,
+            nb_pas: int,
+            nb_points: int|None=None,
+            progression: Callable[[float], None]|None=None,
+            arret: Callable[[], bool]|None=None,
+    ) -> tuple[list[float], list[float]]:
+        """
+        Courbe de chargement obtenue par interpolation d'un parcours en déplacement imposé de la pointe.
+        Les pas de chargement non atteints par le parcours sont ignorés, comme pour la méthode 'force'.
+        Le parcours étant vectorisé, la progression n'est signalée qu'en fin de calcul.
+        """
+        if nb_points is None:
+            nb_points = nb_pas + 1
+        if arret is not None and arret():
+            return [], []
+        dz_pointe, Q_top, dz_top = self.courbe_deplacement_impose(Qmax, nb_points, arret=arret)
+        # Q_top(dz_pointe) est croissante : seuls les points avant le palier sont conservés pour l'interpolation
+        n_points = int(np.argmax(Q_top)) + 1
+        Q_top = Q_top[:n_points]
+        dz_top = dz_top[:n_points]
+
+        efforts = np.array([1/2 * Qmax / nb_pas] + [i * Qmax / nb_pas for i in range(1, nb_pas + 1)])
+        efforts = efforts[efforts <= Q_top[-1]]
+        dz_acc = np.interp(efforts, Q_top, dz_top)
+        if progression is not None:
+            progression(1.)
+        return dz_acc.tolist(), efforts.tolist()
+
     @property
     def data_for_fe_model(self):
         """
@@ -724,6 +1638,7 @@ class Pile:
         }
         return dico
 
+    @stats.timed('fe_construction')
     def get_fe_model(
             self,
             horizontal_force: float=0.,
@@ -733,9 +1648,97 @@ class Pile:
         """
         Returns the PyNite FEModel3D of the pile.
         """
-        model = utils.build_pile(self.data_for_fe_model, self.slices, horizontal_force, bending_moment, situation)
+        model = utils.build_pile(self.data_for_fe_model, self.mesh, self.lithology, horizontal_force, bending_moment, situation)
         return model
 
+    def lateral_model_data(self, situation: str='court terme') -> tuple[np.ndarray, float, np.ndarray]:
+        """
+        Données du modèle latéral, identiques à celles du modèle PyNite (utils.build_pile) :
+        niveaux des noeuds (tête, milieu de chaque tranche, pointe), rigidité en flexion EI et raideur du ressort de chaque noeud.
+        """
+        data = self.data_for_fe_model
+        levels = np.concatenate(([self.mesh.z_top[0]], self.mesh.z_middle, [self.mesh.z_bottom[-1]]))
+        springs = np.concatenate(([0.], self.mesh.linear_springs(self.lithology, data['B'], situation), [0.]))
+        return levels, data['E'] * data['Iz'], springs
+
+    def lateral_model(self, situation: str='court terme') -> lateral.LateralModel:
+        """
+        Modèle latéral linéaire factorisé (lateral.LateralModel), mémorisé pour chaque situation tant que le pieu n'a pas changé.
+        La situation n'est pas sensible à la casse ('ELU' et 'elu' partagent le même modèle).
+        """
+        situation = situation.lower()
+        cache = self.valid_cache()
+        key = ('lateral_model', situation)
+        if key not in cache:
+            with stats.stage('lateral_factorisation'):
+                cache[key] = lateral.LateralModel(*self.lateral_model_data(situation))
+        return cache[key]
+
+    def lateral_analysis(
+            self,
+            horizontal_force: float=0.,
+            bending_moment: float=0.,
+            situation: str='court terme',
+            backend: str='banded',
+    ) -> lateral.LateralResults:
+        """
+        Calcul linéaire du pieu sous un effort horizontal et un moment fléchissant en tête.
+            - 'banded': poutre sur ressorts assemblée en matrice bande et résolue par Cholesky (lateral_model, factorisé une seule fois);
+            - 'pynite': modèle PyNite (get_fe_model), pour contrôle.
+        Avec le backend 'banded', horizontal_force et bending_moment peuvent être des tableaux (résultats empilés par cas de charge).
+        """
+        if backend == 'banded':
+            return self.lateral_model(situation).solve(horizontal_force, bending_moment)
+        elif backend == 'pynite':
+            levels, EI, springs = self.lateral_model_data(situation)
+            fe_model = self.get_fe_model(horizontal_force, bending_moment, situation)
+            with stats.stage('fe_resolution'):
+                fe_model.analyze_linear()
+            return lateral.results_from_fe_model(fe_model, levels, springs)
+        raise ValueError("backend doit être parmi ['banded', 'pynite']")
+
+    def lateral_analysis_torseurs(
+            self,
+            torseurs: list['Torseur'],
+            situation: str='court terme',
+            direction: str='x',
+    ) -> lateral.LateralResults:
+        """
+        Calcul linéaire du pieu pour une liste de Torseur, résolus simultanément avec un seul modèle factorisé.
+        Direction 'x' : effort hx et moment my ; direction 'y' : effort hy et moment mx.
+        Les résultats sont empilés dans l'ordre de la liste (une ligne par torseur).
+        """
+        if direction == 'x':
+            loads = [(torseur.hx, torseur.my) for torseur in torseurs]
+        elif direction == 'y':
+            loads = [(torseur.hy, torseur.mx) for torseur in torseurs]
+        else:
+            raise ValueError("direction doit être parmi ['x', 'y']")
+        loads = np.array(loads, dtype=float).reshape(-1, 2)
+        return self.lateral_model(situation).solve(loads[:, 0], loads[:, 1])
+
+    def lateral_analysis_nonlinear(
+            self,
+            horizontal_force: float=0.,
+            bending_moment: float=0.,
+            situation: str='court terme',
+            nb_pas: int=1,
+            methode: str='tangent',
+            max_iterations: int=50,
+            tolerance: float=1e-6,
+    ) -> lateral.LateralResults:
+        """
+        Calcul non linéaire du pieu sous un effort horizontal et un moment fléchissant en tête, avec les lois de mobilisation
+        de la pression latérale de chaque tranche (bi- ou tri-linéaires, plafonnées aux paliers pf / pl suivant la situation).
+        Voir lateral.solve_lateral_nonlinear pour les méthodes d'itération ('secant' ou 'tangent') et le contrôle de convergence.
+        """
+        levels, EI, springs = self.lateral_model_data(situation)
+        q1, k1, q2, k2 = self.mesh.lateral_laws(self.lithology, self.data_for_fe_model['B'], situation)
+        laws = [np.concatenate(([0.], law, [0.])) for law in (q1, k1, q2, k2)]
+        return lateral.solve_lateral_nonlinear(
+            levels, EI, *laws, horizontal_force, bending_moment, nb_pas, methode, max_iterations, tolerance,
+        )
+
     def pile_description(self):
         """
         Imprime les principales caractéristiques de la fondation profonde dans le terminal
@@ -810,3 +1813,85 @@ class Torseur:
             return self.comb.upper() in comb_1
         else:
             return False
+
+
+@dataclass
+class TableTorseurs:
+    """
+    Table de torseurs en colonnes : chaque champ de Torseur est un tableau avec une valeur par combinaison.
+    Permet de traiter des milliers de combinaisons sans créer d'objets Torseur (Pile.verification_torseurs).
+    """
+    hx: np.ndarray
+    hy: np.ndarray
+    nz: np.ndarray
+    mx: np.ndarray
+    my: np.ndarray
+    situation: np.ndarray
+    comb: np.ndarray
+
+    def __post_init__(self):
+        for name in ['hx', 'hy', 'nz', 'mx', 'my']:
+            setattr(self, name, np.asarray(getattr(self, name), dtype=float))
+        self.situation = np.asarray(self.situation, dtype=str)
+        self.comb = np.asarray(self.comb, dtype=str)
+
+    def __len__(self) -> int:
+        return len(self.nz)
+
+    @classmethod
+    def from_torseurs(cls, torseurs: list[Torseur]) -> 'TableTorseurs':
+        """
+        Table construite à partir d'une liste de Torseur.
+        """
+        return cls(*([getattr(torseur, field.name) for torseur in torseurs] for field in fields(Torseur)))
+
+    def validite(self) -> np.ndarray:
+        """
+        Validité de chaque combinaison (Torseur.check_situation et Torseur.check_comb),
+        évaluée une seule fois pour chaque couple (situation, combinaison) distinct.
+        """
+        if len(self) == 0:
+            return np.zeros(0, dtype=bool)
+        couples, inverse = np.unique(np.stack([self.situation, self.comb], axis=1), axis=0, return_inverse=True)
+        validite = np.array([
+            torseur.check_situation() and torseur.check_comb()
+            for torseur in (Torseur(0., 0., 0., 0., 0., situation, comb) for situation, comb in couples)
+        ])
+        return validite[inverse.ravel()]
+
+
+@dataclass
+class VerificationTorseurs:
+    """
+    Résultats de la vérification de portance d'une table de combinaisons (Pile.verification_torseurs), une valeur par combinaison :
+        - comb:             Combinaison (en majuscules)
+        - nz:               Effort axial
+        - capacite:         Capacité en compression (nz >= 0) ou en traction (nz < 0) de la combinaison (NaN si invalide)
+        - taux:             Taux de travail nz / capacité (NaN si invalide)
+        - valide:           Situation et combinaison valides (Torseur.check_situation et Torseur.check_comb)
+        - verification:     Combinaison valide et taux de travail inférieur ou égal à 1
+    """
+    comb: np.ndarray
+    nz: np.ndarray
+    capacite: np.ndarray
+    taux: np.ndarray
+    valide: np.ndarray
+    verification: np.ndarray
+
+    @property
+    def verification_globale(self) -> bool:
+        """
+        Toutes les combinaisons sont valides et vérifiées.
+        """
+        return bool(np.all(self.verification))
+
+    def combinaisons_dimensionnantes(self) -> dict[str, int|None]:
+        """
+        Indice de la combinaison dimensionnante (taux de travail maximal) pour chaque état limite de CAPACITES_COMB,
+        None si aucune combinaison valide ne relève de cet état limite.
+        """
+        dimensionnantes = {}
+        for comb in CAPACITES_COMB:
+            indices = np.flatnonzero(self.valide & (self.comb == comb))
+            dimensionnantes[comb] = int(indices[np.argmax(self.taux[indices])]) if len(indices) else None
+        return dimensionnantes
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 import math
 import numpy as np
 
-from geotech_module.utils import trapezoidal_integration, mean_value
+from geotech_module.utils import trapezoidal_integration, mean_value, cumulative_trapezoid, prefix_integral, next_state_version
 
 
 TAB_F421 = {
@@ -71,11 +71,69 @@ TAB_F523 = {
     '20': {'Q1': 200, 'Q12': 200, 'Q2': 440, 'Q3': 440, 'Q4': 440, 'Q5': 500},
 }
 
+# Courbes de frottement, dans l'ordre des colonnes des tableaux compilés
+COURBES = ('Q1', 'Q12', 'Q2', 'Q3', 'Q4', 'Q5')
+
+# Paramètres de la fonction fsol, dans l'ordre des colonnes de ARR_F522
+PARAMETRES_FSOL = ('a', 'b', 'c')
+
+
+def compile_table(table: dict, columns: tuple[str]) -> np.ndarray:
+    """
+    Compile un tableau de la norme {ligne: {colonne: valeur}} en un tableau NumPy dense.
+    Les lignes numérotées ('1', '2', ...) sont indexées par leur numéro (la ligne 0 est inutilisée), les autres dans l'ordre du dictionnaire.
+    Les entrées non définies ('-') valent NaN.
+    """
+    keys = list(table)
+    if all(key.isdigit() for key in keys):
+        rows = [int(key) for key in keys]
+        array = np.full((max(rows) + 1, len(columns)), np.nan)
+    else:
+        rows = range(len(keys))
+        array = np.full((len(keys), len(columns)), np.nan)
+    for row, key in zip(rows, keys):
+        for j, column in enumerate(columns):
+            value = table[key][column]
+            if value != '-':
+                array[row, j] = value
+    return array
+
+
+# Tableaux compilés à l'import : ARR_F421[classe, courbe], ARR_F521[catégorie, courbe], ARR_F522[courbe, paramètre],
+# ARR_F523[catégorie, courbe] (en kPa)
+ARR_F421 = compile_table(TAB_F421, COURBES)
+ARR_F521 = compile_table(TAB_F521, COURBES)
+ARR_F522 = compile_table(TAB_F522, PARAMETRES_FSOL)
+ARR_F523 = compile_table(TAB_F523, COURBES)
+
+
+def courbe_index(courbe_frottement: str) -> int:
+    """
+    Indice de la courbe de frottement dans COURBES.
+    """
+    try:
+        return COURBES.index(courbe_frottement.upper())
+    except ValueError:
+        raise KeyError(f"Courbe de frottement inconnue : {courbe_frottement}, doit être parmi {list(COURBES)}")
+
+
+def table_value(table: np.ndarray, rows, column: int) -> float|np.ndarray:
+    """
+    Lecture vectorisée d'un tableau compilé pour une ligne (catégorie ou classe) ou un tableau de lignes.
+    """
+    values = table[np.asarray(rows).astype(int), column]
+    if np.ndim(values) == 0:
+        return float(values)
+    return values
+
 
 @dataclass
 class Soil:
     """
     Couche de sol, définie par les paramètres pressiométriques renseignés.
+    Chaque affectation d'un paramètre attribue un nouveau numéro d'état (_state_version), qui invalide les grandeurs
+    mémorisées par les pieux (Pile.state_key) ; l'affectation de courbe_frottement met à jour l'indice de la courbe
+    dans les tableaux compilés (None si la courbe est inconnue).
     """
     name: str
     level_sup: float
@@ -87,13 +145,19 @@ class Soil:
     alpha: float
     soil_type: str='granulaire'
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in self.__dataclass_fields__:
+            super().__setattr__('_state_version', next_state_version())
+            if name == 'courbe_frottement':
+                super().__setattr__('_courbe_index', courbe_index(value) if self.check_courbe_frottement() else None)
+
     def check_courbe_frottement(self) -> bool:
         """
         Vérification de la validité du paramètres "Courbe_frottement".
         Doit être parmi ['Q1', 'Q12', 'Q2', 'Q3', 'Q4', 'Q5'].
         """
-        courbes = ['Q1', 'Q12', 'Q2', 'Q3', 'Q4', 'Q5']
-        return self.courbe_frottement.upper() in courbes
+        return self.courbe_frottement.upper() in COURBES
 
     def check_soil_type(self) -> bool:
         """
@@ -103,56 +167,84 @@ class Soil:
         types = ['fin', 'granulaire']
         return self.soil_type in types
 
-    def alpha_pieu_sol(self, categorie_pieu: int) -> float:
+    @property
+    def _courbe(self) -> int:
+        """
+        Indice de la courbe de frottement dans les tableaux compilés, pour la courbe de frottement courante.
+        """
+        if self._courbe_index is None:
+            raise KeyError(f"Courbe de frottement inconnue : {self.courbe_frottement}, doit être parmi {list(COURBES)}")
+        return self._courbe_index
+
+    def alpha_pieu_sol(self, categorie_pieu: int|np.ndarray) -> float|np.ndarray:
         """
         Paramètre adimensionnel alpha_pieu_sol fonction de la catégorie du pieu, suivant le tableau F.5.2.1 de la NF P94-262.
+        NaN si la catégorie n'est pas couverte par le tableau.
         """
-        return TAB_F521[str(categorie_pieu)][self.courbe_frottement.upper()]
-    
-    def kp_max(self, classe_pieu: int) -> float:
+        return table_value(ARR_F521, categorie_pieu, self._courbe)
+
+    def kp_max(self, classe_pieu: int|np.ndarray) -> float|np.ndarray:
         """
         Facteur de portance pressiométrique fonction de la classe du pieu, suivant le tableau F.4.2.1 de la NF P94-262.
         """
-        return TAB_F421[str(classe_pieu)][self.courbe_frottement.upper()]
+        return table_value(ARR_F421, classe_pieu, self._courbe)
 
     @property
     def _a_parameter(self) -> float:
         """
         Paramètre a pour calculs de la fonction f_sol, suivant le tableau F.5.2.2 de la NF P94-262.
         """
-        return TAB_F522[self.courbe_frottement.upper()]['a']
-    
+        return float(ARR_F522[self._courbe, 0])
+
     @property
     def _b_parameter(self) -> float:
         """
         Paramètre b pour calculs de la fonction f_sol, suivant le tableau F.5.2.2 de la NF P94-262.
         """
-        return TAB_F522[self.courbe_frottement.upper()]['b']
+        return float(ARR_F522[self._courbe, 1])
 
     @property
     def _c_parameter(self) -> float:
         """
         Paramètre c pour calculs de la fonction f_sol, suivant le tableau F.5.2.2 de la NF P94-262.
         """
-        return TAB_F522[self.courbe_frottement.upper()]['c']
+        return float(ARR_F522[self._courbe, 2])
+
+    def fsol(self, pl: float|np.ndarray) -> float|np.ndarray:
+        """
+        Fonction fsol suivant l'article F.5.2 (3) de la NF P94-262, pour une pression limite ou un tableau de pressions limites.
+        """
+        a, b, c = ARR_F522[self._courbe].tolist()
+        return (a * pl + b) * (1 - np.exp(-c * pl))
 
     @property
     def fonction_fsol(self) -> float:
         """
         Fonction fsol suivant l'article F.5.2 (3) de la NF P94-262.
         """
-        fsol = (self._a_parameter * self.pl + self._b_parameter) * (1 - math.exp(-self._c_parameter * self.pl))
-        return fsol
+        return float(self.fsol(self.pl))
 
-    def frottement_maxi(self, categorie_pieu: int) -> float:
+    def frottement_maxi(self, categorie_pieu: int|np.ndarray) -> float|np.ndarray:
         """
         Valeur du frottement axial unitaire maximal, fonction de la catégorie du pieu - suivant le tableau F.5.2.3 de la NF P94-262.
+        Nul si la catégorie n'est pas couverte par le tableau.
         """
-        try:
-            return TAB_F523[str(categorie_pieu)][self.courbe_frottement.upper()] / 1000
-        except TypeError:
-            return 0.
-    
+        qs_max = np.nan_to_num(table_value(ARR_F523, categorie_pieu, self._courbe) / 1000, nan=0.)
+        if np.ndim(qs_max) == 0:
+            return float(qs_max)
+        return qs_max
+
+    def frottement_limite(self, categorie_pieu: int|np.ndarray) -> float|np.ndarray:
+        """
+        Valeur du frottement axial unitaire admissible qs = min(alpha_pieu_sol * fsol, qs_max) - suivant l'article F.5.2 de la NF P94-262.
+        NaN si la catégorie de pieu n'est pas couverte par le tableau F.5.2.1.
+        """
+        qs = self.alpha_pieu_sol(categorie_pieu) * self.fonction_fsol
+        qs_lim = np.minimum(qs, self.frottement_maxi(categorie_pieu))
+        if np.ndim(qs_lim) == 0:
+            return float(qs_lim)
+        return qs_lim
+
     def module_kt(self, B: float) -> float:
         """
         Module kt suivant l'annexe L de la NF P94-262, fonction du type de sol (fin ou granulaire).
@@ -189,29 +281,142 @@ class Soil:
             return 12 * self.Em / (4/3 * 2.65 ** self.alpha + self.alpha)
 
 
+@dataclass
+class LithologyIndex:
+    """
+    Index des couches de sol par niveau, construit une fois pour une lithologie donnée.
+    Les couches sont triées par niveau inférieur décroissant ; la recherche d'un niveau se fait par dichotomie (np.searchsorted).
+    A une interface, la couche supérieure est retenue. Un niveau hors de la lithologie (ou dans une lacune) ne correspond à aucune couche.
+    """
+    lithology: list[Soil]
+
+    def __post_init__(self):
+        # Tri stable : à niveau inférieur égal, l'ordre de la lithologie est conservé
+        self.order = np.array(
+            sorted(range(len(self.lithology)), key=lambda i: -self.lithology[i].level_inf),
+            dtype=int,
+        )
+        self.levels_sup = np.array([self.lithology[i].level_sup for i in self.order], dtype=float)
+        self.levels_inf = np.array([self.lithology[i].level_inf for i in self.order], dtype=float)
+
+    def indices_at_levels(self, levels: float|np.ndarray) -> int|np.ndarray:
+        """
+        Indices dans la lithologie des couches contenant les niveaux donnés ; -1 si aucune couche ne contient le niveau.
+        """
+        levels = np.asarray(levels, dtype=float)
+        position = np.searchsorted(-self.levels_inf, -levels, side='left')
+        found = position < len(self.order)
+        position = np.minimum(position, len(self.order) - 1)
+        if len(self.order) > 0:
+            found &= levels <= self.levels_sup[position]
+            indices = np.where(found, self.order[position], -1)
+        else:
+            indices = np.full(levels.shape, -1)
+        if indices.ndim == 0:
+            return int(indices)
+        return indices
+
+    def soil_at_level(self, level: float) -> Soil|None:
+        """
+        Renvoie la couche de sol contenant le niveau donné (None si aucune).
+        """
+        index = self.indices_at_levels(level)
+        if index < 0:
+            return None
+        return self.lithology[index]
+
+    def soils_at_levels(self, levels: np.ndarray) -> list[Soil|None]:
+        """
+        Renvoie les couches de sol contenant chacun des niveaux donnés (None si aucune).
+        """
+        return [self.lithology[i] if i >= 0 else None for i in np.atleast_1d(self.indices_at_levels(levels)).tolist()]
+
+    def errors(self, abs_tol: float=1e-9) -> list[str]:
+        """
+        Liste des défauts de la stratigraphie, dans l'ordre de la lithologie : couches inversées, couches non classées
+        par niveaux décroissants, chevauchements et lacunes entre couches successives.
+        """
+        errors = []
+        for idx, soil in enumerate(self.lithology):
+            if soil.level_inf > soil.level_sup:
+                errors.append(f"Couche '{soil.name}' : level_inf ({soil.level_inf}) supérieur à level_sup ({soil.level_sup})")
+            if idx == 0:
+                continue
+            previous = self.lithology[idx - 1]
+            if soil.level_sup > previous.level_sup:
+                errors.append(f"Couches '{previous.name}' et '{soil.name}' non classées par niveaux décroissants")
+            elif math.isclose(soil.level_sup, previous.level_inf, abs_tol=abs_tol):
+                continue
+            elif soil.level_sup > previous.level_inf:
+                errors.append(
+                    f"Chevauchement entre '{previous.name}' et '{soil.name}' de {previous.level_inf} à {soil.level_sup}"
+                )
+            else:
+                errors.append(
+                    f"Lacune entre '{previous.name}' et '{soil.name}' de {previous.level_inf} à {soil.level_sup}"
+                )
+        return errors
+
+
 @dataclass
 class LogPressio:
     """
-    Classe definissant les enregistrements d'un essai pressiométrique Ménard
+    Classe definissant les enregistrements d'un essai pressiométrique Ménard.
+    Les courbes sont triées par profondeur croissante et leurs intégrales cumulées sont calculées à la création :
+    la moyenne d'un paramètre entre deux profondeurs est obtenue par deux recherches par dichotomie,
+    pour un intervalle ou pour des tableaux d'intervalles (z1, z2).
+    L'affectation d'un enregistrement (levels_ngf, cb_pf, cb_pl, cb_Em) attribue un nouveau numéro d'état (_state_version) :
+    les courbes sont alors recalculées au premier accès. La modification en place d'une liste n'est pas détectée : utiliser clear_cache.
     """
     levels_ngf: list[float]
     cb_pf: list[float]
     cb_pl: list[float]
     cb_Em: list[float]
 
+    def __post_init__(self):
+        self._compile()
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in self.__dataclass_fields__:
+            super().__setattr__('_state_version', next_state_version())
+
+    def _compile(self):
+        """
+        Niveau du toit de l'essai, profondeurs des enregistrements, profondeurs triées et,
+        pour chaque paramètre, (valeurs triées, intégrales cumulées), associés au numéro d'état des enregistrements.
+        """
+        top_level = max(self.levels_ngf)
+        depths = [self.level_to_depth(level, top_level) for level in self.levels_ngf]
+        order = np.argsort(depths, kind='stable')
+        z = np.asarray(depths, dtype=float)[order]
+        courbes = {}
+        for parametre, courbe in (('pf', self.cb_pf), ('pl', self.cb_pl), ('Em', self.cb_Em)):
+            cb_y = np.asarray(courbe, dtype=float)[order]
+            courbes[parametre] = (cb_y, cumulative_trapezoid(z, cb_y))
+        self._compiled = (self._state_version, top_level, depths, z, courbes)
+
+    def _courbes(self) -> tuple[int, float, list[float], np.ndarray, dict[str, tuple[np.ndarray, np.ndarray]]]:
+        if self._compiled[0] != self._state_version:
+            self._compile()
+        return self._compiled
+
+    def clear_cache(self):
+        """
+        Force le recalcul des courbes (après modification en place d'une liste d'enregistrements).
+        """
+        self._compile()
+
     @property
-    def top_level(self):
-        return max(self.levels_ngf)
+    def top_level(self) -> float:
+        return self._courbes()[1]
 
-    def __post_init__(self):
-        self.depths = self.get_depths()
+    @property
+    def depths(self) -> list[float]:
+        return self._courbes()[2]
 
     def get_depths(self) -> list[float]:
-        depth_acc = []
-        for level in self.levels_ngf:
-            depth = self.level_to_depth(level, self.top_level)
-            depth_acc.append(depth)
-        return depth_acc
+        return list(self.depths)
 
     def depth_to_level(self, depth: float, top_level: float) -> float:
         return top_level - depth
@@ -219,84 +424,110 @@ class LogPressio:
     def level_to_depth(self, level, top_level) -> float:
         return top_level - level
 
+    def valeur_z(self, parametre: str, z: float|np.ndarray) -> float|np.ndarray:
+        """
+        Valeur du paramètre ('pf', 'pl' ou 'Em') interpolée pour une profondeur ou un tableau de profondeurs.
+        """
+        state, top_level, depths, z_sorted, courbes = self._courbes()
+        cb_y, cumul = courbes[parametre]
+        return np.interp(z, z_sorted, cb_y)
+
+    def integrale_z(self, parametre: str, z1: float|np.ndarray, z2: float|np.ndarray) -> float|np.ndarray:
+        """
+        Intégrale du paramètre ('pf', 'pl' ou 'Em') de la profondeur z1 à la profondeur z2 (intervalles scalaires ou tableaux).
+        """
+        state, top_level, depths, z_sorted, courbes = self._courbes()
+        cb_y, cumul = courbes[parametre]
+        integrale = prefix_integral(z_sorted, cb_y, cumul, z2) - prefix_integral(z_sorted, cb_y, cumul, z1)
+        if np.ndim(integrale) == 0:
+            return float(integrale)
+        return integrale
+
+    def moyenne_z(self, parametre: str, z1: float|np.ndarray, z2: float|np.ndarray) -> float|np.ndarray:
+        """
+        Valeur moyenne du paramètre ('pf', 'pl' ou 'Em') entre les profondeurs z1 et z2 (intervalles scalaires ou tableaux).
+        """
+        return self.integrale_z(parametre, z1, z2) / np.abs(np.asarray(z2) - np.asarray(z1))
+
+    def moyenne_ngf(self, parametre: str, level_1: float|np.ndarray, level_2: float|np.ndarray) -> float|np.ndarray:
+        """
+        Valeur moyenne du paramètre ('pf', 'pl' ou 'Em') entre deux niveaux NGF (intervalles scalaires ou tableaux).
+        """
+        z1 = self.level_to_depth(np.asarray(level_1), self.top_level)
+        z2 = self.level_to_depth(np.asarray(level_2), self.top_level)
+        return self.moyenne_z(parametre, z1, z2)
+
     def pf_at_z(self, z: float) -> float:
         """
         Retourne la valeur de pf (pression de fluage) pour une valeur de z donnée.
         """
-        return np.interp(z, self.depths, self.cb_pf)
+        return self.valeur_z('pf', z)
 
     def pf_at_level(self, level: float) -> float:
         """
         Retourne la valeur de pf (pression de fluage) pour un niveau NGF donné.
         """
-        return np.interp(self.level_to_depth(level, self.top_level), self.depths, self.cb_pf)
+        return self.valeur_z('pf', self.level_to_depth(level, self.top_level))
 
     def pl_at_z(self, z: float) -> float:
         """
         Retourne la valeur de pl (pression limite) pour une valeur de z donnée.
         """
-        return np.interp(z, self.depths, self.cb_pl)
+        return self.valeur_z('pl', z)
 
     def pl_at_level(self, level: float) -> float:
         """
         Retourne la valeur de pl (pression limite) pour un niveau NGF donné.
         """
-        return np.interp(self.level_to_depth(level, self.top_level), self.depths, self.cb_pl)
+        return self.valeur_z('pl', self.level_to_depth(level, self.top_level))
 
     def Em_at_z(self, z: float) -> float:
         """
         Retourne la valeur de Em (module pressiométrique) pour une valeur de z donnée.
         """
-        return np.interp(z, self.depths, self.cb_Em)
+        return self.valeur_z('Em', z)
 
     def Em_at_level(self, level: float) -> float:
         """
         Retourne la valeur de Em (module pressiométrique) pour une valeur de z donnée.
         """
-        return np.interp(self.level_to_depth(level, self.top_level), self.depths, self.cb_Em)
+        return self.valeur_z('Em', self.level_to_depth(level, self.top_level))
 
     def pression_fluage_moyenne_z(self, z1: float, z2: float) -> float:
         """
         Retourne la pression de fluage moyenne entre deux niveaux.
         """
-        return mean_value(self.depths, self.cb_pf, z1, z2)
+        return self.moyenne_z('pf', z1, z2)
 
     def pression_fluage_moyenne_ngf(self, level_1: float, level_2: float) -> float:
         """
         Retourne la pression de fluage moyenne entre deux niveaux.
         """
-        z1 = self.level_to_depth(level_1, self.top_level)
-        z2 = self.level_to_depth(level_2, self.top_level)
-        return mean_value(self.depths, self.cb_pf, z1, z2)
+        return self.moyenne_ngf('pf', level_1, level_2)
 
     def pression_limite_moyenne_z(self, z1: float, z2: float) -> float:
         """
         Retourne la pression limite moyenne entre deux niveaux.
         """
-        return mean_value(self.depths, self.cb_pl, z1, z2)
+        return self.moyenne_z('pl', z1, z2)
 
     def pression_limite_moyenne_ngf(self, level_1: float, level_2: float) -> float:
         """
         Retourne la pression limite moyenne entre deux niveaux.
         """
-        z1 = self.level_to_depth(level_1, self.top_level)
-        z2 = self.level_to_depth(level_2, self.top_level)
-        return mean_value(self.depths, self.cb_pl, z1, z2)
+        return self.moyenne_ngf('pl', level_1, level_2)
 
     def module_pressio_moyen_z(self, z1: float, z2: float) -> float:
         """
         Retourne le module pressiométrique moyen entre deux niveaux.
         """
-        return mean_value(self.depths, self.cb_Em, z1, z2)
+        return self.moyenne_z('Em', z1, z2)
 
     def module_pressio_moyen_ngf(self, level_1: float, level_2: float) -> float:
         """
         Retourne le module pressiométrique moyen entre deux niveaux.
         """
-        z1 = self.level_to_depth(level_1, self.top_level)
-        z2 = self.level_to_depth(level_2, self.top_level)
-        return mean_value(self.depths, self.cb_Em, z1, z2)
-
+        return self.moyenne_ngf('Em', level_1, level_2)
 
 levels_ngf = [97, 95.5, 94, 92.5, 91., 89.5, 88., 86.5, 85., 83.5, 82., 80.5]
 pression_f = [0.78, 0.84, 1.01, 0.81, 0.4, 0.61, 0.83, 1.10, 0.62, 1.72, 1.12, 1.13]
@@ -1,19 +1,44 @@
-import numpy as np
 import math
-from numpy.linalg import inv, det
+from collections import Counter
+import numpy as np
 
-from geotech_module.tolerance import Tolerance
+import geotech_module.stats as stats
+from geotech_module.tolerance import Tolerance, tolerance_array
 
 # Delta à appliquer sur les racines
 delta_1 = 0.00001
 
 
 class NewtonRaphson11:
+    """
+    Méthode de Newton-Raphson pour une équation scalaire f(x) = cible.
+    La dérivée est obtenue, par ordre de priorité :
+        - avec la fonction elle-même si value_and_derivative=True (function renvoie (f(x), f'(x)));
+        - par la fonction derivative si elle est fournie;
+        - par différences finies centrées (delta_1) sinon.
+    Le nombre maximal d'itérations, l'amortissement du pas et la tolérance absolue sont paramétrables.
+    Chaque résolution est enregistrée par l'instrumentation (stats), si elle est active.
+    """
 
-    def __init__(self, function, target_value: list[float], initial_guess: float=[0.0]):
+    def __init__(
+            self,
+            function,
+            target_value: list[float],
+            initial_guess: float=[0.0],
+            derivative=None,
+            value_and_derivative: bool=False,
+            max_iterations: int=21,
+            damping: float=1.0,
+            abs_tol: float|None=None,
+    ):
         self.function = function
         self.target_value = target_value
         self.initial_guess = initial_guess
+        self.derivative = derivative
+        self.value_and_derivative = value_and_derivative
+        self.max_iterations = max_iterations
+        self.damping = damping
+        self.abs_tol = abs_tol
 
         self.ensure_valid_data()
         self.result = self.solve()
@@ -21,6 +46,8 @@ class NewtonRaphson11:
     def ensure_valid_data(self):
         if not self.target_value_length():
             raise ValueError(f"Need 1 value")
+        if not 0. < self.damping <= 1.:
+            raise ValueError("damping doit être compris dans ]0, 1]")
 
     def target_value_length(self) -> bool:
         return len(self.target_value) == 1 and len(self.initial_guess) == 1
@@ -29,6 +56,12 @@ class NewtonRaphson11:
     def tolerance(self) -> float:
         return Tolerance(self.target_value)
 
+    @property
+    def tolerance_value(self) -> float:
+        if self.abs_tol is not None:
+            return self.abs_tol
+        return self.tolerance.value
+
     @property
     def convergence(self) -> bool:
         return self.result[0]
@@ -45,7 +78,17 @@ class NewtonRaphson11:
     def final_targets(self) -> list[float]:
         return self.result[3]
 
-    def operator_phi_11(self, variables: list[float]):
+    @property
+    def evaluations_per_iteration(self) -> int:
+        """
+        Nombre d'appels à function par itération (3 avec la dérivée par différences finies).
+        """
+        return 1 if self.value_and_derivative or self.derivative is not None else 3
+
+    def operator_phi_11(self, variables: list[float]) -> float:
+        """
+        Dérivée de la fonction estimée par différences finies centrées.
+        """
         if len(variables) != 1:
             raise ValueError('Need 1 value')
         variable_1 = variables[0]
@@ -53,49 +96,49 @@ class NewtonRaphson11:
         design_point_1 = self.function(variable_1 + delta_1)
         design_point_2 = self.function(variable_1 - delta_1)
 
-        a11 = (design_point_1 - design_point_2) / (2 * delta_1)
+        return (design_point_1 - design_point_2) / (2 * delta_1)
 
-        operator = np.array([[a11]])
+    def evaluate(self, root: float) -> tuple[float, float]:
+        """
+        Renvoie la valeur de la fonction et sa dérivée pour la racine donnée.
+        """
+        if self.value_and_derivative:
+            return self.function(root)
+        value = self.function(root)
+        if self.derivative is not None:
+            return value, self.derivative(root)
+        return value, self.operator_phi_11([root])
 
-        return operator
-    
     def solve(self):
         i = 0
         condition = 0
         calculated_value = 0
-        tolerance_value = self.tolerance.value
-        roots_i = self.initial_guess
+        tolerance_value = self.tolerance_value
         target_1 = self.target_value[0]
-        matrix_roots_i = np.array([[roots_i[0]]])
+        root_1 = self.initial_guess[0]
 
-        while i <= 20:
+        while i < self.max_iterations:
             i += 1
-            root_1 = matrix_roots_i[0][0]
-
-            calculated_value = self.function(root_1)
-            calculated_value_1 = calculated_value
+            calculated_value, slope = self.evaluate(root_1)
 
-            operator_phi = self.operator_phi_11([root_1])
-
-            if det(operator_phi) == 0:
+            if slope == 0:
                 break
-            else:
-                inverse_operator_phi = inv(operator_phi)
-
-            matrix_result_i = np.array([[target_1 - calculated_value_1]])
-
-            matrix_roots_i += + np.dot(inverse_operator_phi, matrix_result_i)
 
-            condition_1 = math.isclose(target_1, calculated_value_1, abs_tol=tolerance_value)
+            root_1 += self.damping * (target_1 - calculated_value) / slope
 
-            condition = condition_1
+            condition = math.isclose(target_1, calculated_value, abs_tol=tolerance_value)
 
             if condition == 1:
                 break
 
         final_target = calculated_value
-        final_root = (matrix_roots_i[0][0])
+        final_root = root_1
 
+        if stats.active() is not None:
+            stats.record_solver(
+                'NewtonRaphson11', i, i * self.evaluations_per_iteration, {i: 1}, int(condition != 1),
+                {'target': target_1, 'initial_guess': self.initial_guess[0], 'last_root': root_1, 'last_value': calculated_value},
+            )
         if condition != 1:
             final_target = [0.0]
             final_root = [0.0]
@@ -115,3 +158,314 @@ class NewtonRaphson11:
         else:
             result = "Aucune solution trouvée !\n"
             return result
+
+
+class BatchNewton:
+    """
+    Méthode de Newton-Raphson vectorisée pour n équations scalaires indépendantes f(x_i) = cible_i.
+    La fonction reçoit le tableau des n racines et renvoie le tableau des n valeurs (ou (valeurs, dérivées) si value_and_derivative=True).
+    Toutes les équations sont itérées ensemble : une équation convergée n'est plus modifiée (masque de convergence par élément).
+    Les racines des équations non convergées valent NaN.
+    Chaque résolution est enregistrée par l'instrumentation (stats), si elle est active : une évaluation par appel vectorisé.
+    """
+
+    def __init__(
+            self,
+            function,
+            target_values,
+            initial_guesses,
+            derivative=None,
+            value_and_derivative: bool=False,
+            max_iterations: int=21,
+            damping: float=1.0,
+            abs_tol: float|None=None,
+    ):
+        self.function = function
+        self.target_values = np.asarray(target_values, dtype=float)
+        self.initial_guesses = np.asarray(initial_guesses, dtype=float)
+        self.derivative = derivative
+        self.value_and_derivative = value_and_derivative
+        self.max_iterations = max_iterations
+        self.damping = damping
+        self.abs_tol = abs_tol
+
+        self.ensure_valid_data()
+        self.result = self.solve()
+
+    def ensure_valid_data(self):
+        if self.target_values.ndim != 1:
+            raise ValueError("target_values doit être un tableau à une dimension")
+        if self.initial_guesses.ndim == 0:
+            self.initial_guesses = np.full(self.target_values.shape, float(self.initial_guesses))
+        if self.initial_guesses.shape != self.target_values.shape:
+            raise ValueError("target_values et initial_guesses doivent avoir la même dimension")
+        if not 0. < self.damping <= 1.:
+            raise ValueError("damping doit être compris dans ]0, 1]")
+
+    @property
+    def tolerance_values(self) -> np.ndarray:
+        if self.abs_tol is not None:
+            return np.full(self.target_values.shape, self.abs_tol)
+        return tolerance_array(self.target_values)
+
+    @property
+    def convergence(self) -> np.ndarray:
+        return self.result[0]
+
+    @property
+    def number_of_iterations(self) -> np.ndarray:
+        return self.result[1]
+
+    @property
+    def final_roots(self) -> np.ndarray:
+        return self.result[2]
+
+    @property
+    def final_targets(self) -> np.ndarray:
+        return self.result[3]
+
+    @property
+    def evaluations_per_iteration(self) -> int:
+        """
+        Nombre d'appels vectorisés à function par itération (3 avec la dérivée par différences finies).
+        """
+        return 1 if self.value_and_derivative or self.derivative is not None else 3
+
+    def evaluate(self, roots: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Renvoie les valeurs de la fonction et ses dérivées pour les racines données.
+        """
+        if self.value_and_derivative:
+            values, slopes = self.function(roots)
+            return np.asarray(values, dtype=float), np.asarray(slopes, dtype=float)
+        values = np.asarray(self.function(roots), dtype=float)
+        if self.derivative is not None:
+            return values, np.asarray(self.derivative(roots), dtype=float)
+        slopes = (np.asarray(self.function(roots + delta_1)) - np.asarray(self.function(roots - delta_1))) / (2 * delta_1)
+        return values, slopes
+
+    def solve(self):
+        n = len(self.target_values)
+        tolerance_values = self.tolerance_values
+        roots = self.initial_guesses.copy()
+        values = np.zeros(n)
+        iterations = np.zeros(n, dtype=int)
+        converged = np.zeros(n, dtype=bool)
+        active = np.ones(n, dtype=bool)
+
+        i = 0
+        while i < self.max_iterations and active.any():
+            i += 1
+            calculated_values, slopes = self.evaluate(roots)
+            iterations[active] = i
+
+            stalled = active & (slopes == 0)
+            active &= ~stalled
+
+            step = np.zeros(n)
+            step[active] = self.damping * (self.target_values[active] - calculated_values[active]) / slopes[active]
+            values[active] = calculated_values[active]
+            roots += step
+
+            newly_converged = active & np.isclose(self.target_values, calculated_values, rtol=0., atol=tolerance_values)
+            converged |= newly_converged
+            active &= ~newly_converged
+
+        if stats.active() is not None:
+            failures = int(n - converged.sum())
+            stats.record_solver(
+                'BatchNewton', i, i * self.evaluations_per_iteration, Counter(iterations.tolist()), failures,
+                {'size': n, 'targets': self.target_values[~converged][:5].tolist()},
+            )
+        roots[~converged] = np.nan
+        values[~converged] = np.nan
+        return converged, iterations, roots, values
+
+
+class BracketedSolver11:
+    """
+    Recherche encadrée de la racine d'une équation scalaire f(x) = cible sur l'intervalle bracket = (a, b),
+    pour une fonction continue dont f(a) - cible et f(b) - cible sont de signes opposés.
+    A chaque itération, le nouveau point est obtenu, par ordre de priorité :
+        - par un pas de Newton depuis la meilleure borne, si la dérivée est connue et que le pas reste dans l'intervalle;
+        - par la méthode de la fausse position modifiée (Illinois);
+        - par dichotomie, si ce pas n'est pas inférieur à la moitié du pas de l'avant-dernière itération (critère de Brent).
+    L'intervalle est conservé à chaque itération : la convergence est garantie en au plus max_iterations évaluations.
+    Les valeurs de f en a et b peuvent être fournies (bracket_values) pour éviter leur évaluation.
+    Une estimation initial_guess intérieure à l'intervalle est évaluée en premier et réduit l'intervalle de recherche.
+    En cas d'échec, final_roots et final_targets valent None et message indique la cause.
+    Chaque résolution est enregistrée par l'instrumentation (stats), si elle est active.
+    """
+
+    def __init__(
+            self,
+            function,
+            target_value: list[float],
+            bracket: tuple[float, float],
+            bracket_values: tuple[float, float]|None=None,
+            initial_guess: float|None=None,
+            derivative=None,
+            value_and_derivative: bool=False,
+            max_iterations: int=60,
+            abs_tol: float|None=None,
+            x_tol: float=1e-12,
+    ):
+        self.function = function
+        self.target_value = target_value
+        self.bracket = bracket
+        self.bracket_values = bracket_values
+        self.initial_guess = initial_guess
+        self.derivative = derivative
+        self.value_and_derivative = value_and_derivative
+        self.max_iterations = max_iterations
+        self.abs_tol = abs_tol
+        self.x_tol = x_tol
+
+        self.ensure_valid_data()
+        self.result = self.solve()
+
+    def ensure_valid_data(self):
+        if len(self.target_value) != 1:
+            raise ValueError("Need 1 value")
+        if len(self.bracket) != 2 or not self.bracket[0] < self.bracket[1]:
+            raise ValueError("bracket doit être un intervalle (a, b) avec a < b")
+
+    @property
+    def tolerance(self) -> float:
+        return Tolerance(self.target_value)
+
+    @property
+    def tolerance_value(self) -> float:
+        if self.abs_tol is not None:
+            return self.abs_tol
+        return self.tolerance.value
+
+    @property
+    def convergence(self) -> bool:
+        return self.result[0]
+
+    @property
+    def number_of_iterations(self) -> int:
+        return self.result[1]
+
+    @property
+    def final_roots(self) -> float|None:
+        return self.result[2]
+
+    @property
+    def final_targets(self) -> float|None:
+        return self.result[3]
+
+    @property
+    def message(self) -> str:
+        return self.result[4]
+
+    def evaluate(self, root: float) -> tuple[float, float|None]:
+        """
+        Renvoie la valeur de la fonction et sa dérivée (None si elle n'est pas connue) pour la racine donnée.
+        """
+        if self.value_and_derivative:
+            return self.function(root)
+        value = self.function(root)
+        if self.derivative is not None:
+            return value, self.derivative(root)
+        return value, None
+
+    def solve(self):
+        result = self._solve()
+        if stats.active() is not None:
+            convergence, i, root, target, message = result
+            stats.record_solver(
+                'BracketedSolver11', i, i, {i: 1}, int(not convergence),
+                {'target': self.target_value[0], 'bracket': list(self.bracket), 'message': message},
+            )
+        return result
+
+    def _solve(self):
+        tolerance_value = self.tolerance_value
+        target_1 = self.target_value[0]
+        a, b = self.bracket
+        i = 0
+        if self.bracket_values is None:
+            fa, da = self.evaluate(a)
+            fb, db = self.evaluate(b)
+            i += 2
+        else:
+            (fa, fb), da, db = self.bracket_values, None, None
+        fa -= target_1
+        fb -= target_1
+
+        if abs(fa) <= tolerance_value:
+            return True, i, a, fa + target_1, "Racine trouvée à la borne inférieure"
+        if abs(fb) <= tolerance_value:
+            return True, i, b, fb + target_1, "Racine trouvée à la borne supérieure"
+        if fa * fb > 0:
+            return False, i, None, None, "La racine n'est pas encadrée : f(a) et f(b) sont de même signe"
+
+        if self.initial_guess is not None and a < self.initial_guess < b:
+            c = self.initial_guess
+            fc, dc = self.evaluate(c)
+            i += 1
+            fc -= target_1
+            if abs(fc) <= tolerance_value:
+                return True, i, c, fc + target_1, "Convergence atteinte"
+            if fc * fa > 0:
+                a, fa, da = c, fc, dc
+            else:
+                b, fb, db = c, fc, dc
+
+        # Poids de la méthode Illinois : la valeur de la borne conservée deux fois de suite est divisée par deux
+        wa, wb = fa, fb
+        side = 0
+        steps = [math.inf, math.inf]
+        while i < self.max_iterations:
+            if b - a <= self.x_tol:
+                x, fx = (a, fa) if abs(fa) <= abs(fb) else (b, fb)
+                return True, i, x, fx + target_1, "Largeur de l'intervalle inférieure à x_tol"
+
+            x, fx, dx = (a, fa, da) if abs(fa) <= abs(fb) else (b, fb, db)
+            c = None
+            if dx:
+                c = x - fx / dx
+                if not a < c < b:
+                    c = None
+            if c is None:
+                c = (a * wb - b * wa) / (wb - wa)
+                if not a < c < b:
+                    c = (a + b) / 2
+            if abs(c - x) > steps[-2] / 2:
+                c = (a + b) / 2
+            steps.append(abs(c - x))
+
+            fc, dc = self.evaluate(c)
+            i += 1
+            fc -= target_1
+            if abs(fc) <= tolerance_value:
+                return True, i, c, fc + target_1, "Convergence atteinte"
+
+            if fc * fa > 0:
+                a, fa, da, wa = c, fc, dc, fc
+                if side == -1:
+                    wb /= 2
+                side = -1
+            else:
+                b, fb, db, wb = c, fc, dc, fc
+                if side == 1:
+                    wa /= 2
+                side = 1
+
+        return False, i, None, None, f"Pas de convergence après {i} évaluations"
+
+    def __str__(self) -> str:
+        if self.convergence:
+            result = f"Recherche encadrée - 1 x 1:\n"
+            result += f"\tL'équilibre est obtenu après {self.number_of_iterations} évaluations.\n"
+            result += f"\t{self.tolerance}\n"
+            result += f"\tRappel de la valeur cible:\n"
+            result += f"\t\tValeur_01 :   {self.final_targets:.1f}\n"
+            result += f"\tDéfinition de la racine:\n"
+            result += f"\t\tRacine_01 :   {self.final_roots:.9f}\n"
+            return result
+        else:
+            result = f"Aucune solution trouvée ! {self.message}\n"
+            return result
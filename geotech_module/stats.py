@@ -0,0 +1,267 @@
+"""
+Instrumentation des calculs : nombre d'évaluations et d'itérations des solveurs, échecs de convergence et durée des étapes de Pile.
+
+L'instrumentation est désactivée par défaut : chaque point de mesure se limite alors à un test sur la collecte active.
+Elle est activée pour un bloc de calcul avec collect(), ou jusqu'à nouvel ordre avec enable() / disable() :
+
+    with stats.collect() as statistiques:
+        pile.settlement_curve()
+    print(statistiques)
+
+La collecte active est propre au contexte d'exécution (contextvars) : activer la collecte dans un fil d'exécution
+(une session de l'application Streamlit) est sans effet sur les autres. Une tâche soumise à un exécuteur n'hérite de la collecte
+que si elle est exécutée dans une copie du contexte (contextvars.copy_context().run). Un même objet Stats peut en revanche
+être activé dans plusieurs contextes et cumuler leurs mesures. Les durées des étapes sont inclusives (la durée de l'étape 'courbe_tassement' comprend celle des étapes 'equilibre' qu'elle déclenche)
+et une étape imbriquée dans une étape de même nom n'est comptée qu'une fois.
+"""
+import contextvars
+import functools
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+
+
+# Nombre maximal d'échecs de convergence détaillés conservés (les échecs suivants sont seulement comptés)
+MAX_FAILURES = 100
+
+_ACTIVE: contextvars.ContextVar['Stats|None'] = contextvars.ContextVar('stats_active', default=None)
+_LOCK = threading.Lock()
+_LOCAL = threading.local()
+_NULL_STAGE = nullcontext()
+
+
+@dataclass
+class SolverStats:
+    """
+    Mesures d'un type de solveur :
+        - instances:    Nombre de résolutions
+        - evaluations:  Nombre d'évaluations de la fonction (appels vectorisés pour BatchNewton)
+        - iterations:   Nombre total d'itérations
+        - failures:     Nombre d'équations non convergées
+        - histogram:    Nombre d'équations par nombre d'itérations
+    """
+    instances: int=0
+    evaluations: int=0
+    iterations: int=0
+    failures: int=0
+    histogram: Counter=field(default_factory=Counter)
+
+    def merge(self, other: 'SolverStats'):
+        self.instances += other.instances
+        self.evaluations += other.evaluations
+        self.iterations += other.iterations
+        self.failures += other.failures
+        self.histogram.update(other.histogram)
+
+    def summary(self) -> dict:
+        return {
+            'instances': self.instances,
+            'evaluations': self.evaluations,
+            'iterations': self.iterations,
+            'failures': self.failures,
+            'histogram': {str(n): count for n, count in sorted(self.histogram.items())},
+        }
+
+
+@dataclass
+class StageStats:
+    """
+    Durées d'une étape de calcul : nombre d'appels, durée totale et durée maximale d'un appel (s).
+    """
+    calls: int=0
+    total: float=0.
+    max: float=0.
+
+    def merge(self, other: 'StageStats'):
+        self.calls += other.calls
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def summary(self) -> dict:
+        return {'calls': self.calls, 'total': self.total, 'max': self.max}
+
+
+@dataclass
+class Stats:
+    """
+    Mesures collectées :
+        - solvers:      SolverStats par solveur
+        - stages:       StageStats par étape de calcul
+        - counters:     Compteurs (parcours du pieu, équilibres de tranches...)
+        - failures:     Détail des premiers échecs de convergence (MAX_FAILURES au plus)
+    """
+    solvers: dict[str, SolverStats]=field(default_factory=dict)
+    stages: dict[str, StageStats]=field(default_factory=dict)
+    counters: Counter=field(default_factory=Counter)
+    failures: list[dict]=field(default_factory=list)
+
+    def reset(self):
+        with _LOCK:
+            self.solvers.clear()
+            self.stages.clear()
+            self.counters.clear()
+            self.failures.clear()
+
+    def record_solver(self, name: str, iterations: int, evaluations: int, histogram: dict[int, int], failures: int=0, detail: dict|None=None):
+        with _LOCK:
+            solver = self.solvers.setdefault(name, SolverStats())
+            solver.instances += 1
+            solver.evaluations += evaluations
+            solver.iterations += iterations
+            solver.failures += failures
+            solver.histogram.update(histogram)
+            if failures and len(self.failures) < MAX_FAILURES:
+                self.failures.append({'solver': name, **(detail or {})})
+
+    def record_stage(self, name: str, duration: float):
+        with _LOCK:
+            stage = self.stages.setdefault(name, StageStats())
+            stage.calls += 1
+            stage.total += duration
+            stage.max = max(stage.max, duration)
+
+    def merge(self, other: 'Stats'):
+        """
+        Ajoute les mesures d'une autre collecte (par exemple celle d'un processus de calcul en série).
+        """
+        with _LOCK:
+            for name, solver in other.solvers.items():
+                self.solvers.setdefault(name, SolverStats()).merge(solver)
+            for name, stage in other.stages.items():
+                self.stages.setdefault(name, StageStats()).merge(stage)
+            self.counters.update(other.counters)
+            self.failures.extend(other.failures[:MAX_FAILURES - len(self.failures)])
+
+    def summary(self) -> dict:
+        """
+        Mesures sous forme de dictionnaire sérialisable en JSON.
+        """
+        with _LOCK:
+            return {
+                'solvers': {name: solver.summary() for name, solver in sorted(self.solvers.items())},
+                'stages': {name: stage.summary() for name, stage in sorted(self.stages.items())},
+                'counters': dict(sorted(self.counters.items())),
+                'failures': list(self.failures),
+            }
+
+    def __str__(self) -> str:
+        summary = self.summary()
+        result = "Statistiques de calcul:\n"
+        for name, stage in sorted(summary['stages'].items(), key=lambda item: -item[1]['total']):
+            result += f"\t{name:<24} {stage['calls']:>8} appels   {stage['total']:>10.4f} s   (max {stage['max']:.4f} s)\n"
+        for name, solver in summary['solvers'].items():
+            result += (
+                f"\t{name:<24} {solver['instances']:>8} résolutions   {solver['iterations']:>10} itérations   "
+                f"{solver['evaluations']:>10} évaluations   {solver['failures']} échecs\n"
+            )
+        for name, count in summary['counters'].items():
+            result += f"\t{name:<24} {count:>8}\n"
+        return result
+
+
+def enable(statistiques: Stats|None=None) -> Stats:
+    """
+    Active la collecte des mesures dans statistiques (nouvel objet Stats par défaut) pour le contexte courant et la renvoie.
+    """
+    statistiques = Stats() if statistiques is None else statistiques
+    _ACTIVE.set(statistiques)
+    return statistiques
+
+
+def disable() -> Stats|None:
+    """
+    Désactive la collecte pour le contexte courant et renvoie les mesures collectées.
+    """
+    statistiques = _ACTIVE.get()
+    _ACTIVE.set(None)
+    return statistiques
+
+
+def active() -> Stats|None:
+    """
+    Collecte en cours dans le contexte courant (None si l'instrumentation est désactivée).
+    """
+    return _ACTIVE.get()
+
+
+@contextmanager
+def collect(statistiques: Stats|None=None):
+    """
+    Active la collecte le temps d'un bloc de calcul ; la collecte précédente éventuelle est rétablie en sortie.
+    """
+    statistiques = Stats() if statistiques is None else statistiques
+    token = _ACTIVE.set(statistiques)
+    try:
+        yield statistiques
+    finally:
+        _ACTIVE.reset(token)
+
+
+def record_solver(name: str, iterations: int, evaluations: int, histogram: dict[int, int], failures: int=0, detail: dict|None=None):
+    """
+    Enregistre une résolution : appelée une fois en fin de résolution par chaque solveur.
+    """
+    statistiques = _ACTIVE.get()
+    if statistiques is not None:
+        statistiques.record_solver(name, iterations, evaluations, histogram, failures, detail)
+
+
+def count(name: str, n: int=1):
+    """
+    Incrémente le compteur name de n.
+    """
+    statistiques = _ACTIVE.get()
+    if statistiques is not None:
+        with _LOCK:
+            statistiques.counters[name] += n
+
+
+class _Stage:
+
+    def __init__(self, statistiques: Stats, name: str):
+        self.statistiques = statistiques
+        self.name = name
+
+    def __enter__(self):
+        open_stages = getattr(_LOCAL, 'stages', None)
+        if open_stages is None:
+            open_stages = _LOCAL.stages = set()
+        self.nested = self.name in open_stages
+        if not self.nested:
+            open_stages.add(self.name)
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if not self.nested:
+            self.statistiques.record_stage(self.name, time.perf_counter() - self.start)
+            _LOCAL.stages.discard(self.name)
+        return False
+
+
+def stage(name: str):
+    """
+    Contexte mesurant la durée d'une étape de calcul (sans effet si l'instrumentation est désactivée).
+    """
+    statistiques = _ACTIVE.get()
+    if statistiques is None:
+        return _NULL_STAGE
+    return _Stage(statistiques, name)
+
+
+def timed(name: str):
+    """
+    Décorateur mesurant la durée de chaque appel de la fonction comme étape name.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            statistiques = _ACTIVE.get()
+            if statistiques is None:
+                return function(*args, **kwargs)
+            with _Stage(statistiques, name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,71 @@
+import json
+import math
+
+import batch
+import pieu
+import soil
+
+PIEUX = """name,category,level_top,level_bott,Dp,Ds,Eb,thickness,lithology,Q_ELS_QP,Q_ELS_CAR,H,M,situation
+P1,19,0,-5,0.15,0.25,20000,0.1,A,0.02,0.04,0.01,0.0,elu
+P2,19,0,-7,0.15,0.25,20000,,B,0.02,,,,
+P3,19,0,-7,0.15,0.25,20000,,X,,,,,
+"""
+LITHOLOGIES = """lithology,name,level_sup,level_inf,courbe_frottement,pf,pl,Em,alpha,soil_type,log
+A,Argile,0,-1,Q1,0.5,1.0,5.0,0.667,,
+A,Argile,-1,-8,Q2,0.8,1.2,8.0,0.667,fin,
+B,Sable,0,-10,Q2,,,,0.5,,SP1
+"""
+LOGS = {"SP1": {"levels_ngf": [-1, -4, -8], "cb_pf": [0.5, 0.8, 1.0], "cb_pl": [1.0, 1.5, 2.0], "cb_Em": [6, 9, 12]}}
+
+def ecrire_donnees(tmp_path):
+    (tmp_path / 'pieux.csv').write_text(PIEUX)
+    (tmp_path / 'lithologies.csv').write_text(LITHOLOGIES)
+    (tmp_path / 'logs.json').write_text(json.dumps(LOGS))
+    return [str(tmp_path / name) for name in ['pieux.csv', 'lithologies.csv', 'logs.json']]
+
+def test_read_lithologies(tmp_path):
+    pieux, lithologies, logs = ecrire_donnees(tmp_path)
+    lithologies = batch.read_lithologies(lithologies, batch.read_logs(logs))
+    assert [couche.soil_type for couche in lithologies['A']] == ['granulaire', 'fin']
+    sable = lithologies['B'][0]
+    pressio = soil.LogPressio(**LOGS['SP1'])
+    assert math.isclose(sable.pl, pressio.pression_limite_moyenne_ngf(0, -10))
+
+def test_batch_resultats(tmp_path):
+    pieux, lithologies, logs = ecrire_donnees(tmp_path)
+    for workers in [1, 2]:
+        sortie = tmp_path / f'resultats_{workers}.jsonl'
+        statistiques = tmp_path / f'stats_{workers}.json'
+        code = batch.main([
+            pieux, '--lithologies', lithologies, '--logs', logs, '-o', str(sortie), '--workers', str(workers), '--stats', str(statistiques),
+        ])
+        assert code == 1
+        statistiques = json.loads(statistiques.read_text())
+        assert statistiques['solvers']['BatchNewton']['instances'] == 2
+        assert statistiques['stages']['equilibre']['calls'] == 2
+        assert statistiques['counters']['parcours_pieu'] > 0
+        resultats = {resultat['name']: resultat for resultat in map(json.loads, sortie.read_text().splitlines())}
+        assert sorted(resultats) == ['P1', 'P2', 'P3']
+        assert 'Lithologie inconnue' in resultats['P3']['erreur']
+        assert resultats['P2']['dz_ELS_CAR'] is None and resultats['P2']['deflection_max'] is None
+
+        pile = pieu.Pile(19, 0., -5., 20_000, 0.15, 0.25, batch.read_lithologies(lithologies, batch.read_logs(logs))['A'], 0.1)
+        p1 = resultats['P1']
+        assert math.isclose(p1['portance_ELU_Str'], pile.portance_ELU_Str)
+        assert math.isclose(p1['dz_ELS_CAR'], pile.equilibre_Q_top(0.04)[2], rel_tol=1e-6)
+        assert p1['convergence_ELS_CAR'] is True and p1['message_ELS_CAR'] is None
+        assert math.isclose(p1['shear_max'], 0.01, rel_tol=1e-9)
+
+def test_compute_pile_charges_limites(tmp_path):
+    pieux, lithologies, logs = ecrire_donnees(tmp_path)
+    lithologies = batch.read_lithologies(lithologies, batch.read_logs(logs))
+    record = batch.read_records(pieux)[0]
+    resistance = batch.pile_from_record(record, lithologies).resistance_totale
+    # Charge proche du palier (recherche encadrée) et charge supérieure à la résistance totale
+    resultat = batch.compute_pile({**record, 'Q_ELS_QP': 0.999 * resistance, 'Q_ELS_CAR': 1.01 * resistance}, lithologies)
+    pile = batch.pile_from_record(record, lithologies)
+    assert resultat['convergence_ELS_QP'] is True and resultat['message_ELS_QP'] is None
+    assert math.isclose(resultat['dz_ELS_QP'], pile.equilibre_Q_top(0.999 * resistance)[2], rel_tol=1e-6)
+    assert resultat['convergence_ELS_CAR'] is False and resultat['dz_ELS_CAR'] is None
+    assert resultat['message_ELS_CAR'] == "La racine n'est pas encadrée : f(a) et f(b) sont de même signe"
+    assert resultat['erreur'] is None
@@ -0,0 +1,100 @@
+import math
+
+import numpy as np
+
+import lateral
+import pieu
+import soil
+import utils
+
+sol_1 = soil.Soil("Argile", 0.0, -1.0, 'Q1', 0.5, 1., 5., 2/3)
+sol_2 = soil.Soil("Argile", -1.0, -8.0, 'Q2', 0.8, 1.2, 8., 2/3, 'fin')
+pile = pieu.Pile(19, 0., -5.0, 20_000, 0.15, 0.25, [sol_1, sol_2], 0.30)
+
+def test_equilibre_horizontal():
+    resultats = pile.lateral_analysis(0.01, 0.02)
+    assert math.isclose(resultats.soil_reaction.sum(), 0.01)
+    assert math.isclose(resultats.moment[0], 0.02)
+    assert math.isclose(resultats.shear[0], 0.01)
+
+def test_banded_vs_pynite():
+    banded = pile.lateral_analysis(0.01, 0.02, 'elu')
+    pynite = pile.lateral_analysis(0.01, 0.02, 'elu', backend='pynite')
+    for name in ['deflection', 'rotation', 'moment', 'shear']:
+        assert np.allclose(getattr(banded, name), getattr(pynite, name), rtol=1e-9, atol=1e-12)
+
+def test_assemble_banded():
+    levels = np.array([0., -1., -3.])
+    ab = lateral.assemble_banded(levels, 2., np.array([0., 5., 0.]))
+    assert math.isclose(ab[3, 0], 24.)
+    assert math.isclose(ab[3, 2], 24. + 3. + 5.)
+    assert math.isclose(ab[2, 1], 12.)
+
+def test_nonlinear_petit_chargement():
+    lineaire = pile.lateral_analysis(1e-4, 0., 'elu')
+    non_lineaire = pile.lateral_analysis_nonlinear(1e-4, 0., 'elu')
+    assert non_lineaire.convergence
+    assert np.allclose(lineaire.deflection, non_lineaire.deflection)
+
+def test_nonlinear_paliers():
+    q1, k1, q2, k2 = pile.mesh.lateral_laws(pile.lithology, 0.25, 'elu')
+    for methode in ['tangent', 'secant']:
+        resultats = pile.lateral_analysis_nonlinear(0.04, 0., 'elu', nb_pas=4, methode=methode)
+        assert resultats.convergence
+        assert math.isclose(resultats.soil_reaction.sum(), 0.04, rel_tol=1e-5)
+        assert np.all(np.abs(resultats.soil_reaction[1:-1]) <= q2 * (1 + 1e-9))
+    assert not pile.lateral_analysis_nonlinear(10., 0., 'elu').convergence
+
+def test_horizontal_soil_pressure_spring():
+    slice = pile.slices[5]
+    q1, k1, q2, k2 = pile.mesh.lateral_laws(pile.lithology, 0.25, 'elu')
+    assert math.isclose(slice.horizontal_soil_pressure_spring(1e-6, 0.25, 'elu'), k1[5] * 1e-6)
+    assert math.isclose(slice.horizontal_soil_pressure_spring(-1., 0.25, 'elu'), -q2[5])
+    assert math.isclose(slice.horizontal_soil_pressure_spring(1., 0.25, 'long terme'), q1[5])
+
+def test_hermite_curves():
+    levels, EI, springs = pile.lateral_model_data('elu')
+    resultats = pile.lateral_analysis(0.01, 0.02, 'elu')
+    z, moment, shear, deflection = resultats.curves(EI)
+    assert np.allclose(z, resultats.levels)
+    assert np.allclose(moment, resultats.moment, atol=1e-12)
+    assert np.allclose(shear[:-1], resultats.shear[:-1], atol=1e-12)
+    assert np.allclose(deflection, resultats.deflection, atol=1e-15)
+    z, moment, shear, deflection = resultats.curves(EI, step=0.01)
+    assert len(z) == 501
+    assert math.isclose(z[-1], -5.0)
+
+def test_model_curves_vs_pynite():
+    fe_model = pile.get_fe_model(0.01, 0.02, 'elu')
+    fe_model.analyze_linear()
+    member = fe_model.Members['pile']
+    z, moment, shear, deflection = utils.get_model_curves(fe_model, 0., step=0.1)
+    for idx in [0, 13, 27, 50]:
+        x = z[0] - z[idx]
+        assert math.isclose(moment[idx], member.moment('Mz', x, 'Combo 1'), abs_tol=1e-12)
+        assert math.isclose(shear[idx], member.shear('Fy', x, 'Combo 1'), abs_tol=1e-12)
+        assert math.isclose(deflection[idx], member.deflection('dy', x, 'Combo 1'), abs_tol=1e-15)
+
+def test_lateral_model_multi_cas():
+    H = np.array([0.01, -0.02, 0., 0.03])
+    M = np.array([0.02, 0., 0.01, -0.01])
+    model = pile.lateral_model('elu')
+    assert pile.lateral_model('elu') is model
+    resultats = model.solve(H, M)
+    assert resultats.deflection.shape == (4, len(model.levels))
+    for idx in range(4):
+        unitaire = pile.lateral_analysis(H[idx], M[idx], 'elu')
+        for name in ['deflection', 'rotation', 'moment', 'shear', 'soil_reaction']:
+            assert np.allclose(getattr(resultats, name)[idx], getattr(unitaire, name), atol=1e-15)
+    assert np.allclose(resultats.soil_reaction.sum(axis=1), H)
+    z, moment, shear, deflection = resultats.curves(model.EI, step=0.1)
+    assert moment.shape == (4, len(z))
+
+def test_lateral_analysis_torseurs():
+    torseurs = [
+        pieu.Torseur(0.01, 0.005, 0.2, 0.003, 0.02, 'Durable', 'ELU'),
+        pieu.Torseur(-0.01, 0., 0.1, 0., 0., 'Durable', 'ELS_QP'),
+    ]
+    resultats = pile.lateral_analysis_torseurs(torseurs, 'elu', direction='y')
+    assert np.allclose(resultats.moment[:, 0], [0.003, 0.])
+    assert np.allclose(resultats.shear[:, 0], [0.005, 0.])
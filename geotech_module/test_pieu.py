@@ -1,4 +1,8 @@
 import math
+from dataclasses import replace
+
+import numpy as np
+import pytest
 
 import pieu
 import soil
@@ -72,3 +76,332 @@ def test_ksi_a():
 
 def test_ksi_b():
     assert math.isclose(troncon.ksi_b, 2.77777777778e-6)
+
+
+sol_2 = soil.Soil("Argile", -1.0, -8.0, 'Q2', 0.8, 1.2, 8., 2/3, 'fin')
+pile = pieu.Pile(19, 0., -5.0, 20_000, 0.15, 0.25, [sol_1, sol_2], 0.30)
+
+def test_horizontal_soil_pressure_spring():
+    # Valeurs de référence pour B = 0.25 m (kf = 18.6337 MPa/m, q(pf) = 0.0125 MN, q(pl) = 0.025 MN pour delta_h = 0.1 m) :
+    # pente initiale delta_h * kf * coeff_1 (y compris à l'ELU), loi antisymétrique en dy
+    valeurs = {
+        'court terme': [0.0001863370580106856, 0.0018633705801068558, 0.0125, 0.0125],
+        'long terme': [9.31685290053428e-05, 0.0009316852900534279, 0.00931685290053428, 0.0125],
+        'ELU': [0.0001863370580106856, 0.0018633705801068558, 0.01556685290053428, 0.025],
+        'sismique': [0.0005590111740320568, 0.005590111740320568, 0.025, 0.025],
+    }
+    for situation, attendues in valeurs.items():
+        for dy, attendue in zip([1e-4, 1e-3, 1e-2, 5e-2], attendues):
+            assert math.isclose(troncon.horizontal_soil_pressure_spring(dy, 0.25, situation), attendue, rel_tol=1e-12)
+            assert math.isclose(troncon.horizontal_soil_pressure_spring(-dy, 0.25, situation), -attendue, rel_tol=1e-12)
+        assert troncon.horizontal_soil_pressure_spring(0., 0.25, situation) == 0.
+        # Pente à l'origine égale au ressort linéaire de la situation
+        assert math.isclose(attendues[0] / 1e-4, troncon.linear_spring(0.25, situation))
+
+def test_slice_equilibre_newton():
+    # Tronçon de 20 m : ksi_b * kt > 1, l'équilibre est recherché par Newton-Raphson
+    sol_long = soil.Soil("Argile", 0.0, -30.0, 'Q1', 0.5, 1., 5., 2/3)
+    troncon_long = pieu.SlicePile(z_top=0., delta_h=20., soil=sol_long, data_pieu=data_pieu)
+    troncon_long.set_Q_bott(0.5)
+    troncon_long.set_dz_bott(0.01)
+    assert troncon_long.ksi_b * troncon_long.module_kt > 1
+    troncon_long.equilibre(0.01)
+    assert isinstance(troncon_long.dz_middle, float)
+    assert math.isclose(troncon_long.fonction_F(troncon_long.dz_middle), 0., abs_tol=1e-9)
+
+def loi_indefinie(s, qs, kt):
+    return math.nan
+
+def test_equilibre_newton_echec():
+    troncon_nan = pieu.SlicePile(z_top=0., delta_h=0.1, soil=sol_1, data_pieu={**data_pieu, 'skin_friction_law': loi_indefinie})
+    troncon_nan.set_Q_bott(0.5)
+    troncon_nan.set_dz_bott(0.01)
+    with pytest.raises(ValueError):
+        troncon_nan.equilibre(0.01)
+    pile_nan = pieu.Pile(19, 0., -5.0, 20_000, 0.15, 0.25, [sol_1, sol_2], 0.30, skin_friction_law=loi_indefinie)
+    with pytest.raises(ValueError):
+        pile_nan.equilibre_dz_pointe(0.002)
+
+def test_mesh_slices():
+    assert pile.mesh.n_slices == 4 + 14
+    assert math.isclose(pile.mesh.delta_h.sum(), 5.0)
+    assert list(pile.mesh.soil_index[:4]) == [0, 0, 0, 0]
+    assert math.isclose(pile.mesh.z_bottom[-1], -5.0, abs_tol=1e-12)
+
+def test_mesh_slice_views():
+    Rs = sum(slice.perimetre * slice.qs_lim * slice.delta_h for slice in pile.slices)
+    assert math.isclose(pile.resistance_skin_friction, Rs)
+    assert pile.slices[5].soil is sol_2
+
+def test_equilibre_dz_pointe_slices():
+    q_top, dz_pointe, dz_top, slices = pile.equilibre_dz_pointe(0.002)
+    assert math.isclose(q_top, slices[0].Q_top)
+    assert math.isclose(dz_top, slices[0].dz_top)
+    assert slices[-1].dz_bott == dz_pointe
+
+def test_slice_solver_exact_vs_newton():
+    pile_newton = pieu.Pile(19, 0., -5.0, 20_000, 0.15, 0.25, [sol_1, sol_2], 0.30, slice_solver='newton')
+    for dz_pointe in [0.0005, 0.002, 0.02]:
+        assert math.isclose(pile.fonction_effort_en_tete(dz_pointe), pile_newton.fonction_effort_en_tete(dz_pointe), rel_tol=1e-6)
+
+def test_fonction_effort_en_tete_derivee():
+    h = 1e-7
+    for dz_pointe in [0.0005, 0.002]:
+        q_top, dq_top = pile.fonction_effort_en_tete_derivee(dz_pointe)
+        dq_fd = (pile.fonction_effort_en_tete(dz_pointe + h) - pile.fonction_effort_en_tete(dz_pointe - h)) / (2 * h)
+        assert math.isclose(dq_top, dq_fd, rel_tol=1e-5)
+
+def test_settlement_curve_deplacement():
+    dz_force, efforts_force = pile.settlement_curve(nb_pas=10)
+    dz_depl, efforts_depl = pile.settlement_curve(nb_pas=10, methode='deplacement', nb_points=41)
+    assert len(efforts_depl) == len(efforts_force)
+    # le dernier pas (Qmax = Rtot - 0.0001) est sur le palier : seuls les pas précédents sont comparés
+    for dz_1, dz_2 in zip(dz_force[:-1], dz_depl[:-1]):
+        assert math.isclose(dz_1, dz_2, rel_tol=0.02)
+
+def test_courbe_deplacement_impose():
+    dz_pointe, Q_top, dz_top = pile.courbe_deplacement_impose(nb_points=11)
+    assert len(Q_top) == 11
+    assert all(Q_top[1:] >= Q_top[:-1])
+    assert math.isclose(Q_top[-1], pile.resistance_totale)
+
+def test_courbe_deplacement_impose_pieu_long():
+    # Pieu long : l'effort en tête pour dz_max / 10 000 dépasse déjà les premiers pas de chargement ;
+    # dz_min est réduit pour que le premier point du parcours reste sous Qmax / nb_points
+    sol_3 = soil.Soil("Argile", -1.0, -40.0, 'Q2', 0.8, 1.2, 8., 2/3, 'fin')
+    pile_long = pieu.Pile(19, 0., -30.0, 20_000, 0.15, 0.25, [sol_1, sol_3], 0.30)
+    Qmax = pile_long.resistance_totale - 0.0001
+    dz_pointe, Q_top, dz_top = pile_long.courbe_deplacement_impose(nb_points=21)
+    assert pile_long.fonction_effort_en_tete(dz_pointe[-1] / 10_000) > Qmax / 21
+    assert dz_pointe[1] < dz_pointe[-1] / 10_000
+    assert Q_top[1] <= Qmax / 21
+    assert pile_long.message_equilibre is None
+    # Les premiers pas ne sont donc pas interpolés depuis l'origine
+    dz_force, efforts_force = pile_long.settlement_curve(nb_pas=10, continuation=False)
+    dz_depl, efforts_depl = pile_long.settlement_curve(nb_pas=10, methode='deplacement', nb_points=41)
+    for dz_1, dz_2 in zip(dz_force[:3], dz_depl[:3]):
+        assert math.isclose(dz_1, dz_2, rel_tol=0.02)
+
+def test_courbe_deplacement_impose_dz_min_limite():
+    # Premier pas inférieur à l'effort du plus petit dz_min admis : le parcours est renvoyé et la cause est conservée
+    dz_pointe, Q_top, dz_top = pile.courbe_deplacement_impose(Qmax=1e-15, nb_points=11, dz_max=0.01)
+    assert math.isclose(dz_pointe[1], 0.01 / 10_000 / 10**pieu.NB_DIVISIONS_DZ_MIN)
+    assert Q_top[1] > 1e-15 / 11
+    assert pile.message_equilibre.startswith("Parcours en déplacement imposé")
+
+def test_settlement_curve_continuation():
+    dz_cold, efforts_cold = pile.settlement_curve(nb_pas=10, continuation=False)
+    dz_warm, efforts_warm = pile.settlement_curve(nb_pas=10, continuation=True)
+    assert len(dz_cold) == len(dz_warm)
+    for dz_1, dz_2 in zip(dz_cold[:-1], dz_warm[:-1]):
+        assert math.isclose(dz_1, dz_2, rel_tol=1e-3)
+
+def test_settlement_curve_tassement_tete():
+    # Le tassement de la courbe est celui de la tête du pieu (et non celui du sommet de la troisième tranche)
+    dz_acc, efforts_acc = pile.settlement_curve(nb_pas=5)
+    assert (dz_acc, efforts_acc) == pile.settlement_curve(nb_pas=5, continuation=True)
+    for dz, effort in zip(dz_acc[:-1], efforts_acc[:-1]):
+        q_top, dz_pointe, dz_top, slices = pile.equilibre_Q_top(effort)
+        assert math.isclose(dz, dz_top, rel_tol=1e-4)
+        assert math.isclose(dz_top, slices[0].dz_top)
+        assert dz_top > slices[2].dz_top
+
+def test_equilibre_Q_top_dz_pointe_initial():
+    equilibre = pile.equilibre_Q_top(0.2)
+    equilibre_warm = pile.equilibre_Q_top(0.2, dz_pointe_initial=equilibre[1], warm_start=True)
+    assert math.isclose(equilibre[0], equilibre_warm[0], rel_tol=1e-4)
+
+def test_effort_en_tete_batch():
+    dz_pointe = np.array([0.0003, 0.002, 0.01])
+    Q_top, dz_top, dQ_top = pile.effort_en_tete_batch(dz_pointe)
+    for i, dz in enumerate(dz_pointe):
+        assert np.allclose((Q_top[i], dz_top[i], dQ_top[i]), pile._equilibre_maillage(dz))
+
+def test_effort_pointe():
+    dz_pointe = np.array([0.0003, 0.002, 0.01])
+    qb = pile.kp_util * pile.ple_etoile
+    assert np.allclose(pile.effort_pointe(dz_pointe), [pile.effort_pointe(dz) for dz in dz_pointe])
+    assert np.allclose(pile.raideur_pointe(dz_pointe), [pile.raideur_pointe(dz) for dz in dz_pointe])
+    # Palier atteint : effort limite en pointe, raideur nulle
+    assert math.isclose(pile.effort_pointe(1.), pile.section_pointe * qb)
+    assert pile.raideur_pointe(1.) == 0.
+    # L'effort en tête cumule l'effort en pointe et le frottement mobilisé
+    q_top, dz_top, dq_top = pile._equilibre_maillage(0.002)
+    assert q_top >= pile.effort_pointe(0.002) and dq_top >= pile.raideur_pointe(0.002)
+
+def test_equilibre_Q_top_batch():
+    q_top = np.array([0.05, 0.2, 10.])
+    dz_pointe, dz_top, convergence = pile.equilibre_Q_top_batch(q_top)
+    assert list(convergence) == [True, True, False]
+    for i in range(2):
+        assert math.isclose(dz_top[i], pile.equilibre_Q_top(q_top[i])[2], rel_tol=1e-6)
+
+def test_equilibre_Q_top_limite():
+    equilibre = pile.equilibre_Q_top(0.999 * pile.resistance_totale)
+    assert math.isclose(equilibre[0], 0.999 * pile.resistance_totale, rel_tol=1e-4)
+    assert pile.equilibre_Q_top(1.01 * pile.resistance_totale) is None
+    assert pile.message_equilibre is not None
+
+def loi_hyperbolique(s, qs, kt):
+    # Loi de mobilisation sans palier : tau = 3/4 qs seulement pour s = 3 qs / kt
+    s = max(s, 0.)
+    return qs * kt * s / (qs + kt * s) if qs > 0. else 0.
+
+def test_equilibre_Q_top_loi_sans_palier():
+    pile_hyperbolique = pieu.Pile(19, 0., -5.0, 20_000, 0.15, 0.25, [sol_1, sol_2], 0.30, skin_friction_law=loi_hyperbolique)
+    q_limite = pile_hyperbolique.fonction_effort_en_tete(pile_hyperbolique.dz_pointe_limite())
+    assert q_limite < 0.95 * pile_hyperbolique.resistance_totale
+    q_top = (q_limite + 0.95 * pile_hyperbolique.resistance_totale) / 2
+    equilibre = pile_hyperbolique.equilibre_Q_top(q_top)
+    assert equilibre is not None
+    assert math.isclose(equilibre[0], q_top, rel_tol=1e-4)
+    assert equilibre[1] > pile_hyperbolique.dz_pointe_limite()
+
+def test_cache_invalidation():
+    sol_a = soil.Soil("Remblais", 0.0, -1.0, 'Q1', 0.0, 0.0, 5., 2/3, 'fin')
+    sol_b = soil.Soil("Argile", -1.0, -8.0, 'Q2', 0.8, 1.2, 8., 2/3, 'fin')
+    pile_cache = pieu.Pile(19, 0., -5.0, 20_000, 0.15, 0.25, [sol_a, sol_b], 0.30)
+    mesh = pile_cache.mesh
+    resistance = pile_cache.resistance_totale
+    assert pile_cache.mesh is mesh
+    assert pile_cache.resistance_totale == resistance
+    pile_cache.level_bott = -6.0
+    assert pile_cache.mesh is not mesh
+    assert math.isclose(pile_cache.mesh.delta_h.sum(), 6.0)
+    resistance_6 = pile_cache.resistance_totale
+    assert resistance_6 > resistance
+    sol_b.pl = 2.4
+    assert pile_cache.resistance_totale > resistance_6
+    # Les attributs hors paramètres (message_equilibre) n'invalident pas le cache
+    mesh = pile_cache.mesh
+    pile_cache.equilibre_Q_top(0.1)
+    assert pile_cache.mesh is mesh
+    # Remplacement d'une couche dans la lithologie, y compris par une copie modifiée
+    resistance_24 = pile_cache.resistance_totale
+    pile_cache.lithology[1] = replace(sol_b, pl=1.2)
+    assert pile_cache.mesh is not mesh
+    assert math.isclose(pile_cache.resistance_totale, resistance_6)
+    pile_cache.lithology[1] = sol_b
+    assert math.isclose(pile_cache.resistance_totale, resistance_24)
+
+def test_situation_invalide():
+    # Même erreur pour une tranche isolée et pour le maillage du pieu
+    message = "Erreur dans la définition de la situation"
+    lithology = pile.lithology
+    for appel in [
+        lambda: troncon.horizontal_soil_pressure_spring(1e-3, 0.25, 'accidentel'),
+        lambda: troncon.linear_spring(0.25, 'accidentel'),
+        lambda: pile.mesh.lateral_laws(lithology, 0.25, 'accidentel'),
+        lambda: pile.mesh.linear_springs(lithology, 0.25, 'accidentel'),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            appel()
+
+def test_lateral_model_situation():
+    pile_laterale = pieu.Pile(19, 0., -5.0, 20_000, 0.15, 0.25, [sol_1, sol_2], 0.30)
+    model = pile_laterale.lateral_model('ELU')
+    assert pile_laterale.lateral_model('elu') is model
+    assert pile_laterale.lateral_model('Elu') is model
+    assert pile_laterale.lateral_model('court terme') is not model
+    assert len([key for key in pile_laterale.valid_cache() if key[0] == 'lateral_model']) == 2
+
+def test_check_stratigraphy():
+    assert pile.check_stratigraphy()
+    assert pile.get_soil_from_level(-1.0) is sol_1
+    assert pile.soils_at_levels(np.array([-0.5, -3.0])) == [sol_1, sol_2]
+
+def test_ple_etoile_profil():
+    levels = np.array([-3.0, -5.0, -7.0])
+    profil = pile.ple_etoile_profil(levels)
+    assert math.isclose(profil[1], pile.ple_etoile)
+    assert profil[2] == 0.
+
+def test_capacity_profile():
+    levels = np.array([-2.0, -3.5, -5.0])
+    profil = pile.capacity_profile(levels)
+    for i, level in enumerate(levels):
+        pile_level = pieu.Pile(19, 0., level, 20_000, 0.15, 0.25, [sol_1, sol_2], 0.30)
+        assert math.isclose(profil.resistance_skin_friction[i], pile_level.resistance_skin_friction)
+        assert math.isclose(profil.resistance_pointe[i], pile_level.resistance_pointe)
+        assert math.isclose(profil.portance_ELS_QP[i], pile_level.portance_ELS_QP)
+        assert math.isclose(profil.traction_ELU_Str[i], pile_level.traction_ELU_Str)
+
+def test_niveau_pointe_minimal():
+    charges = {'ELU': 0.05, 'ELA': -0.02}
+    level = pile.niveau_pointe_minimal(charges, tolerance=0.005)
+    assert pieu.Pile(19, 0., level, 20_000, 0.15, 0.25, [sol_1, sol_2], 0.30).verification_charges(pile.charges_axiales(charges))
+    assert not pieu.Pile(19, 0., level + 0.01, 20_000, 0.15, 0.25, [sol_1, sol_2], 0.30).verification_charges(pile.charges_axiales(charges))
+    assert pile.niveau_pointe_minimal({'ELU': 100.}) is None
+
+def test_dimensionnement():
+    torseurs = [pieu.Torseur(0., 0., 0.50, 0., 0., 'Durable', 'ELU')]
+    pile_dim = pile.dimensionnement(torseurs, diametres=[0.25, 0.40, 0.60])
+    assert pile_dim.Ds == 0.40
+    assert pile_dim.portance_ELU_Str >= 0.50
+
+def test_verification_torseurs():
+    torseurs = [
+        pieu.Torseur(0., 0., 0.02, 0., 0., 'Durable', 'ELS_QP'),
+        pieu.Torseur(0., 0., 0.05, 0., 0., 'Durable', 'ELU'),
+        pieu.Torseur(0., 0., -0.01, 0., 0., 'Transitoire', 'elu'),
+        pieu.Torseur(0., 0., 100., 0., 0., 'Accidentelle', 'ELA'),
+        pieu.Torseur(0., 0., 0.01, 0., 0., 'Accidentelle', 'ELU'),
+    ]
+    resultats = pile.verification_torseurs(torseurs)
+    assert list(resultats.valide) == [True, True, True, True, False]
+    assert math.isclose(resultats.taux[0], 0.02 / pile.portance_ELS_QP)
+    assert math.isclose(resultats.taux[2], -0.01 / pile.traction_ELU_Str)
+    assert list(resultats.verification) == [
+        0.02 <= pile.portance_ELS_QP, 0.05 <= pile.portance_ELU_Str, -0.01 >= pile.traction_ELU_Str, False, False,
+    ]
+    assert not resultats.verification_globale
+    dimensionnantes = resultats.combinaisons_dimensionnantes()
+    assert dimensionnantes['ELA'] == 3
+    assert dimensionnantes['ELS_CAR'] is None
+    assert dimensionnantes['ELU'] == int(np.argmax(resultats.taux[1:3])) + 1
+    table = pieu.TableTorseurs.from_torseurs(torseurs)
+    assert np.array_equal(pile.verification_torseurs(table).taux, resultats.taux, equal_nan=True)
+
+def test_settlement_curve_progression_arret():
+    avancement = []
+    dz, efforts = pile.settlement_curve(nb_pas=10, progression=avancement.append)
+    assert len(avancement) == 11
+    assert math.isclose(avancement[-1], 1.)
+    assert all(a < b for a, b in zip(avancement, avancement[1:]))
+    dz_arret, efforts_arret = pile.settlement_curve(nb_pas=10, arret=lambda: len(avancement) >= 14, progression=avancement.append)
+    assert efforts_arret == efforts[:3]
+    avancement = []
+    pile.settlement_curve(nb_pas=10, methode='deplacement', progression=avancement.append)
+    assert avancement == [1.]
+    assert pile.settlement_curve(nb_pas=10, methode='deplacement', arret=lambda: True) == ([], [])
+
+def test_maillage_adaptatif():
+    sol_3 = soil.Soil("Sable", -8.0, -20.0, 'Q3', 1.5, 2.5, 25., 1/3)
+    # Référence : maillage uniforme de 1 cm
+    reference = pieu.Pile(19, 0., -14.0, 20_000, 0.15, 0.25, [sol_1, sol_2, sol_3], 0.01)
+    adaptatif = replace(reference, thickness=1.0, mesh_tolerance=1e-4)
+    mesh = adaptatif.mesh
+    assert math.isclose(mesh.delta_h.sum(), 14.)
+    assert np.allclose(mesh.z_top[1:], mesh.z_bottom[:-1])
+    assert mesh.delta_h.min() >= pieu.EPAISSEUR_MIN and mesh.delta_h.max() <= 1. + pieu.EPAISSEUR_MIN
+    # Les tranches ne chevauchent pas les interfaces des couches
+    for niveau in [-1., -8.]:
+        assert np.isclose(mesh.z_top, niveau).any()
+    assert mesh.n_slices < reference.mesh.n_slices / 4
+    assert math.isclose(adaptatif.resistance_totale, reference.resistance_totale)
+
+    dz_pointe = reference.dz_pointe_limite() * np.array([0.01, 0.1, 0.5])
+    Q_top, dz_top, _ = reference.effort_en_tete_batch(dz_pointe)
+    Q_adaptatif, dz_adaptatif, _ = adaptatif.effort_en_tete_batch(dz_pointe)
+    assert np.allclose(Q_adaptatif, Q_top, rtol=5e-4)
+    assert np.allclose(dz_adaptatif, dz_top, rtol=5e-4)
+    deflection = reference.lateral_analysis(0.01, 0., 'elu').deflection[0]
+    assert math.isclose(adaptatif.lateral_analysis(0.01, 0., 'elu').deflection[0], deflection, rel_tol=5e-4)
+
+def test_modification_courbe_frottement():
+    sol = soil.Soil("Argile", 0.0, -8.0, 'Q2', 0.8, 1.2, 8., 2/3, 'fin')
+    pile_q2 = pieu.Pile(19, 0., -5.0, 20_000, 0.15, 0.25, [sol], 0.30)
+    resistance_q2 = pile_q2.resistance_skin_friction
+    sol.courbe_frottement = 'Q4'
+    pile_q4 = pieu.Pile(19, 0., -5.0, 20_000, 0.15, 0.25, [soil.Soil("Argile", 0.0, -8.0, 'Q4', 0.8, 1.2, 8., 2/3, 'fin')], 0.30)
+    assert pile_q2.resistance_skin_friction == pile_q4.resistance_skin_friction != resistance_q2
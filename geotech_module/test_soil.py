@@ -1,4 +1,8 @@
 import math
+
+import numpy as np
+import pytest
+
 import soil
 
 courbe_x = [0, 2, 4, 6, 8, 10]
@@ -82,3 +86,65 @@ def test_module_kf():
     assert math.isclose(round(sol_2.module_kf(0.80), 2), 32.14)
     assert math.isclose(round(sol_3.module_kf(0.80), 2), 24.11)
     assert math.isclose(round(sol_4.module_kf(0.80), 2), 40.18)
+
+def test_compiled_tables():
+    for key, row in soil.TAB_F523.items():
+        for j, courbe in enumerate(soil.COURBES):
+            if row[courbe] == '-':
+                assert np.isnan(soil.ARR_F523[int(key), j])
+            else:
+                assert soil.ARR_F523[int(key), j] == row[courbe]
+
+def test_vectorised_accessors():
+    assert np.allclose(sol_3.alpha_pieu_sol(np.array([1, 19])), [1.8, 2.4])
+    assert np.allclose(sol_2.frottement_maxi(np.array([5, 17, 19])), [0., 0., 0.380])
+    assert math.isnan(sol_2.frottement_limite(17))
+    assert np.allclose(sol_2.fsol(np.array([sol_2.pl, sol_3.pl])), [sol_2.fonction_fsol, soil.Soil("x", 0., -1., 'Q2', 0.6, 0.8, 6., 2/3).fonction_fsol])
+
+def test_lithology_index():
+    index = soil.LithologyIndex([sol_1, sol_2, sol_3, sol_4])
+    assert index.soil_at_level(-0.5) is sol_1
+    assert index.soil_at_level(-1.0) is sol_1
+    assert index.soil_at_level(-25.0) is None
+    assert list(index.indices_at_levels(np.array([0.5, -0.5, -8.0, -15.0]))) == [-1, 0, 1, 3]
+    assert index.soils_at_levels(np.array([-2.0, -10.0])) == [sol_2, sol_3]
+    assert index.errors() == []
+
+def test_lithology_index_errors():
+    sol_gap = soil.Soil("Marnes", -21.0, -25.0, 'Q4', 1.3, 1.8, 10, 2/3, 'granulaire')
+    sol_overlap = soil.Soil("Sables", -7.0, -9.0, 'Q3', 0.6, 0.8, 6., 2/3, 'granulaire')
+    assert len(soil.LithologyIndex([sol_1, sol_2, sol_3, sol_4, sol_gap]).errors()) == 1
+    assert "Lacune" in soil.LithologyIndex([sol_1, sol_2, sol_3, sol_4, sol_gap]).errors()[0]
+    assert "Chevauchement" in soil.LithologyIndex([sol_1, sol_2, sol_overlap]).errors()[0]
+
+def test_log_pressio_moyennes():
+    assert math.isclose(soil.SP2.pression_limite_moyenne_ngf(95, 85), soil.mean_value(soil.SP2.depths, soil.SP2.cb_pl, 2, 12))
+    z1 = np.array([0., 1., 2.5])
+    z2 = np.array([3., 7.3, 16.])
+    moyennes = soil.SP2.module_pressio_moyen_z(z1, z2)
+    for i in range(3):
+        assert math.isclose(moyennes[i], soil.mean_value(soil.SP2.depths, soil.SP2.cb_Em, z1[i], z2[i]))
+
+def test_modification_courbe_frottement():
+    sol = soil.Soil("Argile", -1.0, -8.0, 'Q2', 0.8, 1.2, 8., 2/3, 'fin')
+    sol.courbe_frottement = 'Q4'
+    reference = soil.Soil("Argile", -1.0, -8.0, 'Q4', 0.8, 1.2, 8., 2/3, 'fin')
+    assert sol.frottement_limite(19) == reference.frottement_limite(19)
+    assert sol.kp_max(1) == reference.kp_max(1)
+    assert sol._courbe == soil.COURBES.index('Q4')
+    sol.courbe_frottement = 'Q7'
+    with pytest.raises(KeyError):
+        sol._courbe
+
+def test_modification_log_pressio():
+    log = soil.LogPressio([100., 95., 90.], [0.5, 0.6, 0.7], [1.0, 1.2, 1.4], [5., 6., 7.])
+    assert math.isclose(log.pression_limite_moyenne_ngf(100, 90), 1.2)
+    log.cb_pl = [1.0, 1.2, 2.0]
+    assert math.isclose(log.pression_limite_moyenne_ngf(100, 90), (1.1 + 1.6) / 2)
+    log.levels_ngf = [101., 96., 91.]
+    assert log.top_level == 101. and log.depths == [0., 5., 10.]
+    assert math.isclose(log.pression_limite_moyenne_ngf(101, 91), (1.1 + 1.6) / 2)
+    # Modification en place d'une liste : recalcul explicite
+    log.cb_pl[0] = 2.0
+    log.clear_cache()
+    assert math.isclose(log.pression_limite_moyenne_ngf(101, 91), (1.6 + 1.6) / 2)
@@ -1,7 +1,9 @@
 import math
 
-from solver import NewtonRaphson11
-from solver_2 import NewtonRaphson22
+import numpy as np
+import pytest
+
+from solver import NewtonRaphson11, BatchNewton, BracketedSolver11
 
 
 def fonction_11(x):
@@ -16,6 +18,126 @@ def test_newton_raphson_11():
     assert math.isclose(root_11, 5.)
 
 def test_newton_raphson_22():
+    # Le module solver_2 (Newton-Raphson 2 x 2) n'est pas livré avec le module : le test est ignoré en son absence
+    NewtonRaphson22 = pytest.importorskip('solver_2').NewtonRaphson22
     root_22 = NewtonRaphson22(fonction_22, [3, 1]).final_roots
     assert math.isclose(root_22[0], 5.)
     assert math.isclose(root_22[1], 0.75)
+
+def fonction_carre(x):
+    return x**2, 2 * x
+
+def test_newton_raphson_11_derivative():
+    solver = NewtonRaphson11(lambda x: x**2, [4.], [1.], derivative=lambda x: 2 * x)
+    assert math.isclose(solver.final_roots, 2.)
+
+def test_newton_raphson_11_value_and_derivative():
+    solver = NewtonRaphson11(fonction_carre, [4.], [1.], value_and_derivative=True)
+    assert math.isclose(solver.final_roots, 2.)
+    assert solver.number_of_iterations <= 6
+
+def test_newton_raphson_11_max_iterations():
+    solver = NewtonRaphson11(fonction_carre, [4.], [1.], value_and_derivative=True, max_iterations=2)
+    assert not solver.convergence
+    assert solver.number_of_iterations == 2
+
+def test_newton_raphson_11_echec():
+    # Pas de racine réelle : la racine et la valeur finales valent [0.0]
+    solver = NewtonRaphson11(lambda x: x**2 + 1, [0.], [1.], derivative=lambda x: 2 * x)
+    assert not solver.convergence
+    assert solver.final_roots == [0.0] and solver.final_targets == [0.0]
+    assert str(solver) == "Aucune solution trouvée !\n"
+
+def test_newton_raphson_11_damping():
+    solver = NewtonRaphson11(fonction_carre, [4.], [1.], value_and_derivative=True, damping=0.5)
+    assert math.isclose(solver.final_roots, 2., rel_tol=1e-4)
+    with pytest.raises(ValueError):
+        NewtonRaphson11(fonction_carre, [4.], [1.], value_and_derivative=True, damping=0.)
+
+def test_batch_newton():
+    solver = BatchNewton(fonction_carre, [4., 9., 0.25, -1.], [1., 1., 1., 1.], value_and_derivative=True)
+    assert list(solver.convergence) == [True, True, True, False]
+    assert np.allclose(solver.final_roots[:3], [2., 3., 0.5])
+    assert np.isnan(solver.final_roots[3])
+
+def test_batch_newton_derivees():
+    cibles = np.array([4., 9., 0.25])
+    differences_finies = BatchNewton(lambda x: x**2, cibles, 1.)
+    derivee = BatchNewton(lambda x: x**2, cibles, 1., derivative=lambda x: 2 * x)
+    for solver in [differences_finies, derivee]:
+        assert solver.convergence.all()
+        assert np.allclose(solver.final_roots, [2., 3., 0.5])
+        assert (abs(solver.final_targets - cibles) <= solver.tolerance_values).all()
+    # Une équation convergée n'est plus itérée : même nombre d'itérations qu'avec NewtonRaphson11, équation par équation
+    cibles = np.array([1., 4., 100.])
+    solver = BatchNewton(lambda x: x**2, cibles, 1., derivative=lambda x: 2 * x)
+    assert list(solver.number_of_iterations) == [
+        NewtonRaphson11(lambda x: x**2, [cible], [1.], derivative=lambda x: 2 * x).number_of_iterations for cible in cibles
+    ]
+    assert solver.number_of_iterations[0] < solver.number_of_iterations[2]
+
+def test_batch_newton_donnees_invalides():
+    with pytest.raises(ValueError):
+        BatchNewton(fonction_carre, [4., 9.], [1., 1., 1.], value_and_derivative=True)
+    with pytest.raises(ValueError):
+        BatchNewton(fonction_carre, [[4.]], [[1.]], value_and_derivative=True)
+    with pytest.raises(ValueError):
+        BatchNewton(fonction_carre, [4.], [1.], value_and_derivative=True, damping=1.5)
+
+def test_bracketed_solver_11():
+    solver = BracketedSolver11(fonction_carre, [4.], (0., 10.), value_and_derivative=True)
+    assert solver.convergence
+    assert math.isclose(solver.final_roots, 2., rel_tol=1e-4)
+
+def test_bracketed_solver_11_step():
+    solver = BracketedSolver11(lambda x: float(x > 3.), [0.5], (0., 5.))
+    assert solver.convergence
+    assert math.isclose(solver.final_roots, 3.)
+    assert solver.number_of_iterations <= solver.max_iterations
+
+def test_bracketed_solver_11_not_bracketed():
+    solver = BracketedSolver11(lambda x: x**2, [4.], (3., 10.))
+    assert not solver.convergence
+    assert solver.final_roots is None
+    assert solver.message == "La racine n'est pas encadrée : f(a) et f(b) sont de même signe"
+
+def test_bracketed_solver_11_newton_illinois():
+    newton = BracketedSolver11(lambda x: x**3, [8.], (0., 10.), derivative=lambda x: 3 * x**2)
+    illinois = BracketedSolver11(lambda x: x**3, [8.], (0., 10.))
+    for solver in [newton, illinois]:
+        assert solver.convergence
+        assert solver.message == "Convergence atteinte"
+        assert abs(solver.final_targets - 8.) <= solver.tolerance_value
+        assert math.isclose(solver.final_roots, 2., rel_tol=1e-4)
+    assert newton.number_of_iterations <= illinois.number_of_iterations
+    # Nettement moins d'évaluations qu'une dichotomie pure sur le même intervalle
+    assert illinois.number_of_iterations < math.log2(10. / 1e-5)
+
+def test_bracketed_solver_11_dichotomie():
+    # Fonction discontinue : les pas de fausse position sont rejetés et l'intervalle est réduit par dichotomie
+    solver = BracketedSolver11(lambda x: float(x > 3.), [0.5], (0., 5.))
+    assert solver.message == "Largeur de l'intervalle inférieure à x_tol"
+    assert abs(solver.final_roots - 3.) <= solver.x_tol
+    assert solver.number_of_iterations < solver.max_iterations
+
+def test_bracketed_solver_11_messages():
+    solver = BracketedSolver11(lambda x: x**3, [8.], (2., 10.))
+    assert solver.convergence
+    assert solver.final_roots == 2.
+    assert solver.message == "Racine trouvée à la borne inférieure"
+    solver = BracketedSolver11(lambda x: x**3, [8.], (0., 10.), max_iterations=4)
+    assert not solver.convergence
+    assert solver.final_roots is None and solver.final_targets is None
+    assert solver.message == "Pas de convergence après 4 évaluations"
+    assert solver.message in str(solver)
+
+def test_bracketed_solver_11_bracket_values():
+    # Les valeurs aux bornes fournies ne sont pas réévaluées : seule l'estimation initiale est évaluée
+    points = []
+    def fonction(x):
+        points.append(x)
+        return x**3
+    solver = BracketedSolver11(fonction, [8.], (0., 10.), bracket_values=(0., 1000.), initial_guess=2.)
+    assert solver.convergence
+    assert points == [2.]
+    assert solver.number_of_iterations == 1
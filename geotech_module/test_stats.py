@@ -0,0 +1,101 @@
+import contextvars
+import json
+import math
+import threading
+
+import numpy as np
+
+import pieu
+import soil
+from pieu import stats
+from solver import NewtonRaphson11, BatchNewton, BracketedSolver11
+
+sol_1 = soil.Soil("Argile", 0.0, -1.0, 'Q1', 0.5, 1., 5., 2/3)
+sol_2 = soil.Soil("Argile", -1.0, -8.0, 'Q2', 0.8, 1.2, 8., 2/3, 'fin')
+
+def test_stats_desactive():
+    assert stats.active() is None
+    with stats.collect() as statistiques:
+        assert stats.active() is statistiques
+    assert stats.active() is None
+    NewtonRaphson11(lambda x: x - 2, [0.], [0.])
+    assert statistiques.solvers == {}
+
+def test_stats_solveurs():
+    with stats.collect() as statistiques:
+        solver = NewtonRaphson11(lambda x: x**2 - 2, [0.], [1.])
+        echec = NewtonRaphson11(lambda x: x**2 + 1, [0.], [1.], derivative=lambda x: 2 * x)
+        BatchNewton(lambda x: x**2, np.array([1., 4., -1.]), 1., derivative=lambda x: 2 * x)
+        BracketedSolver11(lambda x: x**3, [1.], (0., 2.))
+    newton = statistiques.solvers['NewtonRaphson11']
+    assert newton.instances == 2
+    assert newton.failures == 1
+    assert newton.histogram[solver.number_of_iterations] == 1
+    assert newton.histogram[echec.number_of_iterations] == 1
+    assert newton.evaluations == 3 * solver.number_of_iterations + echec.number_of_iterations
+    assert statistiques.solvers['BatchNewton'].failures == 1
+    assert sum(statistiques.solvers['BatchNewton'].histogram.values()) == 3
+    assert statistiques.solvers['BracketedSolver11'].failures == 0
+    # Les échecs silencieux (racine [0.0]) sont détaillés
+    echec = statistiques.failures[0]
+    assert echec['solver'] == 'NewtonRaphson11' and echec['target'] == 0. and echec['last_value'] == 1.
+    assert statistiques.failures[1]['targets'] == [-1.]
+    json.dumps(statistiques.summary())
+
+def test_stats_etapes_pieu():
+    pile = pieu.Pile(19, 0., -5.0, 20_000, 0.15, 0.25, [sol_1, sol_2], 0.30, slice_solver='newton')
+    with stats.collect() as statistiques:
+        dz_acc, effort_acc = pile.settlement_curve(nb_pas=5)
+        pile.lateral_analysis(0.01, 0., 'elu')
+    assert set(statistiques.stages) == {'maillage', 'capacites', 'equilibre', 'courbe_tassement', 'lateral_factorisation', 'lateral_resolution'}
+    # Maillage, puis tranches SlicePile de l'équilibre final
+    assert statistiques.stages['maillage'].calls == 2
+    assert statistiques.stages['courbe_tassement'].calls == 1
+    # equilibre_dz_pointe, appelée par equilibre_Q_top, n'est pas comptée une seconde fois
+    assert statistiques.stages['equilibre'].calls == len(effort_acc)
+    assert statistiques.stages['courbe_tassement'].total >= statistiques.stages['equilibre'].total
+    assert statistiques.solvers['BracketedSolver11'].instances == len(effort_acc)
+    n_slices = pile.mesh.n_slices
+    assert statistiques.counters['equilibres_tranches'] == n_slices * statistiques.counters['parcours_pieu']
+    assert statistiques.solvers['NewtonRaphson11'].instances == statistiques.counters['equilibres_tranches']
+
+def test_stats_cumul():
+    @stats.timed('etape')
+    def recursion(n):
+        return n if n == 0 else recursion(n - 1)
+
+    totaux = stats.Stats()
+    for _ in range(2):
+        with stats.collect() as statistiques:
+            recursion(3)
+            stats.count('compteur', 2)
+        totaux.merge(statistiques)
+    # Une étape imbriquée dans une étape de même nom n'est comptée qu'une fois
+    assert statistiques.stages['etape'].calls == 1
+    assert totaux.stages['etape'].calls == 2
+    assert totaux.counters['compteur'] == 4
+    assert 'etape' in str(totaux)
+    totaux.reset()
+    assert totaux.summary() == {'solvers': {}, 'stages': {}, 'counters': {}, 'failures': []}
+
+def test_stats_contexte():
+    # La collecte activée dans un fil d'exécution n'est pas vue par les autres, sauf exécution dans une copie du contexte
+    vues = {}
+    def lecture(nom):
+        vues[nom] = stats.active()
+    with stats.collect() as statistiques:
+        fil = threading.Thread(target=lecture, args=('fil',))
+        fil.start()
+        fil.join()
+        fil = threading.Thread(target=contextvars.copy_context().run, args=(lecture, 'copie'))
+        fil.start()
+        fil.join()
+    assert vues == {'fil': None, 'copie': statistiques}
+    # enable / disable ne concernent que le contexte courant
+    def session():
+        vues['session'] = stats.enable()
+    fil = threading.Thread(target=session)
+    fil.start()
+    fil.join()
+    assert vues['session'] is not None
+    assert stats.active() is None
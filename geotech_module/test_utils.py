@@ -1,4 +1,7 @@
 import math
+
+import numpy as np
+
 import utils
 
 def test_is_courbes_croissantes():
@@ -63,3 +66,51 @@ def test_loi_effort_pointe():
     assert math.isclose(utils.end_bearing_law(0.01, 200, 5000), 50)
     assert math.isclose(utils.end_bearing_law(0.07, 200, 5000), 150)
     assert math.isclose(utils.end_bearing_law(0.15, 200, 5000), 200)
+
+
+def test_tri_linear_fixed_point():
+    for c in [-0.01, 0.005, 0.05, 0.5]:
+        z = utils.skin_friction_fixed_point(c, 2e-5, 200, 5000)
+        assert math.isclose(z, c + 2e-5 * utils.skin_friction_law(z, 200, 5000), abs_tol=1e-12)
+    z = utils.tri_linear_fixed_point(0.03, 2e-5, 100, 5000)
+    assert math.isclose(z, 0.03 + 2e-5 * utils.tri_linear_law(z, 100, 5000), abs_tol=1e-12)
+
+def test_tri_linear_fixed_point_non_monotone():
+    # b * k1 >= 1 : la solution exacte n'est pas unique, la résolution est laissée à Newton-Raphson
+    assert utils.fixed_point_monotone(2e-5, 100, 5000, 200, 1000)
+    assert not utils.fixed_point_monotone(2e-4, 100, 5000, 200, 1000)
+    assert utils.skin_friction_fixed_point(0.03, 2e-4, 200, 5000) is None
+    assert utils.skin_friction_fixed_point_array(np.array([0.03, 0.05]), 2e-4, 200, 5000) is None
+
+def test_prefix_integral():
+    courbe_x = [0, 2, 4, 6, 8, 10]
+    courbe_y = [3, 2, 5, 4, 6, 2]
+    cumul = utils.cumulative_trapezoid(courbe_x, courbe_y)
+    assert math.isclose(cumul[-1], 39.)
+    assert math.isclose(utils.prefix_integral(courbe_x, courbe_y, cumul, 8) - utils.prefix_integral(courbe_x, courbe_y, cumul, 3), 23.25)
+    assert math.isclose(utils.prefix_integral(courbe_x, courbe_y, cumul, -1), -3.)
+    # Abscisses scalaires et tableau (hors courbe, sur un point, dans un intervalle)
+    x = np.array([-1., 0., 3., 4., 7.5, 10., 12.])
+    courbe_x, courbe_y = np.array(courbe_x, dtype=float), np.array(courbe_y, dtype=float)
+    integrales = utils.prefix_integral(courbe_x, courbe_y, cumul, x)
+    for i in range(len(x)):
+        assert math.isclose(utils.prefix_integral(courbe_x, courbe_y, cumul, x[i]), integrales[i], abs_tol=1e-12)
+
+def test_valeur_moyenne_intervalles():
+    a = [0.0, -1.0, -1.0, -8.0, -8.0, -12.0, -12.0, -20.0]
+    b = [0.0, 0.0, 1.2, 1.2, 0.8, 0.8, 1.8, 1.8]
+    # Valeurs de référence de l'implémentation initiale (boucle scalaire) : profil complet, intervalle débutant
+    # sur la marche en -1 m, intervalles à cheval sur une ou deux marches, intervalles débutant sur une limite de couche
+    x1 = np.array([0.0, -1.0, -2.0, -6.0, -8.0, -8.0])
+    x2 = np.array([-20.0, -5.0, -10.0, -9.0, -12.0, -10.0])
+    attendues = [1.3, 1.2, 1.1, 1.0666666666666667, 0.8, 0.8]
+    assert np.allclose(utils.mean_value(a, b, x1, x2), attendues, rtol=1e-12)
+    for i in range(len(x1)):
+        assert math.isclose(utils.mean_value(a, b, x1[i], x2[i]), attendues[i], rel_tol=1e-12)
+    # Courbe décroissante
+    courbe_x = [0.0, 2.0, 5.0, 9.0]
+    courbe_y = [4.0, 3.0, 1.5, 0.5]
+    x1 = np.array([0.0, 1.0, 2.0])
+    x2 = np.array([9.0, 6.0, 5.0])
+    assert np.allclose(utils.mean_value(courbe_x, courbe_y, x1, x2), [1.9722222222222223, 2.275, 2.25], rtol=1e-12)
+    assert math.isclose(utils.trapezoidal_integration(a, b, -20.0, 0.0), -26.0)
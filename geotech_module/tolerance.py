@@ -1,4 +1,5 @@
 import math
+import numpy as np
 
 
 class Tolerance:
@@ -34,3 +35,11 @@ class Tolerance:
     def __str__(self):
         result = f"Tolérance prise en compte pour la convergence: {self.value:4f}"
         return result
+
+
+def tolerance_array(values) -> np.ndarray:
+    """
+    Tolérance de convergence élément par élément, équivalente à Tolerance([valeur]).value pour chaque valeur.
+    """
+    values = np.abs(np.asarray(values, dtype=float))
+    return np.where(np.isclose(values, 0), 0.1, values) / 10_000
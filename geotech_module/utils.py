@@ -1,6 +1,26 @@
+import itertools
 import math
 import numpy as np
-from PyNite import FEModel3D
+
+import geotech_module.stats as stats
+
+try:
+    from PyNite import FEModel3D
+except ImportError:
+    # PyNite est optionnel : le calcul latéral est réalisé par geotech_module.lateral
+    FEModel3D = None
+
+
+# Numéros d'état, uniques dans le processus
+_STATE_VERSIONS = itertools.count(1)
+
+
+def next_state_version() -> int:
+    """
+    Nouveau numéro d'état, attribué à chaque modification d'un paramètre d'un objet (couche de sol, pieu) :
+    la validité des grandeurs mémorisées est vérifiée par comparaison des numéros d'état, sans comparer les contenus.
+    """
+    return next(_STATE_VERSIONS)
 
 
 def max_list(list_of_float: list[float]) -> float:
@@ -23,45 +43,72 @@ def min_list(list_of_float: list[float]) -> float:
     return minimum
 
 
-def trapezoidal_integration(cb_x: list[float], cb_y: list[float], x1: float, x2: float) -> float:
+def trapezoidal_integration(cb_x: list[float], cb_y: list[float], x1: float|np.ndarray, x2: float|np.ndarray) -> float|np.ndarray:
     """
     Retourne l'intégrale d'une courbe entre deux abscisses x1 et x2.
+    La courbe peut être d'abscisses croissantes ou décroissantes, et en escalier (abscisses répétées, comme Pile.courbe_pl) ;
+    elle est prolongée par une constante au-delà de ses extrémités.
+    L'intégrale est orientée dans le sens de la courbe : positive de x1 vers x2 pour une courbe croissante,
+    de x2 vers x1 pour une courbe décroissante. x1 et x2 peuvent être des tableaux (diffusion NumPy).
+    """
+    cb_x = np.asarray(cb_x, dtype=float)
+    cb_y = np.asarray(cb_y, dtype=float)
+    x1 = np.asarray(x1, dtype=float)
+    x2 = np.asarray(x2, dtype=float)
+    if cb_x[-1] < cb_x[0]:
+        # Vues inversées, sans copie
+        cb_x = cb_x[::-1]
+        cb_y = cb_y[::-1]
+        x1, x2 = x2, x1
+
+    cumul = cumulative_trapezoid(cb_x, cb_y)
+    integral = prefix_integral(cb_x, cb_y, cumul, x2) - prefix_integral(cb_x, cb_y, cumul, x1)
+    if np.ndim(integral) == 0:
+        return float(integral)
+    return integral
+
+
+def mean_value(cb_x: list[float], cb_y: list[float], x1: float|np.ndarray, x2: float|np.ndarray) -> float|np.ndarray:
     """
-    if rising_curve(cb_x) == True:
-        xmin = x1
-        xmax = x2
-    else:
-        cb_x = invert_list(cb_x)
-        cb_y = invert_list(cb_y)
-        xmin = x2
-        xmax = x1
-
-    y1 = np.interp(xmin, cb_x, cb_y)
-    y2 = np.interp(xmax, cb_x, cb_y)
-    x_acc = [xmin]
-    y_acc = [y1]
-
-    for idx, y in enumerate(cb_y):
-        if cb_x[idx] < xmin:
-            pass
-        elif cb_x[idx] > xmax:
-            pass
-        else:
-            x_acc.append(cb_x[idx])
-            y_acc.append(cb_y[idx])
+    Retourne la valeur moyenne d'une courbe entre deux abscisses x1 et x2.
+    [Intégrale de la courbe entre x1 et x2] / [x2 - x1]
+    """
+    return trapezoidal_integration(cb_x, cb_y, x1, x2) / np.abs(np.asarray(x2) - np.asarray(x1))
 
-    x_acc.append(xmax)
-    y_acc.append(y2)
 
-    return np.trapz(y_acc, x_acc)
+def cumulative_trapezoid(cb_x: np.ndarray, cb_y: np.ndarray) -> np.ndarray:
+    """
+    Intégrales cumulées (méthode des trapèzes) d'une courbe d'abscisses croissantes, depuis cb_x[0] jusqu'à chaque abscisse.
+    """
+    cb_x = np.asarray(cb_x, dtype=float)
+    cb_y = np.asarray(cb_y, dtype=float)
+    return np.concatenate(([0.], np.cumsum(np.diff(cb_x) * (cb_y[1:] + cb_y[:-1]) / 2)))
 
 
-def mean_value(cb_x: list[float], cb_y: list[float], x1: float, x2: float) -> float:
+def prefix_integral(cb_x: np.ndarray, cb_y: np.ndarray, cumul: np.ndarray, x: float|np.ndarray) -> float|np.ndarray:
     """
-    Retourne la valeur moyenne d'une courbe entre deux abscisses x1 et x2.
-    [Intégrale de la courbe entre x1 et x2] / [x2 - x1]
+    Intégrale de la courbe (interpolation linéaire, prolongement constant hors de la courbe) de cb_x[0] à x,
+    à partir des intégrales cumulées cumul = cumulative_trapezoid(cb_x, cb_y) : une recherche par dichotomie par abscisse.
+    Les abscisses répétées (courbe en escalier) sont admises.
+    Une abscisse scalaire est traitée sans tableau intermédiaire.
     """
-    return trapezoidal_integration(cb_x, cb_y, x1, x2) / abs(x2 - x1)
+    n = len(cb_x)
+    if np.ndim(x) == 0:
+        x = float(x)
+        i = min(max(int(np.searchsorted(cb_x, x, side='right')) - 1, 0), n - 1)
+        j = min(i + 1, n - 1)
+        x_i, y_i = float(cb_x[i]), float(cb_y[i])
+        dx = float(cb_x[j]) - x_i
+        t = min(max((x - x_i) / dx, 0.), 1.) if dx > 0 else 0.
+        y = y_i + t * (float(cb_y[j]) - y_i)
+        return float(cumul[i]) + (x - x_i) * (y_i + y) / 2
+    x = np.asarray(x, dtype=float)
+    i = np.clip(np.searchsorted(cb_x, x, side='right') - 1, 0, n - 1)
+    j = np.minimum(i + 1, n - 1)
+    dx = cb_x[j] - cb_x[i]
+    t = np.clip((x - cb_x[i]) / np.where(dx > 0, dx, 1.), 0., 1.) * (dx > 0)
+    y = cb_y[i] + t * (cb_y[j] - cb_y[i])
+    return cumul[i] + (x - cb_x[i]) * (cb_y[i] + y) / 2
 
 
 def rising_curve(cb_x: list[float]) -> bool:
@@ -165,9 +212,211 @@ def tri_linear_law(s: float, q1: float, k1: float, q2: float|None=None, k2: floa
         return q2
 
 
+def tri_linear_slope(s: float, q1: float, k1: float, q2: float|None=None, k2: float|None=None) -> float:
+    """
+    Pente (dérivée à droite) de la loi tri-linéaire tri_linear_law pour un déplacement s.
+    La dérivée à droite est retenue aux points anguleux, la sollicitation étant croissante.
+    """
+    if k2 is None:
+        q2 = q1
+        k2 = 1
+    s1 = q1 / k1
+    s2 = s1 + (q2 - q1) / k2
+
+    if s < 0.:
+        return 0.
+    if s < s1:
+        return k1
+    elif s < s2:
+        return k2
+    else:
+        return 0.
+
+
+def skin_friction_slope(s: float, qs: float, ks: float) -> float:
+    """
+    Pente de la loi de mobilisation du frottement latéral (skin_friction_law).
+    """
+    return tri_linear_slope(s, qs/2, ks, qs, ks/5)
+
+
+def end_bearing_slope(s: float, qp: float, kp: float) -> float:
+    """
+    Pente de la loi de mobilisation de l'effort de pointe (end_bearing_law).
+    """
+    return tri_linear_slope(s, qp/2, kp, qp, kp/5)
+
+
+def law_slope(law, s: float, q: float, k: float, delta: float=1e-7) -> float:
+    """
+    Pente d'une loi de mobilisation law(s, q, k) : analytique si elle est connue (LAW_SLOPES),
+    estimée par différences finies centrées sinon.
+    """
+    slope = LAW_SLOPES.get(law)
+    if slope is not None:
+        return slope(s, q, k)
+    return (law(s + delta, q, k) - law(s - delta, q, k)) / (2 * delta)
+
+
+def fixed_point_monotone(b: float, q1: float, k1: float, q2: float, k2: float) -> bool:
+    """
+    Vérifie que G(z) = z - c - b * tri_linear_law(z, q1, k1, q2, k2) est strictement croissante sur chaque branche.
+    """
+    return b * k1 < 1 and (q2 <= q1 or b * k2 < 1)
+
+
+def tri_linear_fixed_point(c: float, b: float, q1: float, k1: float, q2: float|None=None, k2: float|None=None) -> float|None:
+    """
+    Solution exacte de l'équation z = c + b * tri_linear_law(z, q1, k1, q2, k2), avec b >= 0.
+    La fonction G(z) = z - c - b * loi(z) étant croissante (b * k1 < 1), la racine est unique :
+    la branche de la loi qui la contient est identifiée par le signe de G aux points anguleux.
+    Renvoie None si b * k1 >= 1 (ou b * k2 >= 1 sur la seconde branche) : G n'est plus croissante et la racine doit être
+    recherchée par Newton-Raphson.
+    """
+    if k2 is None:
+        q2 = q1
+        k2 = 1
+    if not fixed_point_monotone(b, q1, k1, q2, k2):
+        return None
+    s1 = q1 / k1
+    s2 = s1 + (q2 - q1) / k2
+
+    if c <= 0.:
+        return c
+    if s1 - c - b * q1 >= 0.:
+        return c / (1 - b * k1)
+    elif s2 - c - b * q2 >= 0.:
+        return (c + b * (q1 - s1 * k2)) / (1 - b * k2)
+    else:
+        return c + b * q2
+
+
+def skin_friction_fixed_point(c: float, b: float, qs: float, ks: float) -> float|None:
+    """
+    Solution exacte de z = c + b * skin_friction_law(z, qs, ks).
+    """
+    return tri_linear_fixed_point(c, b, qs/2, ks, qs, ks/5)
+
+
+# Lois de mobilisation linéaires par morceaux, associées à leur solveur exact de l'équilibre d'une tranche
+FIXED_POINT_SOLVERS = {
+    skin_friction_law: skin_friction_fixed_point,
+}
+
+# Lois de mobilisation dont la pente est connue analytiquement
+LAW_SLOPES = {
+    skin_friction_law: skin_friction_slope,
+    end_bearing_law: end_bearing_slope,
+}
+
+
+def tri_linear_law_array(s: np.ndarray, q1: float, k1: float, q2: float|None=None, k2: float|None=None) -> np.ndarray:
+    """
+    Version vectorisée de tri_linear_law, pour un tableau de déplacements s.
+    """
+    if k2 is None:
+        q2 = q1
+        k2 = 1
+    s1 = q1 / k1
+    s2 = s1 + (q2 - q1) / k2
+    s = np.asarray(s, dtype=float)
+    return np.select([s <= 0., s <= s1, s <= s2], [0., s * k1, q1 + (s - s1) * k2], q2)
+
+
+def tri_linear_slope_array(s: np.ndarray, q1: float, k1: float, q2: float|None=None, k2: float|None=None) -> np.ndarray:
+    """
+    Version vectorisée de tri_linear_slope, pour un tableau de déplacements s.
+    """
+    if k2 is None:
+        q2 = q1
+        k2 = 1
+    s1 = q1 / k1
+    s2 = s1 + (q2 - q1) / k2
+    s = np.asarray(s, dtype=float)
+    return np.select([s < 0., s < s1, s < s2], [0., k1, k2], 0.)
+
+
+def tri_linear_fixed_point_array(c: np.ndarray, b: float, q1: float, k1: float, q2: float|None=None, k2: float|None=None) -> np.ndarray|None:
+    """
+    Version vectorisée de tri_linear_fixed_point, pour un tableau de constantes c.
+    Renvoie None si G n'est pas croissante (voir tri_linear_fixed_point).
+    """
+    if k2 is None:
+        q2 = q1
+        k2 = 1
+    if not fixed_point_monotone(b, q1, k1, q2, k2):
+        return None
+    s1 = q1 / k1
+    s2 = s1 + (q2 - q1) / k2
+    c = np.asarray(c, dtype=float)
+    return np.select(
+        [c <= 0., s1 - c - b * q1 >= 0., s2 - c - b * q2 >= 0.],
+        [c, c / (1 - b * k1), (c + b * (q1 - s1 * k2)) / (1 - b * k2)],
+        c + b * q2,
+    )
+
+
+def skin_friction_law_array(s: np.ndarray, qs: float, ks: float) -> np.ndarray:
+    return tri_linear_law_array(s, qs/2, ks, qs, ks/5)
+
+
+def end_bearing_law_array(s: np.ndarray, qp: float, kp: float) -> np.ndarray:
+    return tri_linear_law_array(s, qp/2, kp, qp, kp/5)
+
+
+def skin_friction_slope_array(s: np.ndarray, qs: float, ks: float) -> np.ndarray:
+    return tri_linear_slope_array(s, qs/2, ks, qs, ks/5)
+
+
+def end_bearing_slope_array(s: np.ndarray, qp: float, kp: float) -> np.ndarray:
+    return tri_linear_slope_array(s, qp/2, kp, qp, kp/5)
+
+
+def skin_friction_fixed_point_array(c: np.ndarray, b: float, qs: float, ks: float) -> np.ndarray|None:
+    return tri_linear_fixed_point_array(c, b, qs/2, ks, qs, ks/5)
+
+
+# Versions vectorisées des lois de mobilisation, de leurs pentes et des solveurs exacts
+LAWS_ARRAY = {
+    skin_friction_law: skin_friction_law_array,
+    end_bearing_law: end_bearing_law_array,
+}
+
+LAW_SLOPES_ARRAY = {
+    skin_friction_law: skin_friction_slope_array,
+    end_bearing_law: end_bearing_slope_array,
+}
+
+FIXED_POINT_SOLVERS_ARRAY = {
+    skin_friction_law: skin_friction_fixed_point_array,
+}
+
+
+def law_array(law):
+    """
+    Version vectorisée d'une loi de mobilisation law(s, q, k) : connue (LAWS_ARRAY) ou obtenue par np.vectorize.
+    """
+    vectorised = LAWS_ARRAY.get(law)
+    if vectorised is not None:
+        return vectorised
+    return np.vectorize(law, otypes=[float])
+
+
+def law_slope_array(law, s: np.ndarray, q: float, k: float, delta: float=1e-7) -> np.ndarray:
+    """
+    Version vectorisée de law_slope.
+    """
+    slope = LAW_SLOPES_ARRAY.get(law)
+    if slope is not None:
+        return slope(s, q, k)
+    law_vect = law_array(law)
+    return (law_vect(s + delta, q, k) - law_vect(s - delta, q, k)) / (2 * delta)
+
+
 def build_pile(
         pile_data: dict,
-        slices,
+        mesh,
+        lithology,
         horizontal_force,
         bending_moment,
         situation,
@@ -177,12 +426,14 @@ def build_pile(
     It is assumed to be a vertical pile, loaded on top, with continuous horizontal spring supports.
     Les données d'entrée pour définir le modèle PyNite sont les suivantes:
         - La définition du pieu :   pieu.data_pieu
+        - Le maillage du pieu :     pieu.mesh = PileMesh
         - La liste des sols:        pieu.lithology = [Soil]
-        - La liste des slices :     pieu.slices = [TranchePieu]
         - horizontal_force :        effort horizontal appliqué en tête
         - bending_moment :          moment fléchissant appliqué en tête
         - situation :               ['court terme', 'long terme', 'elu', 'sismique']
     """
+    if FEModel3D is None:
+        raise ImportError("PyNite n'est pas installé : utiliser Pile.lateral_analysis(backend='banded')")
     E = pile_data["E"]
     B = pile_data["B"]
     Iz = pile_data["Iz"]
@@ -199,31 +450,20 @@ def build_pile(
     G = calc_shear_modulus(nu, E)
     pile_model.add_material('pile_material', E, G, nu, rho)
 
-    # Définition des NOEuds
-    node_locations = [slices[0].z_top]
-    linear_springs = [0]
-    for slice in slices:
-        node_locations.append(slice.z_middle)
-        linear_springs.append(slice.linear_spring(B, situation))
-    node_locations.append(slices[-1].z_bottom)
-    linear_springs.append(0)
+    # Définition des NOEuds : tête, milieu de chaque tranche, pointe
+    node_locations = [mesh.z_top[0], *mesh.z_middle.tolist(), mesh.z_bottom[-1]]
+    linear_springs = mesh.linear_springs(lithology, B, situation).tolist()
     nodes = get_nodes(node_locations)
-    first_node = get_node_name_at_location(nodes, slices[0].z_top)
-    last_node = get_node_name_at_location(nodes, slices[-1].z_bottom)
+    first_node = 'N0'
+    last_node = f"N{len(node_locations) - 1}"
     for node, loc in nodes.items():
         pile_model.add_node(node, loc, 0, 0)
 
     # Création des appuis
-    idx = 0
-    for node_name, location in nodes.items():
-        if node_name == first_node:
-            pile_model.def_support(node_name=node_name, support_DX = True)
-        elif node_name == last_node:
-            pile_model.def_support(node_name, support_DZ = True, support_DX = True, support_RX = True)
-        else:
-            spring = linear_springs[idx]
-            pile_model.def_support_spring(node_name, 'DY', spring, direction = None)
-        idx +=1
+    pile_model.def_support(node_name=first_node, support_DX = True)
+    pile_model.def_support(last_node, support_DZ = True, support_DX = True, support_RX = True)
+    for idx, spring in enumerate(linear_springs):
+        pile_model.def_support_spring(f"N{idx + 1}", 'DY', spring, direction = None)
 
     # Création de la barre
     pile_model.add_member(name='pile', i_node=first_node, j_node=last_node, material='pile_material', Iy=Iy, Iz=Iz, J=J, A=A)
@@ -235,28 +475,73 @@ def build_pile(
     return pile_model
 
 
-def get_model_curves(fem_model: FEModel3D, top_level: float=0, step: float=0.01) -> list[list[float]]:
+def sample_levels(levels: np.ndarray, step: float|None=None) -> np.ndarray:
+    """
+    Niveaux d'échantillonnage le long du pieu, de la tête vers la pointe :
+    niveaux des noeuds si step vaut None, sinon subdivision régulière de pas inférieur ou égal à step (tête et pointe incluses).
+    """
+    levels = np.asarray(levels, dtype=float)
+    if step is None:
+        return levels
+    nb_intervalles = max(int(math.ceil((levels[0] - levels[-1]) / step - 1e-9)), 1)
+    return np.linspace(levels[0], levels[-1], nb_intervalles + 1)
+
+
+def hermite_curves(
+        levels: np.ndarray,
+        deflection: np.ndarray,
+        rotation: np.ndarray,
+        EI: float,
+        step: float|None=None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the bending moment, shear force and deflection curves along the pile from the nodal displacements.
+    Les fonctions de forme d'Hermite des éléments sont évaluées simultanément pour tous les points d'échantillonnage
+    (sample_levels) : sans charge répartie entre les noeuds, le déplacement est cubique sur chaque élément et les courbes
+    sont exactes. Les conventions de signes sont celles du modèle PyNite (rotation = dérivée du déplacement par rapport au niveau).
+    L'effort tranchant, constant par élément, est celui de l'élément situé sous le point (élément supérieur à la pointe).
+    Les déplacements et rotations peuvent être empilés (une ligne par cas de charge), les courbes le sont alors de même.
+    Renvoie (niveaux, moment, effort tranchant, déplacement).
+    """
+    levels = np.asarray(levels, dtype=float)
+    deflection = np.asarray(deflection, dtype=float)
+    # Rotation par rapport à la profondeur, mesurée depuis la tête
+    theta = - np.asarray(rotation, dtype=float)
+    depth_nodes = levels[0] - levels
+    z = sample_levels(levels, step)
+    depth = levels[0] - z
+
+    element = np.clip(np.searchsorted(depth_nodes, depth, side='right') - 1, 0, len(levels) - 2)
+    L = depth_nodes[element + 1] - depth_nodes[element]
+    xi = (depth - depth_nodes[element]) / L
+    v1, t1 = deflection[..., element], theta[..., element] * L
+    v2, t2 = deflection[..., element + 1], theta[..., element + 1] * L
+
+    v = (
+        (1 - 3 * xi**2 + 2 * xi**3) * v1
+        + (xi - 2 * xi**2 + xi**3) * t1
+        + (3 * xi**2 - 2 * xi**3) * v2
+        + (- xi**2 + xi**3) * t2
+    )
+    d2v = ((-6 + 12 * xi) * v1 + (-4 + 6 * xi) * t1 + (6 - 12 * xi) * v2 + (-2 + 6 * xi) * t2) / L**2
+    d3v = (12 * v1 + 6 * t1 - 12 * v2 + 6 * t2) / L**3
+    return z, - EI * d2v, EI * d3v, v
+
+
+@stats.timed('fe_extraction')
+def get_model_curves(fem_model: FEModel3D, top_level: float=0, step: float|None=0.01) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     """
     Returns the curves data for the bending moment, the shear forces and the deflection along the pile.
-    """
-    height_pile = model_length(fem_model)
-    moment = []
-    shear = []
-    deflection = []
-    abscisse = []
-    x = 0
-    z = top_level
-    while z >= top_level - height_pile:
-        mx = fem_model.Members['pile'].moment('Mz', x, 'Combo 1')
-        vx = fem_model.Members['pile'].shear('Fy', x, 'Combo 1')
-        fx = fem_model.Members['pile'].deflection('dy', x, 'Combo 1')
-        moment.append(mx)
-        shear.append(vx)
-        deflection.append(fx)
-        abscisse.append(z)
-        x += step
-        z -= step
-    return abscisse, moment, shear, deflection
+    Les courbes sont interpolées à partir des déplacements nodaux du modèle PyNite analysé (hermite_curves),
+    au pas step ou aux noeuds si step vaut None.
+    """
+    nodes = sorted(fem_model.Nodes.values(), key=lambda node: - node.X)
+    member = fem_model.Members['pile']
+    levels = np.array([node.X for node in nodes])
+    deflection = np.array([node.DY['Combo 1'] for node in nodes])
+    rotation = np.array([node.RZ['Combo 1'] for node in nodes])
+    z, moment, shear, deflection = hermite_curves(levels, deflection, rotation, member.E * member.Iz, step)
+    return z - levels[0] + top_level, moment, shear, deflection
 
 def get_soil_pressure(fem_model: FEModel3D) -> list[list[float]]:
     """
@@ -1,15 +1,152 @@
+import contextvars
+import logging
 import math
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
 import streamlit as st
 import plotly.graph_objects as go
 
+import geotech_module.stats as stats
 from geotech_module.pieu import Pile
 from geotech_module.soil import Soil
-import geotech_module.utils as utils
 
 # NEW - This is a handy something from the standard library
 from string import ascii_uppercase
 
 
+# Calculs mémorisés : chaque étape n'est recalculée que si ses données d'entrée (paramètres du pieu et des sols,
+# chargement) ont changé. Le pieu est une ressource partagée (son maillage et ses résistances sont mémorisés par Pile) :
+# toute tâche qui le lit prend son verrou (verrou_calcul), les résultats sont des données copiées à chaque lecture.
+# Les étapes sont exécutées en tâche de fond (soumettre / attendre) : les paramètres _progression et _arret,
+# exclus de la clé du cache, permettent de suivre l'avancement et d'interrompre un calcul dont les données ont changé.
+def nouveau_pieu(parametres_pieu: tuple, parametres_sols: tuple) -> Pile:
+    categorie, level_top, level_bot, Eb, Dp, Ds, thickness = parametres_pieu
+    return Pile(
+        category=categorie,
+        level_top=level_top,
+        level_bott=level_bot,
+        Eb=Eb,
+        Dp=Dp,
+        Ds=Ds,
+        lithology=[Soil(*sol) for sol in parametres_sols],
+        thickness=thickness,
+    )
+
+
+@st.cache_resource
+def construire_pieu(parametres_pieu: tuple, parametres_sols: tuple) -> Pile:
+    return nouveau_pieu(parametres_pieu, parametres_sols)
+
+
+@st.cache_resource
+def verrou_calcul(parametres_pieu: tuple, parametres_sols: tuple) -> threading.Lock:
+    # Le pieu partagé entre les sessions et les tâches de fond n'est pas protégé : ses grandeurs mémorisées (maillage, capacités,
+    # modèles latéraux) et l'état de ses tranches sont modifiés par les calculs, qui sont donc exécutés sous ce verrou
+    return threading.Lock()
+
+
+@st.cache_data
+def capacites(parametres_pieu: tuple, parametres_sols: tuple, _progression=None, _arret=None) -> dict[str, float]:
+    noms = [
+        'resistance_totale',
+        'portance_ELS_QP', 'portance_ELS_Car', 'portance_ELU_Str', 'portance_ELU_Acc',
+        'traction_ELS_QP', 'traction_ELS_Car', 'traction_ELU_Str', 'traction_ELU_Acc',
+    ]
+    with verrou_calcul(parametres_pieu, parametres_sols):
+        pieu = construire_pieu(parametres_pieu, parametres_sols)
+        return {nom: getattr(pieu, nom) for nom in noms}
+
+
+@st.cache_data
+def courbe_tassement(parametres_pieu: tuple, parametres_sols: tuple, _progression=None, _arret=None) -> tuple[list[float], list[float]]:
+    # Pieu propre à ce calcul : la courbe de tassement s'exécute en parallèle de la recherche d'équilibre sur le pieu partagé
+    arret = None if _arret is None else _arret.is_set
+    tassement = nouveau_pieu(parametres_pieu, parametres_sols).settlement_curve(methode='deplacement', progression=_progression, arret=arret)
+    if arret is not None and arret():
+        # La courbe partielle d'un calcul interrompu n'est pas mémorisée
+        raise CancelledError()
+    return tassement
+
+
+@st.cache_data
+def equilibre_charge(parametres_pieu: tuple, parametres_sols: tuple, q_top: float, _progression=None, _arret=None) -> dict[str, list[float]]:
+    with verrou_calcul(parametres_pieu, parametres_sols):
+        slices = construire_pieu(parametres_pieu, parametres_sols).equilibre_Q_top(q_top)[3]
+        return {
+            'z_top': [slice.z_top for slice in slices],
+            'Q_top': [slice.Q_top for slice in slices],
+            'dz_top': [slice.dz_top for slice in slices],
+            'dz_middle': [slice.dz_middle for slice in slices],
+            'qs': [slice.qs for slice in slices],
+            'qs_lim': [slice.qs_lim for slice in slices],
+            'Q_bott': slices[-1].Q_bott,
+            'dz_bott': slices[-1].dz_bott,
+        }
+
+
+@st.cache_data
+def courbes_laterales(
+        parametres_pieu: tuple,
+        parametres_sols: tuple,
+        horizontal_force: float,
+        bending_moment: float,
+        situation: str,
+        _progression=None,
+        _arret=None,
+):
+    # Le modèle latéral factorisé est mémorisé par le pieu pour chaque situation (Pile.lateral_model) ; sa résolution
+    # n'utilise plus le pieu et s'exécute hors du verrou
+    with verrou_calcul(parametres_pieu, parametres_sols):
+        model = construire_pieu(parametres_pieu, parametres_sols).lateral_model(situation)
+    return model.solve(horizontal_force, bending_moment).curves(model.EI, step=0.01)
+
+
+@st.cache_resource
+def statistiques_calcul() -> stats.Stats:
+    # Mesures de l'instrumentation cumulées sur les calculs des sessions qui l'ont activée (et de leurs tâches de fond) ;
+    # l'activation (stats.enable) est propre à chaque session
+    return stats.Stats()
+
+
+@st.cache_resource
+def executeur() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix='pile_app')
+
+
+def soumettre(panneau: str, fonction, *args) -> dict:
+    # La tâche du panneau est conservée si ses données d'entrée n'ont pas changé ; sinon elle est interrompue
+    # (ou annulée si elle n'a pas démarré) et remplacée par un nouveau calcul
+    taches = st.session_state.setdefault('taches', {})
+    tache = taches.get(panneau)
+    if tache is not None and tache['args'] == args:
+        return tache
+    if tache is not None:
+        tache['arret'].set()
+        tache['future'].cancel()
+    arret = threading.Event()
+    avancement = [0.]
+
+    def progression(valeur: float):
+        avancement[0] = valeur
+
+    # La tâche s'exécute dans une copie du contexte de la session : elle hérite de la collecte de l'instrumentation de cette session
+    future = executeur().submit(contextvars.copy_context().run, fonction, *args, _progression=progression, _arret=arret)
+    tache = {'args': args, 'future': future, 'arret': arret, 'avancement': avancement}
+    taches[panneau] = tache
+    return tache
+
+
+def attendre(tache: dict, libelle: str):
+    # Barre de progression tant que le calcul n'est pas terminé ; une relance du script interrompt l'attente, pas le calcul
+    barre = st.progress(0., text=libelle)
+    while not tache['future'].done():
+        barre.progress(tache['avancement'][0], text=libelle)
+        time.sleep(0.1)
+    barre.empty()
+    return tache['future'].result()
+
+
 st.divider()
 st.title("Dimensionnement d'une fondation profonde isolée suivant la norme NF P94-262")
 st.divider()
@@ -23,10 +160,16 @@ Eb = st.sidebar.number_input("Module de Young du pieu [MPa]", value=210_000)
 pieu_dp = st.sidebar.number_input("Diamètre équivalent du pieu pour l'effort de pointe [mm]", value=46.3)
 pieu_ds = st.sidebar.number_input("Diamètre équivalent du pieu pour le frottement [mm]", value=88.9)
 interval = st.sidebar.number_input("Discretisation du pieu [mm]", value=200)
+instrumentation = st.sidebar.checkbox("Statistiques de calcul (solveurs, durées des étapes)", value=False)
+# Collecte activée pour cette session seulement (contexte du fil d'exécution du script et tâches qu'il soumet)
+if instrumentation:
+    stats.enable(statistiques_calcul())
+else:
+    stats.disable()
 
 st.subheader('Lithologie')
 nb_couches = st.number_input("Nombre de couches de sol à considérer pour l'étude du pieu (maxi 4) :", value = 4)
-couches_sols = []
+parametres_sols = []
 
 for idx in range(nb_couches):
     letter = ascii_uppercase[idx]
@@ -42,30 +185,22 @@ for idx in range(nb_couches):
         sol_Em = st.number_input(f"Sol '{letter}' - Module pressiométrique moyen [MPa] :", value=5.0)
         sol_alpha = st.number_input(f"Sol '{letter}' - Coefficient alpha - suivant étude géotechnique :", value=0.67)
 
-        sol= Soil(
-            name=sol_name,
-            level_sup=sol_level_sup,
-            level_inf=sol_level_inf,
-            courbe_frottement=sol_courbe_frottement,
-            pf=sol_pf,
-            pl=sol_pl,
-            Em=sol_Em,
-            alpha=sol_alpha
-        )
-    couches_sols.append(sol)
+    parametres_sols.append((
+        sol_name,
+        sol_level_sup,
+        sol_level_inf,
+        sol_courbe_frottement,
+        sol_pf,
+        sol_pl,
+        sol_Em,
+        sol_alpha,
+    ))
 
 st.divider()
 
-pieu = Pile(
-    category=categorie,
-    level_top=level_top,
-    level_bott=level_bot,
-    Eb=Eb,
-    Dp=pieu_dp / 1000,
-    Ds=pieu_ds / 1000,
-    lithology=couches_sols,
-    thickness=interval / 1000
-)
+parametres_sols = tuple(parametres_sols)
+parametres_pieu = (categorie, level_top, level_bot, Eb, pieu_dp / 1000, pieu_ds / 1000, interval / 1000)
+pieu = construire_pieu(parametres_pieu, parametres_sols)
 
 st.subheader('Description du pieu')
 col1, col2 = st.columns([3, 1])
@@ -81,173 +216,23 @@ st.divider()
 
 
 st.subheader('Capacité résistante du pieu')
-
-colA, colB = st.columns(2)
-with colA:
-    st.subheader('Compression')
-    col1, col2 = st.columns(2)
-    with col1:
-        st.markdown('- ELS QP :')
-        st.markdown('- ELS Car :')
-        st.markdown('- ELU Str :')
-        st.markdown('- ELU Acc :')
-    with col2:
-        st.write(str(f"{1000 * pieu.portance_ELS_QP: .1f} kN"))
-        st.write(str(f"{1000 * pieu.portance_ELS_Car: .1f} kN"))
-        st.write(str(f"{1000 * pieu.portance_ELU_Str: .1f} kN"))
-        st.write(str(f"{1000 * pieu.portance_ELU_Acc: .1f} kN"))
-
-with colB:
-    st.subheader('Traction')
-    col1, col2 = st.columns(2)
-    with col1:
-        st.markdown('- ELS QP :')
-        st.markdown('- ELS Car :')
-        st.markdown('- ELU Str :')
-        st.markdown('- ELU Acc :')
-    with col2:
-        st.write(str(f"{1000 * pieu.traction_ELS_QP: .1f} kN"))
-        st.write(str(f"{1000 * pieu.traction_ELS_Car: .1f} kN"))
-        st.write(str(f"{1000 * pieu.traction_ELU_Str: .1f} kN"))
-        st.write(str(f"{1000 * pieu.traction_ELU_Acc: .1f} kN"))
+panneau_capacites = st.container()
+tache_capacites = soumettre('capacites', capacites, parametres_pieu, parametres_sols)
 
 st.divider()
 
 st.subheader('Courbe de tassement du pieu')
 tog_tass = st.toggle("tracer la courbe de tassement")
-
+panneau_tassement = st.container()
 if tog_tass == True:
-    tassement = pieu.settlement_curve()
-    x_acc = []
-    y_acc = []
-    for x in tassement[1]:
-        x_acc.append(1000 * x)
-    for y in tassement[0]:
-        y_acc.append(1000 * y)
-
-    fig = go.Figure()
-
-    # Plot lines
-    fig.add_trace(
-        go.Scatter(
-        x=x_acc, 
-        y=y_acc,
-        line={"color": "teal"},
-        name="Column B"
-        )
-    )
-    fig.layout.title.text = "Courbe déterminée suivant l'annexe L de la NF P94-262"
-    fig.layout.xaxis.title = "Charge vertical en tête de pieu [kN]"
-    fig.layout.yaxis.title = "Déplacement vertical en tête de pieu [mm]"
-
-    st.plotly_chart(fig)
+    tache_tassement = soumettre('tassement', courbe_tassement, parametres_pieu, parametres_sols)
 
 st.divider()
 
 st.subheader('Equilibre pour un chargement vertical donné')
 
 tog_equ = st.toggle("Recherche de l'équilibre")
-if tog_equ == True:
-    resistance_maxi = math.floor(1000 * pieu.resistance_totale)
-    q_target = st.slider("Charge verticale en tête de pieu [kN] :", min_value=0, max_value=resistance_maxi, value=380)
-
-    equilibre = pieu.equilibre_Q_top(q_target / 1000)
-    z_acc = []
-    Q_acc = []
-    Q_sol = []
-    dz_acc = []
-    dz_sol = []
-    qs_acc = []
-    qs_lim = []
-    qs_max = -math.inf
-    for slice in equilibre[3]:
-        z_acc.append(slice.z_top)
-        Q_acc.append(slice.Q_top * 1000)
-        Q_sol.append(q_target - slice.Q_top * 1000)
-        dz_acc.append(slice.dz_middle * 1000)
-        dz_sol.append(0)
-        qs_acc.append(slice.qs * 1000)
-        qs_lim.append(slice.qs_lim * 1000)
-        qs_max = max(qs_max, slice.qs)
-
-    cola, colb = st.columns([3, 2])
-    with cola:
-        st.write('Effort vertical en tête de pieu :')
-        st.write('Effort de pointe :')
-        st.write('Déplacement vertical en tête de pieu :')
-        st.write('Déplacement vertical au niveau de la pointe du pieu :')
-        st.write('Frottement maximum sur la hauteur du pieu :')
-    with colb:
-        st.write(f"Q_top     = {1000 * equilibre[3][0].Q_top: .2f} kN")
-        st.write(f"Q_bot     = {1000 * equilibre[3][-1].Q_bott: .2f} kN")
-        st.write(f"dz_top    = {1000 * equilibre[3][0].dz_top: .2f} mm")
-        st.write(f"dz_bot    = {1000 * equilibre[3][-1].dz_bott: .2f} mm")
-        st.write(f"qs_max    = {1000 * qs_max: .2f} kPa")
-
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.write('Tassement pieu/sol')
-        fig1 = go.Figure()
-        fig1.add_trace(
-            go.Scatter(
-            x=dz_acc, 
-            y=z_acc,
-            line={"color": "teal", 'width': 2},
-            name="δz sol"
-            )
-        )
-        fig1.add_trace(
-            go.Scatter(
-            x=dz_sol, 
-            y=z_acc,
-            line={"color": "slateblue", 'width': 1, 'dash':'dash'},
-            name="δz sol"
-            )
-        )
-        st.plotly_chart(fig1, use_container_width=True)
-        fig1.layout.title.text = "Tassement pieu/sol"
-    with col2:
-        st.write('Frottement pieu/sol')
-        fig2 = go.Figure()
-        fig2.add_trace(
-            go.Scatter(
-            x=qs_acc, 
-            y=z_acc,
-            line={"color": "teal", 'width': 2},
-            name="qs"
-            )
-        )
-        fig2.add_trace(
-            go.Scatter(
-            x=qs_lim, 
-            y=z_acc,
-            line={"color": "slateblue", 'width': 1, 'dash':'dash'},
-            name="qs_lim"
-            )
-        )
-
-        st.plotly_chart(fig2, use_container_width=True)
-    with col3:
-        st.write('Effort dans le pieu')
-        fig3 = go.Figure()
-        fig3.add_trace(
-            go.Scatter(
-            x=Q_acc, 
-            y=z_acc,
-            line={"color": "teal", 'width': 2},
-            name="Qpieu(z)"
-            )
-        )
-        fig3.add_trace(
-            go.Scatter(
-            x=Q_sol, 
-            y=z_acc,
-            line={"color": "slateblue", 'width': 1, 'dash':'dash'},
-            name="Qsol(z)"
-            )
-        )
-        st.plotly_chart(fig3, use_container_width=True)
-
+panneau_equilibre = st.container()
 
 st.divider()
 
@@ -263,98 +248,262 @@ with st.expander("Données :"):
     comb_situation = st.selectbox("Situation :", ['court terme', 'long terme', 'ELU', 'sismique'])
 
 tog_transversal = st.toggle("Lancer le calcul")
+panneau_lateral = st.container()
 if tog_transversal == True:
     situation = str(comb_situation)
     horizontal_force = force / 1000
     bending_moment = bending / 1000
-    pile_model = pieu.get_fe_model(horizontal_force, bending_moment, situation)
-    pile_model.analyze_linear()
-
-    get_curves = utils.get_model_curves(pile_model, level_top)
-    abscisse = get_curves[0]
-    moment = [m*1000 for m in get_curves[1]]
-    shear = [v*1000 for v in get_curves[2]]
-    deflection = [d*1000 for d in get_curves[3]]
-
-    z_top = utils.max_list(abscisse)
-    z_bott = utils.min_list(abscisse)
-
-    cola, colb = st.columns([3, 2])
-    with cola:
-        st.write('Moment fléchissant maximum :')
-        st.write('Moment fléchissant minimum :')
-        st.write('Effort tranchant maximum :')
-        st.write('Effort tranchant minimum :')
-        st.write('Déplacement horizontal maximum :')
-        st.write('Déplacement horizontal minimum :')
-    with colb:
-        st.write(f"M_max     = {utils.max_list(moment): .2f} kN.m")
-        st.write(f"M_min     = {utils.min_list(moment): .2f} kN.m")
-        st.write(f"V_max     = {utils.max_list(shear): .2f} kN")
-        st.write(f"V_min     = {utils.min_list(shear): .2f} kN")
-        st.write(f"dy_max     = {utils.max_list(deflection): .2f} mm")
-        st.write(f"dy_min     = {utils.min_list(deflection): .2f} mm")
-
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.write('Moment flechissant')
-        fig1 = go.Figure()
-        fig1.add_trace(
+    tache_laterale = soumettre('lateral', courbes_laterales, parametres_pieu, parametres_sols, horizontal_force, bending_moment, situation)
+
+# Affichage des résultats : les calculs des panneaux ont été soumis ci-dessus et s'exécutent simultanément
+with panneau_capacites:
+    capacites_pieu = attendre(tache_capacites, 'Calcul des capacités')
+
+    colA, colB = st.columns(2)
+    with colA:
+        st.subheader('Compression')
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown('- ELS QP :')
+            st.markdown('- ELS Car :')
+            st.markdown('- ELU Str :')
+            st.markdown('- ELU Acc :')
+        with col2:
+            st.write(str(f"{1000 * capacites_pieu['portance_ELS_QP']: .1f} kN"))
+            st.write(str(f"{1000 * capacites_pieu['portance_ELS_Car']: .1f} kN"))
+            st.write(str(f"{1000 * capacites_pieu['portance_ELU_Str']: .1f} kN"))
+            st.write(str(f"{1000 * capacites_pieu['portance_ELU_Acc']: .1f} kN"))
+
+    with colB:
+        st.subheader('Traction')
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown('- ELS QP :')
+            st.markdown('- ELS Car :')
+            st.markdown('- ELU Str :')
+            st.markdown('- ELU Acc :')
+        with col2:
+            st.write(str(f"{1000 * capacites_pieu['traction_ELS_QP']: .1f} kN"))
+            st.write(str(f"{1000 * capacites_pieu['traction_ELS_Car']: .1f} kN"))
+            st.write(str(f"{1000 * capacites_pieu['traction_ELU_Str']: .1f} kN"))
+            st.write(str(f"{1000 * capacites_pieu['traction_ELU_Acc']: .1f} kN"))
+
+if tog_tass == True:
+    with panneau_tassement:
+        tassement = attendre(tache_tassement, 'Calcul de la courbe de tassement')
+        x_acc = []
+        y_acc = []
+        for x in tassement[1]:
+            x_acc.append(1000 * x)
+        for y in tassement[0]:
+            y_acc.append(1000 * y)
+
+        fig = go.Figure()
+
+        # Plot lines
+        fig.add_trace(
             go.Scatter(
-            x=moment, 
-            y=abscisse,
-            line={"color": "teal", 'width': 2},
-            name="M [kN.m]"
+            x=x_acc, 
+            y=y_acc,
+            line={"color": "teal"},
+            name="Column B"
             )
         )
-        fig1.add_trace(
-            go.Scatter(
-            x=[0, 0], 
-            y=[z_bott, z_top],
-            line={"color": "slateblue", 'width': 1, 'dash':'dash'},
-            name="0"
+        fig.layout.title.text = "Courbe déterminée suivant l'annexe L de la NF P94-262"
+        fig.layout.xaxis.title = "Charge vertical en tête de pieu [kN]"
+        fig.layout.yaxis.title = "Déplacement vertical en tête de pieu [mm]"
+
+        st.plotly_chart(fig)
+
+if tog_equ == True:
+    with panneau_equilibre:
+        resistance_maxi = math.floor(1000 * capacites_pieu['resistance_totale'])
+        q_target = st.slider("Charge verticale en tête de pieu [kN] :", min_value=0, max_value=resistance_maxi, value=380)
+
+        tache_equilibre = soumettre('equilibre', equilibre_charge, parametres_pieu, parametres_sols, q_target / 1000)
+        equilibre = attendre(tache_equilibre, "Recherche de l'équilibre")
+        z_acc = equilibre['z_top']
+        Q_acc = [Q * 1000 for Q in equilibre['Q_top']]
+        Q_sol = [q_target - Q * 1000 for Q in equilibre['Q_top']]
+        dz_acc = [dz * 1000 for dz in equilibre['dz_middle']]
+        dz_sol = [0] * len(z_acc)
+        qs_acc = [qs * 1000 for qs in equilibre['qs']]
+        qs_lim = [qs * 1000 for qs in equilibre['qs_lim']]
+        qs_max = max(equilibre['qs'])
+
+        cola, colb = st.columns([3, 2])
+        with cola:
+            st.write('Effort vertical en tête de pieu :')
+            st.write('Effort de pointe :')
+            st.write('Déplacement vertical en tête de pieu :')
+            st.write('Déplacement vertical au niveau de la pointe du pieu :')
+            st.write('Frottement maximum sur la hauteur du pieu :')
+        with colb:
+            st.write(f"Q_top     = {1000 * equilibre['Q_top'][0]: .2f} kN")
+            st.write(f"Q_bot     = {1000 * equilibre['Q_bott']: .2f} kN")
+            st.write(f"dz_top    = {1000 * equilibre['dz_top'][0]: .2f} mm")
+            st.write(f"dz_bot    = {1000 * equilibre['dz_bott']: .2f} mm")
+            st.write(f"qs_max    = {1000 * qs_max: .2f} kPa")
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.write('Tassement pieu/sol')
+            fig1 = go.Figure()
+            fig1.add_trace(
+                go.Scatter(
+                x=dz_acc, 
+                y=z_acc,
+                line={"color": "teal", 'width': 2},
+                name="δz sol"
+                )
+            )
+            fig1.add_trace(
+                go.Scatter(
+                x=dz_sol, 
+                y=z_acc,
+                line={"color": "slateblue", 'width': 1, 'dash':'dash'},
+                name="δz sol"
+                )
+            )
+            st.plotly_chart(fig1, use_container_width=True)
+            fig1.layout.title.text = "Tassement pieu/sol"
+        with col2:
+            st.write('Frottement pieu/sol')
+            fig2 = go.Figure()
+            fig2.add_trace(
+                go.Scatter(
+                x=qs_acc, 
+                y=z_acc,
+                line={"color": "teal", 'width': 2},
+                name="qs"
+                )
+            )
+            fig2.add_trace(
+                go.Scatter(
+                x=qs_lim, 
+                y=z_acc,
+                line={"color": "slateblue", 'width': 1, 'dash':'dash'},
+                name="qs_lim"
+                )
             )
-        )
 
-        st.plotly_chart(fig1, use_container_width=True)
-        fig1.layout.title.text = "Moment fléchissant"
-    with col2:
-        st.write('Effort tranchant')
-        fig2 = go.Figure()
-        fig2.add_trace(
-            go.Scatter(
-            x=shear, 
-            y=abscisse,
-            line={"color": "teal", 'width': 2},
-            name="V [kN]"
+            st.plotly_chart(fig2, use_container_width=True)
+        with col3:
+            st.write('Effort dans le pieu')
+            fig3 = go.Figure()
+            fig3.add_trace(
+                go.Scatter(
+                x=Q_acc, 
+                y=z_acc,
+                line={"color": "teal", 'width': 2},
+                name="Qpieu(z)"
+                )
             )
-        )
-        fig2.add_trace(
-            go.Scatter(
-            x=[0, 0], 
-            y=[z_bott, z_top],
-            line={"color": "slateblue", 'width': 1, 'dash':'dash'},
-            name="0"
+            fig3.add_trace(
+                go.Scatter(
+                x=Q_sol, 
+                y=z_acc,
+                line={"color": "slateblue", 'width': 1, 'dash':'dash'},
+                name="Qsol(z)"
+                )
             )
-        )
-        st.plotly_chart(fig2, use_container_width=True)
-    with col3:
-        st.write('Déplacement horizontal')
-        fig3 = go.Figure()
-        fig3.add_trace(
-            go.Scatter(
-            x=deflection, 
-            y=abscisse,
-            line={"color": "teal", 'width': 2},
-            name="δy [mm]"
+            st.plotly_chart(fig3, use_container_width=True)
+
+if tog_transversal == True:
+    with panneau_lateral:
+        get_curves = attendre(tache_laterale, 'Calcul transversal')
+        abscisse = get_curves[0]
+        moment = get_curves[1] * 1000
+        shear = get_curves[2] * 1000
+        deflection = get_curves[3] * 1000
+
+        z_top = abscisse.max()
+        z_bott = abscisse.min()
+
+        cola, colb = st.columns([3, 2])
+        with cola:
+            st.write('Moment fléchissant maximum :')
+            st.write('Moment fléchissant minimum :')
+            st.write('Effort tranchant maximum :')
+            st.write('Effort tranchant minimum :')
+            st.write('Déplacement horizontal maximum :')
+            st.write('Déplacement horizontal minimum :')
+        with colb:
+            st.write(f"M_max     = {moment.max(): .2f} kN.m")
+            st.write(f"M_min     = {moment.min(): .2f} kN.m")
+            st.write(f"V_max     = {shear.max(): .2f} kN")
+            st.write(f"V_min     = {shear.min(): .2f} kN")
+            st.write(f"dy_max     = {deflection.max(): .2f} mm")
+            st.write(f"dy_min     = {deflection.min(): .2f} mm")
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.write('Moment flechissant')
+            fig1 = go.Figure()
+            fig1.add_trace(
+                go.Scatter(
+                x=moment, 
+                y=abscisse,
+                line={"color": "teal", 'width': 2},
+                name="M [kN.m]"
+                )
             )
-        )
-        fig3.add_trace(
-            go.Scatter(
-            x=[0, 0], 
-            y=[z_bott, z_top],
-            line={"color": "slateblue", 'width': 1, 'dash':'dash'},
-            name="0"
+            fig1.add_trace(
+                go.Scatter(
+                x=[0, 0], 
+                y=[z_bott, z_top],
+                line={"color": "slateblue", 'width': 1, 'dash':'dash'},
+                name="0"
+                )
             )
-        )
-        st.plotly_chart(fig3, use_container_width=True)
+
+            st.plotly_chart(fig1, use_container_width=True)
+            fig1.layout.title.text = "Moment fléchissant"
+        with col2:
+            st.write('Effort tranchant')
+            fig2 = go.Figure()
+            fig2.add_trace(
+                go.Scatter(
+                x=shear, 
+                y=abscisse,
+                line={"color": "teal", 'width': 2},
+                name="V [kN]"
+                )
+            )
+            fig2.add_trace(
+                go.Scatter(
+                x=[0, 0], 
+                y=[z_bott, z_top],
+                line={"color": "slateblue", 'width': 1, 'dash':'dash'},
+                name="0"
+                )
+            )
+            st.plotly_chart(fig2, use_container_width=True)
+        with col3:
+            st.write('Déplacement horizontal')
+            fig3 = go.Figure()
+            fig3.add_trace(
+                go.Scatter(
+                x=deflection, 
+                y=abscisse,
+                line={"color": "teal", 'width': 2},
+                name="δy [mm]"
+                )
+            )
+            fig3.add_trace(
+                go.Scatter(
+                x=[0, 0], 
+                y=[z_bott, z_top],
+                line={"color": "slateblue", 'width': 1, 'dash':'dash'},
+                name="0"
+                )
+            )
+            st.plotly_chart(fig3, use_container_width=True)
+
+if instrumentation:
+    statistiques = statistiques_calcul()
+    logging.getLogger(__name__).info("%s", statistiques)
+    with st.sidebar.expander("Statistiques de calcul"):
+        if st.button("Réinitialiser les statistiques"):
+            statistiques.reset()
+        st.json(statistiques.summary())